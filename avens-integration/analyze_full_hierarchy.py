@@ -2,6 +2,8 @@ from supabase import create_client
 import os
 from dotenv import load_dotenv
 
+from category_index import CategoryIndex
+
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -16,13 +18,14 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 print('=== TÜM KATEGORİ HİYERARŞİSİ ANALİZİ ===\n')
 
 # Tüm kategorileri çek
-all_cats = supabase.table('categories').select('*').order('name').execute()
+categories = CategoryIndex.load_cached(supabase)
+by_name = sorted(categories, key=lambda c: c.get('name') or '')
 
 # Ana kategorileri grupla
-main_categories = [c for c in all_cats.data if c.get('level') == 0 or c.get('parent_id') is None]
-sub_categories = [c for c in all_cats.data if c.get('level') == 1 or c.get('parent_id') is not None]
+main_categories = [c for c in by_name if c.get('level') == 0 or c.get('parent_id') is None]
+sub_categories = [c for c in by_name if c.get('level') == 1 or c.get('parent_id') is not None]
 
-print(f"TOPLAM: {len(all_cats.data)} kategori")
+print(f"TOPLAM: {len(categories)} kategori")
 print(f"Ana Kategoriler: {len(main_categories)}")
 print(f"Alt Kategoriler: {len(sub_categories)}")
 print()
@@ -34,7 +37,7 @@ for main in main_categories:
     main_slug = main['slug']
     
     # Bu ana kategorinin alt kategorileri
-    subs = [c for c in sub_categories if c.get('parent_id') == main_id]
+    subs = categories.children(main_id)
     
     # Ürün sayısı
     products = supabase.table('products').select('id').eq('category_id', main_id).execute()
@@ -67,7 +70,7 @@ for sub in sub_categories:
         continue
     
     # Parent gerçekten ana kategori mi?
-    parent = next((c for c in all_cats.data if c['id'] == parent_id), None)
+    parent = categories.get(parent_id)
     if not parent:
         wrong_parents.append((sub, "Parent bulunamadı!"))
     elif parent.get('level') != 0:
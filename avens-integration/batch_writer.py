@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Eşzamanlı batch yazıcı
+Satırları batch'ler halinde bir thread pool üzerinden gönderir; aynı anda birden
+fazla batch yolda olur. Batch boyutu gözlenen gecikme, payload boyutu ve hatalara
+göre AIMD ile ayarlanır (başarıda toplamsal büyüme, sorunda yarıya inme).
+Geçici hatalar (bağlantı, zaman aşımı, 429/5xx) aynı batch ile artan beklemeyle
+tekrar denenir. Satır kaynaklı hatalar (kısıt ihlali, geçersiz veri, 4xx) veren batch
+ikiye bölünerek tekrar denenir; sağlam satırlar yine büyük parçalar halinde yazılır,
+sadece sorunlu satırlar dead-letter NDJSON dosyasına düşer. İsteğin tamamını bozan
+hatalarda (yetki, şema, tekrar denemeyle geçmeyen kesinti) yazım durdurulur; bütün
+katalog satır satır dead-letter'a taşınmaz.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# PostgREST hata gövdesindeki kod (APIError'ın metninde de geçer)
+_ERROR_CODE_RE = re.compile(r"""['"]code['"]\s*:\s*['"]?([0-9A-Z]+)""")
+
+# Satıra özgü hatalar: SQLSTATE 22 (geçersiz veri) / 23 (kısıt ihlali) sınıfları ve
+# payload'daki satırlara bağlı HTTP durumları; bu hatalarda batch bölünür
+_ROW_ERROR_CLASSES = ('22', '23')
+_ROW_ERROR_STATUSES = ('400', '409', '413', '422')
+
+# Geçici hatalar: tekrar denenir (seri hatası, deadlock, statement timeout, kaynak yetersizliği)
+_TRANSIENT_SQLSTATES = ('40001', '40P01', '57014')
+_TRANSIENT_CLASSES = ('53', '08')
+_TRANSIENT_STATUSES = ('408', '425', '429', '500', '502', '503', '504')
+
+# RPC fonksiyonu veritabanında yok (migration henüz deploy edilmemiş)
+_MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+
+
+class BatchAbortedError(RuntimeError):
+    """Satırlardan bağımsız bir hata yüzünden yazım durduruldu"""
+
+
+def error_code(error):
+    """Hatanın PostgREST/SQLSTATE ya da HTTP kodu (bulunamazsa None)"""
+    code = getattr(error, 'code', None)
+    if code:
+        return str(code)
+    match = _ERROR_CODE_RE.search(str(error))
+    return match.group(1) if match else None
+
+
+def is_transient_error(error):
+    """Bağlantı/zaman aşımı ya da sunucu tarafı geçici hata mı (tekrar denenebilir)"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # httpx'in TransportError ağacı (ConnectError, ReadTimeout, ...) import etmeden tanınır
+    if any(cls.__name__ in ('TransportError', 'TimeoutException') for cls in type(error).__mro__):
+        return True
+    code = error_code(error)
+    if not code:
+        return False
+    return code in _TRANSIENT_SQLSTATES or code in _TRANSIENT_STATUSES or \
+        (len(code) == 5 and code.startswith(_TRANSIENT_CLASSES))
+
+
+def is_row_error(error):
+    """Hata batch'teki satırlardan mı kaynaklanıyor (bölerek ayıklanabilir)"""
+    code = error_code(error)
+    if not code:
+        return False
+    return code in _ROW_ERROR_STATUSES or (len(code) == 5 and code.startswith(_ROW_ERROR_CLASSES))
+
+
+class BatchWriter:
+    """
+    Kullanım:
+        with BatchWriter(insert_sender(supabase, 'products'), label='products') as writer:
+            for row in rows:
+                writer.add(row)
+        stats = writer.stats
+    Geçici hatalar max_retries kez retry_delay'den başlayıp katlanan beklemeyle tekrar
+    denenir; geçmezse ya da hata satırlardan kaynaklanmıyorsa BatchAbortedError fırlar.
+    """
+
+    def __init__(self, send, batch_size=50, min_batch_size=10, max_batch_size=1000,
+                 workers=4, target_latency=1.5, max_payload_bytes=2_000_000,
+                 increase_step=25, dead_letter_path=None, label='rows',
+                 max_retries=4, retry_delay=1.0, max_retry_delay=30.0):
+        self.send = send
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.dead_letter_path = dead_letter_path
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.increase_step = increase_step
+        self.label = label
+
+        self.stats = {
+            'written': 0,
+            'errors': 0,
+            'batches': 0,
+            'failed_batches': 0,
+            'retried_batches': 0,
+            'retries': 0,
+            'dead_lettered': 0,
+            'elapsed': 0.0,
+            'rows_per_sec': 0.0,
+            'final_batch_size': batch_size
+        }
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._dead_letter_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # Yoldaki batch sayısını sınırla; üretici çok hızlıysa bekler (bellek sabit kalır)
+        self._in_flight = threading.BoundedSemaphore(workers * 2)
+        self._futures = []
+        self._started = time.monotonic()
+        self._closed = False
+        self._abort_error = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def add(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self._submit()
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def flush(self):
+        """Tampondaki satırları gönder ve yoldaki tüm batch'lerin bitmesini bekle"""
+        if self._buffer:
+            self._submit()
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        if self._closed:
+            return self.stats
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._closed = True
+
+        elapsed = time.monotonic() - self._started
+        self.stats['elapsed'] = elapsed
+        self.stats['rows_per_sec'] = self.stats['written'] / elapsed if elapsed > 0 else 0.0
+        self.stats['final_batch_size'] = self.batch_size
+
+        logger.info(
+            f"OK {self.label}: {self.stats['written']} satır {elapsed:.1f}s içinde yazıldı "
+            f"({self.stats['rows_per_sec']:.0f} satır/s, {self.stats['batches']} batch, "
+            f"son batch boyutu {self.batch_size}, hata {self.stats['errors']})"
+        )
+        if self.stats['dead_lettered'] and self.dead_letter_path:
+            logger.warning(f"{self.stats['dead_lettered']} hatalı satır {self.dead_letter_path} dosyasına yazıldı")
+        return self.stats
+
+    def _submit(self):
+        if self._abort_error:
+            # Yazım durduruldu: üretici ilk add()'de hatayı görür
+            self._buffer = []
+            raise self._abort_error
+        batch = self._buffer
+        self._buffer = []
+        self._in_flight.acquire()
+        try:
+            future = self._executor.submit(self._run, batch)
+        except Exception:
+            self._in_flight.release()
+            raise
+        future.add_done_callback(lambda _: self._in_flight.release())
+        self._futures.append(future)
+
+        # Tamamlanmış future'ları listeden at (uzun importlarda liste büyümesin)
+        if len(self._futures) > 64:
+            self._futures = [f for f in self._futures if not f.done()]
+
+    def _run(self, batch):
+        if self._abort_error:
+            return
+        payload_bytes = len(json.dumps(batch, ensure_ascii=False, default=str).encode('utf-8'))
+        started = time.monotonic()
+        try:
+            self._send_with_retry(batch)
+        except Exception as e:
+            if not is_row_error(e):
+                self._abort(batch, e)
+            logger.warning(f"{self.label} batch hatası ({len(batch)} satır), bölünerek tekrar deneniyor: {e}")
+            with self._lock:
+                self.stats['failed_batches'] += 1
+                self._decrease()
+            self._bisect(batch, e)
+            return
+
+        latency = time.monotonic() - started
+        with self._lock:
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+            self._adjust(len(batch), latency, payload_bytes)
+
+    def _bisect(self, batch, error):
+        """Hatalı batch'i ikiye bölerek tekrar dene; tek satıra inince dead-letter'a yaz"""
+        if len(batch) == 1:
+            self._dead_letter(batch[0], error)
+            return
+
+        middle = len(batch) // 2
+        for half in (batch[:middle], batch[middle:]):
+            if self._abort_error:
+                return
+            try:
+                self._send_with_retry(half)
+            except Exception as e:
+                if not is_row_error(e):
+                    self._abort(half, e)
+                self._bisect(half, e)
+                continue
+            with self._lock:
+                self.stats['written'] += len(half)
+                self.stats['retried_batches'] += 1
+
+    def _send_with_retry(self, batch):
+        """Batch'i gönder; geçici hatalarda artan beklemeyle en fazla max_retries kez tekrar dene"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.send(batch)
+                return
+            except Exception as e:
+                if attempt == self.max_retries or not is_transient_error(e) or self._abort_error:
+                    raise
+                delay = min(self.max_retry_delay, self.retry_delay * 2 ** attempt)
+                logger.warning(f"{self.label} geçici hata ({len(batch)} satır), {delay:.1f}s sonra "
+                               f"tekrar denenecek ({attempt + 1}/{self.max_retries}): {e}")
+                with self._lock:
+                    self.stats['retries'] += 1
+                time.sleep(delay)
+
+    def _abort(self, batch, error):
+        """Satırlardan bağımsız hata: yazımı durdur, kalan batch'ler gönderilmez"""
+        with self._lock:
+            self.stats['failed_batches'] += 1
+            if self._abort_error is None:
+                self._abort_error = BatchAbortedError(
+                    f"{self.label} yazımı durduruldu ({len(batch)} satırlık istek başarısız): {error}")
+                self._abort_error.__cause__ = error
+                logger.error(str(self._abort_error))
+            abort_error = self._abort_error
+        raise abort_error
+
+    def _dead_letter(self, row, error):
+        logger.error(f"{self.label} satırı yazılamadı: {error}")
+        with self._lock:
+            self.stats['errors'] += 1
+            self.stats['dead_lettered'] += 1
+
+        if not self.dead_letter_path:
+            return
+
+        record = {
+            'label': self.label,
+            'failed_at': datetime.now().isoformat(),
+            'error': str(error),
+            'row': row
+        }
+        with self._dead_letter_lock:
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def _adjust(self, rows, latency, payload_bytes):
+        if latency > self.target_latency or payload_bytes > self.max_payload_bytes:
+            self._decrease()
+        elif rows >= self.batch_size:
+            # Sadece dolu batch'ler büyümeye sayılır (son yarım batch yanıltmasın)
+            self.batch_size = min(self.max_batch_size, self.batch_size + self.increase_step)
+
+    def _decrease(self):
+        self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+
+
+def insert_sender(supabase, table):
+    """Batch'i tek bir insert isteği ile gönderen fonksiyon"""
+    def send(batch):
+        supabase.table(table).insert(batch).execute()
+    return send
+
+
+def upsert_sender(supabase, table, on_conflict='id'):
+    """Batch'i tek bir upsert isteği ile gönderen fonksiyon"""
+    def send(batch):
+        supabase.table(table).upsert(batch, on_conflict=on_conflict).execute()
+    return send
+
+
+def grouped_update_sender(supabase, table, key='id', max_keys=200):
+    """
+    Batch'i aynı değerleri yazan satırlara gruplayıp her grubu tek bir
+    update(...).in_(key, [...]) isteği ile gönderen fonksiyon
+    Satırlar {key: ..., alan: değer, ...} biçimindedir; hedef değer kombinasyonu
+    az olduğunda (örn. kategori taşıma) binlerce satır birkaç istekle güncellenir.
+    max_keys: tek istekteki anahtar sayısı; in_ filtresi URL'e yazıldığından istek
+    sayısı URL uzunluğu sınırıyla bağlıdır (grup başına en az ceil(n / max_keys) istek).
+    Çok satırlı taşımalarda liste POST gövdesinde giden rpc_sender tercih edilir.
+    """
+    def send(batch):
+        groups = {}
+        for row in batch:
+            values = tuple(sorted((field, value) for field, value in row.items() if field != key))
+            groups.setdefault(values, []).append(row[key])
+
+        for values, keys in groups.items():
+            for start in range(0, len(keys), max_keys):
+                supabase.table(table).update(dict(values)).in_(key, keys[start:start + max_keys]).execute()
+    return send
+
+
+def rpc_sender(supabase, function, param, fallback=None):
+    """
+    Batch'i tek bir RPC çağrısı ile gönderen fonksiyon; satırlar {param: [...]} olarak
+    POST gövdesinde gider (URL sınırı yok, binlerce satır tek istekte yazılır)
+    RPC henüz deploy edilmemişse fallback sender'a geçilir (bir kez uyarılır).
+    """
+    use_fallback = False
+
+    def send(batch):
+        nonlocal use_fallback
+        if not use_fallback:
+            try:
+                supabase.rpc(function, {param: batch}).execute()
+                return
+            except Exception as e:
+                if fallback is None or error_code(e) not in _MISSING_FUNCTION_CODES:
+                    raise
+                if not use_fallback:
+                    logger.warning(f"{function} RPC'si bulunamadı, yedek yöntemle devam ediliyor: {e}")
+                use_fallback = True
+        fallback(batch)
+    return send
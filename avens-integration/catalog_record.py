@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Kompakt katalog kaydı
+Firecrawl parser'larının ortak Product tipi. __slots__ ile nesne başına __dict__
+tutulmaz; currency/category/brand/source_url gibi tekrar eden değerler intern edilir
+(milyonlarca kayıt aynı string nesnesini paylaşır). id (uuid4) ve specifications
+ilk erişildiğinde oluşturulur; hiç okunmayan kayıtlar için maliyeti yoktur.
+Toplu işlemler için ProductTable aynı kataloğu sütun dizileri olarak (struct-of-arrays)
+tutar: satır başına Python nesnesi yoktur.
+"""
+
+import math
+import sys
+import uuid
+from array import array
+
+# to_dict()/JSON çıktısındaki alan sırası (eski dataclass ile aynı)
+FIELDS = ('id', 'name', 'price', 'currency', 'category', 'brand', 'image_url', 'product_url',
+          'product_code', 'description', 'source_url', 'specifications')
+
+# Az sayıda farklı değer alan alanlar
+CATEGORICAL_FIELDS = ('currency', 'category', 'brand', 'source_url')
+TEXT_FIELDS = ('name', 'image_url', 'product_url', 'product_code', 'description')
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class Product:
+    """
+    Kullanım:
+        product = Product(name=name, price=price, category=category, brand=brand,
+                          image_url=image_url, product_url=url, source_url=source_url)
+        product.id                      # ilk erişimde uuid4
+        Product(**product.to_dict())    # cache/JSON'dan geri yükleme
+    """
+
+    __slots__ = ('name', 'price', 'currency', 'category', 'brand', 'image_url', 'product_url',
+                 'product_code', 'description', 'source_url', '_id', '_specifications')
+
+    def __init__(self, name, price, category, brand, product_url, source_url, currency='TRY',
+                 image_url=None, product_code=None, description=None, id=None, specifications=None):
+        self.name = name
+        self.price = price
+        self.currency = _intern(currency)
+        self.category = _intern(category)
+        self.brand = _intern(brand)
+        self.image_url = image_url
+        self.product_url = product_url
+        self.product_code = product_code
+        self.description = description
+        self.source_url = _intern(source_url)
+        self._id = id
+        self._specifications = specifications or None
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = str(uuid.uuid4())
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+
+    @property
+    def specifications(self):
+        if self._specifications is None:
+            self._specifications = {}
+        return self._specifications
+
+    @specifications.setter
+    def specifications(self, value):
+        self._specifications = value or None
+
+    def to_dict(self):
+        record = {field: getattr(self, field) for field in FIELDS[:-1]}
+        record['specifications'] = dict(self._specifications or {})
+        return record
+
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Product(name={self.name!r}, price={self.price!r}, category={self.category!r}, brand={self.brand!r})"
+
+
+class ProductTable:
+    """
+    Struct-of-arrays ürün kataloğu
+    Fiyatlar array('d') (None → NaN), kategorik alanlar array('I') kodları + değer
+    listesi, metin alanları düz listeler olarak tutulur. id'ler istenene kadar
+    üretilmez, specifications sadece dolu olan satırlar için saklanır.
+    Kullanım:
+        table = ProductTable()
+        table.extend(products)
+        prices = table.prices            # toplu fiyat işlemleri
+        for product in table: ...        # gerektiğinde Product olarak
+    """
+
+    def __init__(self, products=()):
+        self.prices = array('d')
+        self.codes = {field: array('I') for field in CATEGORICAL_FIELDS}
+        self.values = {field: [] for field in CATEGORICAL_FIELDS}
+        self.text = {field: [] for field in TEXT_FIELDS}
+        self._lookup = {field: {} for field in CATEGORICAL_FIELDS}
+        self._ids = []
+        self._specifications = {}
+        self.extend(products)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def _encode(self, field, value):
+        lookup = self._lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self.values[field])
+            self.values[field].append(_intern(value))
+        return code
+
+    def append(self, product):
+        row = len(self.prices)
+        self.prices.append(math.nan if product.price is None else product.price)
+        for field in CATEGORICAL_FIELDS:
+            self.codes[field].append(self._encode(field, getattr(product, field)))
+        for field in TEXT_FIELDS:
+            self.text[field].append(getattr(product, field))
+        self._ids.append(product._id)
+        if product._specifications:
+            self._specifications[row] = product._specifications
+
+    def extend(self, products):
+        for product in products:
+            self.append(product)
+
+    def id(self, row):
+        if self._ids[row] is None:
+            self._ids[row] = str(uuid.uuid4())
+        return self._ids[row]
+
+    def column(self, field):
+        """Alanın tüm değerleri (kategorik alanlar çözülmüş, NaN fiyatlar None olarak)"""
+        if field == 'price':
+            return [None if math.isnan(price) else price for price in self.prices]
+        if field in self.codes:
+            values = self.values[field]
+            return [values[code] for code in self.codes[field]]
+        if field == 'id':
+            return [self.id(row) for row in range(len(self))]
+        if field == 'specifications':
+            return [dict(self._specifications.get(row, {})) for row in range(len(self))]
+        return self.text[field]
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        price = self.prices[row]
+        fields = {field: self.values[field][self.codes[field][row]] for field in CATEGORICAL_FIELDS}
+        fields.update({field: self.text[field][row] for field in TEXT_FIELDS})
+        return Product(price=None if math.isnan(price) else price, id=self.id(row),
+                       specifications=self._specifications.get(row), **fields)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Sütunlu katalog dosyaları (Parquet / Arrow IPC)
+Parse edilmiş ürün kataloğu JSON yerine Parquet (.parquet) ya da Arrow IPC (.arrow,
+.feather) olarak yazılabilir. category/brand/currency sütunları dictionary-encoded
+tutulur; okuyan aşama dosyayı memory-map ile açar ve sadece ihtiyaç duyduğu
+sütunları okur. pyarrow opsiyoneldir: kurulu değilse JSON/NDJSON yolu aynen çalışır,
+sütunlu bir dosya istendiğinde anlaşılır bir hata verilir.
+"""
+
+import os
+from dataclasses import asdict, is_dataclass
+
+from catalog_record import Product, ProductTable
+from record_reader import iter_records, write_records
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PARQUET_EXTENSIONS = ('.parquet',)
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+# Az sayıda farklı değer alan sütunlar (dictionary-encoded yazılır)
+DICTIONARY_COLUMNS = ('category', 'brand', 'currency')
+
+# Product'ın (Firecrawl parser'ları) metin alanları; price ve specifications ayrıca eklenir
+STRING_COLUMNS = ('id', 'name', 'currency', 'category', 'brand', 'image_url', 'product_url',
+                  'product_code', 'description', 'source_url')
+
+
+def is_columnar(path):
+    """Dosya uzantısı Parquet/Arrow mı"""
+    return path.lower().endswith(PARQUET_EXTENSIONS + ARROW_EXTENSIONS)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ValueError("Parquet/Arrow katalog için pyarrow gerekli (pip install pyarrow)")
+
+
+def product_schema():
+    """Product kataloğunun Arrow şeması"""
+    _require_pyarrow()
+    fields = []
+    for name in STRING_COLUMNS:
+        kind = pa.dictionary(pa.int32(), pa.string()) if name in DICTIONARY_COLUMNS else pa.string()
+        fields.append(pa.field(name, kind))
+        if name == 'name':
+            fields.append(pa.field('price', pa.float64()))
+    fields.append(pa.field('specifications', pa.map_(pa.string(), pa.string())))
+    return pa.schema(fields)
+
+
+def write_catalog(path, products, schema=None):
+    """
+    Ürünleri uzantıya göre Parquet, Arrow IPC ya da JSON/NDJSON olarak yaz
+    products: Product'lar, dict'ler ya da ProductTable. Şemada olmayan alanlar yazılmaz.
+    Yazılan ürün sayısını döndürür.
+    """
+    if not is_columnar(path):
+        return write_records(path, (_as_record(product) for product in products))
+
+    _require_pyarrow()
+    schema = schema or product_schema()
+    if isinstance(products, ProductTable):
+        # Sütunlar doğrudan diziden kurulur, satır nesnesi oluşmaz
+        table = pa.table({name: products.column(name) for name in schema.names}, schema=schema)
+    else:
+        table = pa.Table.from_pylist([_as_record(product) for product in products], schema=schema)
+
+    tmp_path = f"{path}.tmp"
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        pq.write_table(table, tmp_path, compression='zstd')
+    else:
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+    return table.num_rows
+
+
+def _as_record(product):
+    if isinstance(product, Product):
+        return product.to_dict()
+    return asdict(product) if is_dataclass(product) else product
+
+
+def load_catalog_table(path, columns=None):
+    """Sütunlu kataloğu memory-map ile pyarrow.Table olarak aç (sadece istenen sütunlar)"""
+    _require_pyarrow()
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    # Arrow IPC: sütunlar diskteki tampona işaret eder, seçim kopyalamaz
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.select(columns) if columns else table
+
+
+def read_catalog(path, columns=None):
+    """
+    Katalogdaki ürünleri dict olarak sırayla üret
+    Sütunlu dosyalarda columns verilirse sadece o sütunlar okunur; JSON/NDJSON
+    dosyalarda kayıtlar akışlı okunur ve istenen alanlara indirgenir.
+    """
+    if not is_columnar(path):
+        for record in iter_records(path):
+            yield {name: record.get(name) for name in columns} if columns else record
+        return
+
+    table = load_catalog_table(path, columns)
+    map_columns = [field.name for field in table.schema if pa.types.is_map(field.type)]
+
+    for batch in table.to_batches():
+        for record in batch.to_pylist():
+            # Map sütunları (specifications) pyarrow'dan (anahtar, değer) listesi olarak gelir
+            for name in map_columns:
+                if record[name] is not None:
+                    record[name] = dict(record[name])
+            yield record
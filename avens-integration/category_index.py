@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Paylaşılan kategori indeksi
+categories tablosu bir kez yüklenir; id, normalize isim, (slug, level),
+parent → children ve kök → kategori yolu için O(1) lookup map'leri önceden hesaplanır.
+İndeks değiştirilemez (immutable) olduğu için thread/process arasında paylaşılabilir.
+load_cached() kategorileri diskteki snapshot'tan okur; snapshot sadece
+count + max(updated_at) probe'u değişiklik gösterdiğinde yenilenir.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from types import MappingProxyType
+
+from text_normalize import fold_cached
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'categories.json')
+SNAPSHOT_VERSION = 1
+
+
+def normalize_category_name(name):
+    """Kategori adını lookup anahtarına çevir ('Isı Geri Kazanım' -> 'isi geri kazanim')"""
+    return fold_cached(name or '')
+
+
+class CategoryIndex:
+    """
+    Kullanım:
+        index = CategoryIndex.load_cached(supabase)
+        index.name_of(category_id)
+        index.id_for_name('Ortam Havalı')
+        index.by_slug('hava-perdeleri', level=0)
+        index.children(category_id)
+    """
+
+    __slots__ = ('_by_id', '_by_name', '_by_slug_level', '_children', '_paths')
+
+    def __init__(self, categories):
+        by_id = {}
+        for cat in categories:
+            by_id[cat['id']] = MappingProxyType(dict(cat))
+
+        by_name = {}
+        by_slug_level = {}
+        children = {}
+        for cat in by_id.values():
+            # Aynı isimde birden fazla kategori varsa ilk gelen kazanır
+            by_name.setdefault(normalize_category_name(cat.get('name')), cat)
+            if cat.get('slug') is not None:
+                by_slug_level.setdefault((cat['slug'], cat.get('level')), cat)
+            children.setdefault(cat.get('parent_id'), []).append(cat)
+
+        paths = {}
+        for cat_id in by_id:
+            path = []
+            seen = set()
+            current = by_id.get(cat_id)
+            # Döngüsel parent_id'ye karşı korumalı
+            while current is not None and current['id'] not in seen:
+                seen.add(current['id'])
+                path.append(current)
+                current = by_id.get(current.get('parent_id'))
+            paths[cat_id] = tuple(reversed(path))
+
+        object.__setattr__(self, '_by_id', MappingProxyType(by_id))
+        object.__setattr__(self, '_by_name', MappingProxyType(by_name))
+        object.__setattr__(self, '_by_slug_level', MappingProxyType(by_slug_level))
+        object.__setattr__(self, '_children', MappingProxyType(
+            {parent_id: tuple(cats) for parent_id, cats in children.items()}
+        ))
+        object.__setattr__(self, '_paths', MappingProxyType(paths))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CategoryIndex değiştirilemez')
+
+    def __reduce__(self):
+        # Process'lere gönderilirken ham kategorilerden yeniden kurulur
+        return (CategoryIndex, ([dict(cat) for cat in self._by_id.values()],))
+
+    @classmethod
+    def load(cls, supabase):
+        """categories tablosunu çekip indeksi oluştur"""
+        response = supabase.table('categories').select('*').execute()
+        return cls(response.data or [])
+
+    @classmethod
+    def load_cached(cls, supabase, cache_path=CATEGORY_CACHE_FILE):
+        """
+        Diskteki snapshot güncelse onu kullan, değilse tabloyu çekip snapshot'ı yenile
+        Tazelik: satır sayısı + max(updated_at) (tek satırlık ucuz sorgu)
+        """
+        try:
+            probe = _probe(supabase)
+        except Exception as e:
+            logger.warning(f"Kategori tazelik kontrolü başarısız, tam yükleme yapılıyor: {e}")
+            return cls.load(supabase)
+
+        snapshot = _read_snapshot(cache_path)
+        if snapshot and snapshot.get('count') == probe['count'] \
+                and snapshot.get('max_updated_at') == probe['max_updated_at']:
+            logger.debug(f"Kategoriler snapshot'tan yüklendi ({probe['count']} kayıt)")
+            return cls(snapshot['categories'])
+
+        response = supabase.table('categories').select('*').execute()
+        categories = response.data or []
+        _write_snapshot(cache_path, probe, categories)
+        logger.info(f"Kategori snapshot'ı yenilendi ({len(categories)} kayıt)")
+        return cls(categories)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __contains__(self, category_id):
+        return category_id in self._by_id
+
+    def get(self, category_id):
+        return self._by_id.get(category_id)
+
+    def name_of(self, category_id, default=None):
+        cat = self._by_id.get(category_id)
+        return cat['name'] if cat else default
+
+    def by_name(self, name):
+        return self._by_name.get(normalize_category_name(name))
+
+    def id_for_name(self, name):
+        cat = self._by_name.get(normalize_category_name(name))
+        return cat['id'] if cat else None
+
+    def by_slug(self, slug, level=None):
+        """(slug, level) ile kategori; level verilmezse önce ana, sonra alt kategori denenir"""
+        if level is not None:
+            return self._by_slug_level.get((slug, level))
+        return self._by_slug_level.get((slug, 0)) or self._by_slug_level.get((slug, 1))
+
+    def parent(self, category_id):
+        cat = self._by_id.get(category_id)
+        return self._by_id.get(cat.get('parent_id')) if cat else None
+
+    def children(self, category_id):
+        return self._children.get(category_id, ())
+
+    def roots(self):
+        """parent_id'si olmayan (ana) kategoriler"""
+        return self._children.get(None, ())
+
+    def path(self, category_id):
+        """Kökten kategoriye kadar olan yol (kök ... kategori)"""
+        return self._paths.get(category_id, ())
+
+    def name_map(self):
+        """normalize isim → id (CategoryClassifier gibi isimle eşleşen kod için)"""
+        return {name: cat['id'] for name, cat in self._by_name.items()}
+
+
+def _probe(supabase):
+    """Kategori tablosunun satır sayısı ve en son güncellenme zamanı"""
+    response = supabase.table('categories')\
+        .select('updated_at', count='exact')\
+        .order('updated_at', desc=True)\
+        .limit(1)\
+        .execute()
+    rows = response.data or []
+    return {
+        'count': response.count,
+        'max_updated_at': rows[0]['updated_at'] if rows else None
+    }
+
+
+def _read_snapshot(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION or not isinstance(snapshot.get('categories'), list):
+        return None
+    return snapshot
+
+
+def _write_snapshot(cache_path, probe, categories):
+    """Snapshot'ı atomik olarak yaz (yarım kalmış dosya okunmasın)"""
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'count': probe['count'],
+        'max_updated_at': probe['max_updated_at'],
+        'fetched_at': datetime.now().isoformat(),
+        'categories': categories
+    }
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Kategori snapshot'ı yazılamadı: {e}")
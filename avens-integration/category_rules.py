@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Derlenmiş kategori kural motoru
+Scraped kategori + ürün isminden VentHub kategori ID'si bulan kurallar tek bir
+tabloda tanımlanır ve başlangıçta bir kez Aho-Corasick eşleştiriciye derlenir.
+Bir ürünü sınıflandırmak isim ve scraped kategori üzerinde birer geçiştir.
+"""
+
+import logging
+from typing import NamedTuple, Tuple
+
+from keyword_matcher import KeywordMatcher
+from text_normalize import fold_cached, fold_turkish
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryRule(NamedTuple):
+    target: str                      # Hedef kategori adı (categories.name)
+    priority: int                    # Küçük değer önce değerlendirilir
+    scraped: Tuple[str, ...] = ()    # Scraped kategoride geçmesi gereken kalıplardan biri
+    name_scope: Tuple[str, ...] = () # ...ya da ürün isminde geçmesi gereken kalıplardan biri
+    keywords: Tuple[str, ...] = ()   # Ürün isminde geçmesi gereken kelimelerden biri (boşsa koşulsuz)
+    exclude: Tuple[str, ...] = ()    # Ürün isminde geçerse kural uygulanmaz (if/else'in else kolu)
+
+
+# Kural tablosu: eşleşen ve hedefi veritabanında bulunan en yüksek öncelikli kural kazanır.
+# Hedefi bulunamayan kural atlanır ve sıradaki kural denenir; "değilse" kolları exclude
+# ile yazıldığından atlanan kuralın ürünleri else koluna düşmez, standart eşleştirmeye kalır.
+CATEGORY_RULES = (
+    # Hava Perdeleri: elektrikli → su ısıtıcılı → varsayılan ortam havalı
+    CategoryRule('Elektrikli Isıtıcılı', 10, scraped=('hava perdeleri',), name_scope=('hava perdesi',),
+                 keywords=('elektrik', 'isitici', 'electric', 'heater')),
+    CategoryRule('Su Isıtıcılı', 11, scraped=('hava perdeleri',), name_scope=('hava perdesi',),
+                 keywords=('su isitici', 'water', 'sicak su')),
+    CategoryRule('Ortam Havalı', 12, scraped=('hava perdeleri',), name_scope=('hava perdesi',)),
+
+    # Aksesuarlar
+    CategoryRule('Gemici Anemostadı', 20, scraped=('aksesuar',), keywords=('gemici', 'anemosta')),
+    CategoryRule('Bağlantı Konnektörü', 21, scraped=('aksesuar',), keywords=('konnektör', 'bağlantı')),
+    CategoryRule('Plastik Kelepçeler', 22, scraped=('aksesuar',), keywords=('kelepçe',)),
+    CategoryRule('Alüminyum Folyo Bantlar', 23, scraped=('aksesuar',), keywords=('folyo', 'bant')),
+
+    # Flexible Kanallar
+    CategoryRule('Flexible Hava Kanalları', 30, scraped=('flexible', 'kanal'), keywords=('flexible',)),
+
+    # Isı Geri Kazanım: konut tipi, değilse ticari tip
+    CategoryRule('Konut Tipi', 40, scraped=('ısı geri kazanım', 'heat recovery'),
+                 keywords=('konut', 'residential', 'ev')),
+    CategoryRule('Ticari Tip', 41, scraped=('ısı geri kazanım', 'heat recovery'),
+                 exclude=('konut', 'residential', 'ev')),
+
+    # Hız Kontrolü Cihazları: DANFOSS, değilse hız anahtarı
+    CategoryRule('DANFOSS', 50, scraped=('hız kontrol',), keywords=('danfoss',)),
+    CategoryRule('Hız Anahtarı', 51, scraped=('hız kontrol',), exclude=('danfoss',)),
+)
+
+# Scraped kategori adı → VentHub kategori adı (birebir eşleşme)
+CATEGORY_MAPPINGS = {
+    'konut tipi fanlar': 'Konut Tipi Fanlar',
+    'santrifüj fanlar': 'Santrifüj Fanlar',
+    'kanal tipi fanlar': 'Kanal Tipi Fanlar',
+    'çatı tipi fanlar': 'Çatı Tipi Fanlar',
+    'endüstriyel fanlar': 'Endüstriyel Fanlar',
+    'nicotra gebhardt': 'Nicotra Gebhardt Fanlar',
+    'plug fanlar': 'Plug Fanlar',
+    'sessiz fanlar': 'Sessiz Kanal Tipi Fanlar',
+    'jet fanlar': 'Otopark Jet Fanları',
+    'duvar tipi fanlar': 'Duvar Tipi Kompakt Aksiyal Fanlar',
+    'duman egzoz fanları': 'Duman Egzoz Fanları',
+    'basınçlandırma fanları': 'Basınçlandırma Fanları',
+    'sığınak fanları': 'Sığınak Havalandırma Fanları',
+    'ex-proof fanlar': 'Ex-Proof Fanlar (Patlama Karşı ATEX Fanlar)',
+}
+
+
+class CategoryClassifier:
+    """
+    Kurallar, kategori map'i ile birlikte bir kez derlenir:
+    - hedefi veritabanında olmayan kurallar baştan elenir (exclude'lu else kolları
+      bu durumda da if kolunun ürünlerini almaz)
+    - tüm kalıplar tek bir Aho-Corasick otomatına girer
+    - birebir eşleşmeler katlanmış anahtarla tek dict'e çevrilir
+    """
+
+    def __init__(self, category_map, rules=CATEGORY_RULES, mappings=CATEGORY_MAPPINGS):
+        # category_map: kategori adı (küçük harf / normalize) → id
+        folded_map = {}
+        for name, cat_id in category_map.items():
+            folded_map.setdefault(fold_turkish(name), cat_id)
+        self._category_ids = folded_map
+
+        self._matcher = KeywordMatcher()
+        self._rules = []
+
+        for rule in sorted(rules, key=lambda r: r.priority):
+            cat_id = folded_map.get(fold_turkish(rule.target))
+            if not cat_id:
+                logger.warning(f"[SMART] Kural hedefi bulunamadı, atlanıyor: {rule.target}")
+                continue
+
+            scraped = frozenset(fold_turkish(p) for p in rule.scraped)
+            name_scope = frozenset(fold_turkish(p) for p in rule.name_scope)
+            keywords = frozenset(fold_turkish(k) for k in rule.keywords)
+            exclude = frozenset(fold_turkish(k) for k in rule.exclude)
+            for pattern in scraped | name_scope | keywords | exclude:
+                self._matcher.add(pattern)
+
+            self._rules.append((scraped, name_scope, keywords, exclude, cat_id, rule.target))
+
+        self._matcher.build()
+
+        self._mapped_ids = {}
+        for scraped_name, target in mappings.items():
+            cat_id = folded_map.get(fold_turkish(target))
+            if cat_id:
+                self._mapped_ids[fold_turkish(scraped_name)] = cat_id
+
+    def classify(self, product_name, scraped_category):
+        """Ürün ismi ve scraped kategoriye göre kategori ID'si (bulunamazsa None)"""
+        # Ürün isimleri tekildir, scraped kategoriler sürekli tekrar eder
+        name_key = fold_turkish(product_name)
+        scraped_key = fold_cached(scraped_category or '')
+
+        name_hits = self._matcher.find_all(name_key)
+        scraped_hits = self._matcher.find_all(scraped_key)
+
+        for scraped, name_scope, keywords, exclude, cat_id, target in self._rules:
+            in_scope = (scraped and not scraped.isdisjoint(scraped_hits)) or \
+                       (name_scope and not name_scope.isdisjoint(name_hits))
+            if not in_scope:
+                continue
+            if keywords and keywords.isdisjoint(name_hits):
+                continue
+            if not exclude.isdisjoint(name_hits):
+                continue
+
+            logger.debug(f"[SMART] '{product_name}' -> {target}")
+            return cat_id
+
+        # Standart kategori eşleştirmeleri, sonra doğrudan isim
+        return self._mapped_ids.get(scraped_key) or self._category_ids.get(scraped_key)
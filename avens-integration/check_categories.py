@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 from supabase import create_client
 from collections import Counter
 
+from text_normalize import turkish_lower
+
 load_dotenv()
 
 supabase = create_client(
@@ -50,7 +52,7 @@ for cat_name, count in sorted(cat_counts.items(), key=lambda x: -x[1]):
 
 # Isı Geri Kazanım kategorilerini detaylı göster
 print("\n=== ISI GERİ KAZANIM CİHAZLARI DETAYLI ===")
-igk_categories = [c for c in categories if 'ısı geri kazanım' in c['name'].lower() or 'konut tipi' in c['name'].lower() or 'ticari tip' in c['name'].lower()]
+igk_categories = [c for c in categories if any(word in turkish_lower(c['name']) for word in ('ısı geri kazanım', 'konut tipi', 'ticari tip'))]
 
 for cat in igk_categories:
     print(f"\n{cat['name']} (ID: {cat['id'][:8]}...):")
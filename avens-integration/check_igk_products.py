@@ -1,6 +1,8 @@
 import json
 from collections import Counter
 
+from text_normalize import fold_cached
+
 # JSON dosyasını yükle
 with open('scraped-data/complete_with_categories_2025-09-30T11-49-23-659Z.json', 'r', encoding='utf-8') as f:
     data = json.load(f)
@@ -8,10 +10,8 @@ with open('scraped-data/complete_with_categories_2025-09-30T11-49-23-659Z.json',
 # Isı Geri Kazanım ürünlerini filtrele
 igk_products = [
     p for p in data 
-    if 'isi geri kazanim' in p['category'].lower().replace('ı', 'i').replace('İ', 'i') or 
-       'isi geri kazanim' in p.get('subcategory', '').lower().replace('ı', 'i').replace('İ', 'i') or
-       'isı geri kazanım' in p['category'].lower() or
-       'isı geri kazanım' in p.get('subcategory', '').lower()
+    if 'isi geri kazanim' in fold_cached(p['category']) or
+       'isi geri kazanim' in fold_cached(p.get('subcategory', ''))
 ]
 
 print("\n" + "="*60)
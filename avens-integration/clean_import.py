@@ -3,7 +3,7 @@
 Temiz Avens Import - Tüm ürünleri sil ve scraped data'dan yeniden import et
 """
 
-import json
+import argparse
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -11,6 +11,14 @@ import logging
 from datetime import datetime
 import re
 
+from batch_writer import BatchWriter, insert_sender
+from category_index import CategoryIndex
+from description_sanitizer import sanitize_records
+from product_sku import SkuAssigner
+from product_sync import content_hash, normalize_source_url, sync_products
+from scrape_journal import read_scrape_output
+from text_normalize import fold_cached, fold_turkish
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +43,9 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Varsayılan girdi: fixed_avens_scraper.js çıktısı (--input ile değiştirilebilir)
+DEFAULT_INPUT = 'scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json'
+
 # Kategori eşleşmeleri
 CATEGORY_MAPPINGS = {
     'konut tipi fanlar': 'Konut Tipi Fanlar',
@@ -60,71 +71,63 @@ CATEGORY_MAPPINGS = {
     'hız kontrolü cihazları': 'Hız Anahtarı'
 }
 
-# Global counter for unique SKU generation
-sku_counter = 0
-
-def generate_sku(name, brand):
-    """SKU kodu oluştur"""
-    global sku_counter
-    sku_counter += 1
-    
-    # İlk 3 harf brand'den
-    brand_part = re.sub(r'[^A-Z]', '', brand.upper())[:3] or 'AVN'
-    
-    # İlk 3 harf ürün adından
-    name_part = re.sub(r'[^A-Z0-9]', '', name.upper())[:3]
-    
-    # Unique counter
-    return f"{brand_part}-{name_part}-{sku_counter:05d}"
+# Katlanmış anahtarlarla (büyük/küçük harf ve Türkçe karakter farkı lookup'ı kaçırmaz)
+_FOLDED_MAPPINGS = {fold_turkish(name): target for name, target in CATEGORY_MAPPINGS.items()}
 
 def normalize_category(category_name):
     """Kategori ismini normalize et"""
-    normalized = category_name.lower().strip()
-    return CATEGORY_MAPPINGS.get(normalized, category_name)
+    return _FOLDED_MAPPINGS.get(fold_cached(category_name), category_name)
 
-def clean_import():
-    """Temiz import işlemi"""
+def clean_import(sync=False, workers=4, input_path=DEFAULT_INPUT):
+    """
+    Temiz import işlemi
+    sync=True ise hiçbir şey silinmez; ürünler source_url ile artımlı senkronize edilir
+    workers: aynı anda yolda olabilecek batch sayısını belirleyen thread sayısı
+    """
     
     logger.info("="*60)
-    logger.info("TEMİZ AVENS IMPORT BAŞLIYOR")
+    logger.info("TEMİZ AVENS IMPORT BAŞLIYOR" + (" (SYNC)" if sync else ""))
     logger.info("="*60)
     
-    # 1. ORDER ITEMS SİL (foreign key constraint için)
-    logger.info("\n1. Order items siliniyor (foreign key için)...")
-    try:
-        supabase.table('venthub_order_items').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-        logger.info("✓ Order items silindi")
-    except Exception as e:
-        logger.warning(f"Order items silme hatası (devam ediliyor): {e}")
-    
-    # 2. TÜM ÜRÜNLERİ SİL
-    logger.info("\n2. Mevcut ürünler siliniyor...")
-    try:
-        response = supabase.table('products').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-        logger.info("✓ Tüm ürünler silindi")
-    except Exception as e:
-        logger.error(f"Ürün silme hatası: {e}")
+    # Girdi yoksa hiçbir şey silinmeden dur
+    if not os.path.exists(input_path):
+        logger.error(f"{input_path} bulunamadı! (--input ile scrape çıktısı verilebilir)")
         return False
     
+    if sync:
+        logger.info("\n1-2. Sync modu: order items ve ürünler silinmeyecek")
+    else:
+        # 1. ORDER ITEMS SİL (foreign key constraint için)
+        logger.info("\n1. Order items siliniyor (foreign key için)...")
+        try:
+            supabase.table('venthub_order_items').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+            logger.info("✓ Order items silindi")
+        except Exception as e:
+            logger.warning(f"Order items silme hatası (devam ediliyor): {e}")
+        
+        # 2. TÜM ÜRÜNLERİ SİL
+        logger.info("\n2. Mevcut ürünler siliniyor...")
+        try:
+            supabase.table('products').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+            logger.info("✓ Tüm ürünler silindi")
+        except Exception as e:
+            logger.error(f"Ürün silme hatası: {e}")
+            return False
+    
     # 3. KATEGORİLERİ YÜKLE
     logger.info("\n3. Kategoriler yükleniyor...")
-    response = supabase.table('categories').select('*').execute()
-    categories = response.data
-    
-    category_map = {}
-    for cat in categories:
-        category_map[cat['name'].lower().strip()] = cat['id']
+    categories = CategoryIndex.load_cached(supabase)
     
     logger.info(f"✓ {len(categories)} kategori yüklendi")
     
     # 4. SCRAPED PRODUCTS YÜKLE
     logger.info("\n4. Scraped ürünler yükleniyor...")
-    json_file = 'scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json'
+    # Dosya akışlı okunur: ilk batch dosyanın tamamı parse edilmeden gönderilir
+    # Journal (.ndjson) verilirse checkpoint'e kadar olan kayıtların güncel görünümü okunur
+    # Açıklamalardaki sayfa CSS'i/HTML'i okunurken temizlenir
+    scraped_products = sanitize_records(read_scrape_output(input_path))
     
-    with open(json_file, 'r', encoding='utf-8') as f:
-        scraped_products = json.load(f)
-    
-    logger.info(f"✓ {len(scraped_products)} ürün yüklendi")
+    logger.info(f"✓ {input_path} okunuyor")
     
     # 5. ÜRÜNLERİ İMPORT ET
     logger.info("\n5. Ürünler import ediliyor...")
@@ -133,19 +136,33 @@ def clean_import():
         'total': 0,
         'imported': 0,
         'skipped': 0,
+        'duplicates': 0,
         'errors': 0
     }
     
-    batch = []
+    sync_rows = []
+    # Insert yolunda görülen source_url'ler (uq_products_source_url; sync'te plan_sync ayıklar)
+    seen_urls = set()
+    # SKU ürün kimliğinden (marka + URL/Ürün Kodu) türetilir, her import'ta aynı kalır
+    assign_sku = SkuAssigner()
     BATCH_SIZE = 50
+    # Bölünerek tekrar denense de yazılamayan satırlar (sunucu hatasıyla birlikte)
+    dead_letter_file = f'clean_import_dead_letter_{datetime.now().strftime("%Y%m%d_%H%M%S")}.ndjson'
+    
+    writer = None
+    if not sync:
+        writer = BatchWriter(insert_sender(supabase, 'products'), batch_size=BATCH_SIZE,
+                             workers=workers, dead_letter_path=dead_letter_file, label='products')
     
     for product in scraped_products:
         stats['total'] += 1
         
         name = product.get('name', '').strip()
-        category = product.get('category', '').strip()
+        category = (product.get('category') or '').strip()
         brand = product.get('brand', 'AVenS').strip()
         price_str = product.get('price', '')
+        url = product.get('url') or product.get('source_url') or product.get('product_url')
+        source_url = normalize_source_url(url)
         
         # Geçersiz ürünleri atla
         if not name or '@' in name or name == 'satis@avensair.com':
@@ -153,9 +170,16 @@ def clean_import():
             stats['skipped'] += 1
             continue
         
+        # Aynı URL ikinci kez gelirse unique index ihlali olur: hata değil tekrar sayılır
+        if not sync and source_url:
+            if source_url in seen_urls:
+                stats['duplicates'] += 1
+                continue
+            seen_urls.add(source_url)
+        
         # Kategori eşleştir
         normalized_category = normalize_category(category)
-        category_id = category_map.get(normalized_category.lower().strip())
+        category_id = categories.id_for_name(normalized_category)
         
         if not category_id:
             logger.warning(f"Kategori bulunamadı: {category} → {normalized_category} (Ürün: {name})")
@@ -181,35 +205,35 @@ def clean_import():
             'brand': brand,
             'category_id': category_id,
             'price': price,
-            'sku': generate_sku(name, brand),
-            'description': f"{name} - Comprehensive Avens import",
+            'sku': assign_sku(brand, source_url=url,
+                              model_code=product.get('product_code'), name=name),
+            'description': product.get('description') or f"{name} - Comprehensive Avens import",
             'status': 'active',
-            'stock_qty': 0
+            'stock_qty': 0,
+            'source_url': source_url,
+            'model_code': (product.get('product_code') or '').strip() or None
         }
+        product_data['content_hash'] = content_hash(product_data)
         
-        batch.append(product_data)
+        if sync:
+            sync_rows.append(product_data)
+            continue
         
-        # Batch dolduğunda insert et
-        if len(batch) >= BATCH_SIZE:
-            try:
-                supabase.table('products').insert(batch).execute()
-                stats['imported'] += len(batch)
-                logger.info(f"✓ {stats['imported']} ürün import edildi...")
-                batch = []
-            except Exception as e:
-                logger.error(f"Batch import hatası: {e}")
-                stats['errors'] += len(batch)
-                batch = []
-    
-    # Kalan batch'i insert et
-    if batch:
-        try:
-            supabase.table('products').insert(batch).execute()
-            stats['imported'] += len(batch)
-            logger.info(f"✓ {stats['imported']} ürün import edildi")
-        except Exception as e:
-            logger.error(f"Son batch import hatası: {e}")
-            stats['errors'] += len(batch)
+        writer.add(product_data)
+    
+    # Kalan batch'leri gönder ve yoldaki istekleri bekle
+    if writer:
+        write_stats = writer.close()
+        stats['imported'] += write_stats['written']
+        stats['errors'] += write_stats['errors']
+    
+    # Sync modu: sadece değişen satırlar yazılır
+    sync_stats = None
+    if sync:
+        sync_stats = sync_products(supabase, sync_rows, batch_size=BATCH_SIZE, workers=workers,
+                                   dead_letter_path=dead_letter_file)
+        stats['imported'] = sync_stats['inserted'] + sync_stats['updated']
+        stats['errors'] += sync_stats['errors']
     
     # ÖZET
     logger.info("\n" + "="*60)
@@ -217,15 +241,29 @@ def clean_import():
     logger.info("="*60)
     logger.info(f"Toplam Ürün: {stats['total']}")
     logger.info(f"✓ Import Edilen: {stats['imported']}")
+    if sync_stats:
+        logger.info(f"  Yeni: {sync_stats['inserted']}, Güncellenen: {sync_stats['updated']}, Değişmeyen: {sync_stats['unchanged']}")
+        logger.info(f"  Pasife Alınan: {sync_stats['deactivated']}, Tekrarlanan URL: {sync_stats['duplicates']}")
     logger.info(f"→ Atlanan: {stats['skipped']}")
+    if stats['duplicates']:
+        logger.info(f"→ Tekrarlanan URL: {stats['duplicates']}")
     logger.info(f"✗ Hata: {stats['errors']}")
     logger.info("="*60)
     
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Avens ürünlerini scraped data\'dan import et')
+    parser.add_argument('--sync', action='store_true',
+                        help='Silmeden artımlı senkronizasyon (yeni/değişen ürünler yazılır, kaybolanlar pasife alınır)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Aynı anda gönderilecek batch sayısı (varsayılan: 4)')
+    parser.add_argument('--input', default=DEFAULT_INPUT,
+                        help=f'Scrape çıktısı: journal (.ndjson) ya da JSON snapshot (varsayılan: {DEFAULT_INPUT})')
+    args = parser.parse_args()
+    
     try:
-        success = clean_import()
+        success = clean_import(sync=args.sync, workers=args.workers, input_path=args.input)
         if success:
             logger.info("\n✅ Temiz import başarıyla tamamlandı!")
         else:
@@ -1,18 +1,17 @@
 #!/usr/bin/env python3
-import json
 from collections import Counter
 
-# Scraped data'yı yükle
-with open('scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json', 'r', encoding='utf-8') as f:
-    scraped = json.load(f)
+from record_reader import iter_records
+
+# Scraped data'yı akışlı oku (sadece kategori sayıları tutulur)
+cats = Counter(p['category'] for p in iter_records('scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json'))
 
 print("="*60)
 print("SCRAPED VERİ ANALİZİ")
 print("="*60)
-print(f"\nToplam ürün: {len(scraped)}\n")
+print(f"\nToplam ürün: {sum(cats.values())}\n")
 
 print("Kategori Dağılımı:")
-cats = Counter([p['category'] for p in scraped])
 for cat, count in sorted(cats.items(), key=lambda x: x[1], reverse=True):
     print(f"  {cat}: {count}")
 
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Firecrawl crawl dump okuyucu
+Crawl çıktısı ({"data": [sayfa, ...]}) dosyadan memory-map ile, sayfa sayfa okunur;
+dosyanın tamamı hiçbir zaman tek bir str/dict olarak çözülmez.
+MCP çıktısındaki {"text_result": [{"text": "<crawl JSON'u string olarak>"}]} sarmalı da
+desteklenir: iç string kaçışları parça parça çözülerek aynı akışlı okuyucuya verilir,
+yani çift json.loads ile iki ayrı kopya tutulmaz. JSON'dan önceki açıklama satırları
+atlanır; yarım kalmış (kesilmiş) dump'larda okunabilen sayfalar döner, gerisi için
+uyarı loglanır.
+"""
+
+import codecs
+import json
+import logging
+import mmap
+import os
+import re
+
+from record_reader import CHUNK_SIZE, iter_stream
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = ' \t\n\r'
+
+_HIGH_SURROGATE_RE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}')
+
+
+class _MappedTextReader:
+    """mmap üzerinde read(n) ile UTF-8 metin okuyucu"""
+
+    def __init__(self, mm):
+        self._mm = mm
+        self._pos = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def read(self, size=CHUNK_SIZE):
+        while True:
+            data = self._mm[self._pos:self._pos + size]
+            self._pos += len(data)
+            text = self._decoder.decode(data, final=not data)
+            if text or not data:
+                return text
+
+
+class _Cursor:
+    """Metin akışı üzerinde JSON değerlerini tek tek çözen okuma tamponu"""
+
+    def __init__(self, reader, chunk_size):
+        self.chunk_size = chunk_size
+        self._reader = reader
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+
+    def _fill(self):
+        chunk = self._reader.read(self.chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self, skip=_WHITESPACE):
+        """skip karakterlerini atlayıp sıradaki karakteri döndür (akış bittiyse '')"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in skip:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def advance(self):
+        self._pos += 1
+
+    def skip_line(self):
+        while True:
+            end = self._buffer.find('\n', self._pos)
+            if end != -1:
+                self._pos = end + 1
+                return
+            self._pos = len(self._buffer)
+            if not self._fill():
+                return
+
+    def decode(self):
+        """Sıradaki JSON değerini çöz"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Tamponun sonuna denk gelen sayı/literal yarım olabilir
+            if end == len(self._buffer) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def read(self, size=CHUNK_SIZE):
+        """Tamponda kalanı, sonra akışın devamını ver (iter_stream'e devretmek için)"""
+        if self._pos < len(self._buffer):
+            text = self._buffer[self._pos:]
+            self._buffer = ''
+            self._pos = 0
+            return text
+        return self._reader.read(size)
+
+
+class _StringReader:
+    """
+    Açılış tırnağından sonrası verilen bir JSON string literal'inin içeriğini,
+    kaçışları çözülmüş olarak parça parça okur (kapanış tırnağında biter)
+    """
+
+    def __init__(self, source):
+        self.truncated = False
+        self._source = source
+        self._pending = ''
+        self._done = False
+
+    def read(self, size=CHUNK_SIZE):
+        need_more = False
+        while not self._done:
+            eof = False
+            if need_more or len(self._pending) < size:
+                more = self._source.read(size)
+                eof = not more
+                self._pending += more
+
+            text = self._pending
+            try:
+                # Kapanış tırnağı bu parçadaysa tek seferde çözülür
+                value, _ = json.decoder.scanstring(text, 0, False)
+            except json.JSONDecodeError:
+                pass
+            else:
+                self._done = True
+                self._pending = ''
+                return value
+            if eof:
+                # Kapanış tırnağı yok: dump kesilmiş, eldeki kadarı döner
+                self._done = self.truncated = True
+                self._pending = ''
+                try:
+                    return _unescape(text)
+                except json.JSONDecodeError:
+                    # Son kaçış dizisi de yarım
+                    return _unescape(text[:_escape_boundary(text)])
+
+            cut = _escape_boundary(text)
+            # Tamponun tamamı yarım bir kaçış dizisiyse bir parça daha okunur
+            need_more = cut == 0
+            if cut:
+                self._pending = text[cut:]
+                return _unescape(text[:cut])
+        return ''
+
+
+def _escape_boundary(text):
+    """Sondaki yarım kalmış olabilecek kaçış dizisinden (\\n, \\u00fc, \\ud83d\\ude00) önceki konum"""
+    cut = text.find('\\', max(0, len(text) - 12))
+    if cut == -1:
+        return len(text)
+    # Surrogate çiftinin ilk yarısı ikinci yarısından ayrılmaz
+    if cut >= 6 and _HIGH_SURROGATE_RE.fullmatch(text, cut - 6, cut):
+        cut -= 6
+    # Ters bölü dizisinin başı her zaman bir kaçış sınırıdır
+    while cut > 0 and text[cut - 1] == '\\':
+        cut -= 1
+    return cut
+
+
+def _unescape(text):
+    return json.decoder.scanstring(text + '"', 0, False)[0]
+
+
+def _seek_key(cursor, keys):
+    """Nesne içinde keys'ten birine gelene kadar diğer alanları atla; anahtarı döndür"""
+    while True:
+        if cursor.peek(_WHITESPACE + ',') != '"':
+            raise ValueError('crawl dosyasında sayfa listesi (data) bulunamadı')
+        key = cursor.decode()
+        if cursor.peek() != ':':
+            raise ValueError(f"crawl dosyasında '{key}' alanından sonra ':' bekleniyordu")
+        cursor.advance()
+        cursor.peek()
+        if key in keys:
+            return key
+        # İlgisiz alan (status, total, expiresAt, ...)
+        cursor.decode()
+
+
+def _seek_pages(cursor):
+    """Cursor'ı sayfa dizisinin başına getir; string içine gömülmüş crawl'a gerekirse iner"""
+    while True:
+        char = cursor.peek()
+        if char == '[':
+            return cursor
+        if char == '"':
+            # text_result: crawl JSON'u string olarak saklanmış (çift kodlama)
+            cursor.advance()
+            cursor = _Cursor(_StringReader(cursor), cursor.chunk_size)
+            continue
+        if char != '{':
+            raise ValueError('crawl dosyasında sayfa listesi (data) bulunamadı')
+
+        cursor.advance()
+        if _seek_key(cursor, ('data', 'text_result', 'text')) == 'text_result':
+            if cursor.peek() != '[':
+                raise ValueError("crawl dosyasında 'text_result' bir liste değil")
+            # İlk eleman: crawl JSON string'i ya da {"text": "..."}
+            cursor.advance()
+
+
+def iter_crawl_pages(path, chunk_size=CHUNK_SIZE):
+    """
+    Crawl dump'ındaki sayfaları ({markdown, metadata, ...}) sırayla üret
+    Kullanım:
+        for page in iter_crawl_pages('firecrawl_full_crawl_200_pages.json'):
+            markdown = page.get('markdown', '')
+    """
+    if os.path.getsize(path) == 0:
+        return
+
+    count = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        cursor = _Cursor(_MappedTextReader(mm), chunk_size)
+        # MCP çıktısından kopyalanan dump'larda JSON'dan önce açıklama satırları olabilir
+        while cursor.peek() not in ('{', '[', ''):
+            cursor.skip_line()
+        pages = _seek_pages(cursor)
+        try:
+            for page in iter_stream(pages, chunk_size):
+                count += 1
+                yield page
+        except ValueError as e:
+            # Kesilmiş dump: o ana kadar okunan sayfalar geçerli
+            logger.warning("%s: %d sayfadan sonra crawl verisi okunamadı (%s)", path, count, e)
@@ -3,6 +3,8 @@ import os
 from supabase import create_client
 from dotenv import load_dotenv
 
+from text_normalize import fold_turkish, turkish_lower
+
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_ROLE_KEY'))
@@ -11,8 +13,8 @@ categories = supabase.table('categories').select('*').execute().data
 
 print("=== KATEGORİLER (lower) ===")
 for cat in sorted(categories, key=lambda x: x['name']):
-    name_lower = cat['name'].lower().strip()
-    name_normalized = name_lower.replace('ı', 'i').replace('İ', 'i').replace('ğ', 'g').replace('ş', 's').replace('ç', 'c').replace('ü', 'u').replace('ö', 'o')
+    name_lower = turkish_lower(cat['name']).strip()
+    name_normalized = fold_turkish(name_lower)
     
     if 'elektrik' in name_lower or 'ısıtıcı' in name_lower or 'isitici' in name_normalized:
         print(f"  {cat['name']}")
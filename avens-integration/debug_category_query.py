@@ -2,6 +2,8 @@ from supabase import create_client
 import os
 from dotenv import load_dotenv
 
+from category_index import CategoryIndex
+
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -15,6 +17,9 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 print('=== DEBUG: KATEGORİ QUERY SİMÜLASYONU ===\n')
 
+# Kategorileri bir kez çek (snapshot güncelse ağa hiç gidilmez)
+categories = CategoryIndex.load_cached(supabase)
+
 # Senaryoları simüle et
 scenarios = [
     {
@@ -41,24 +46,20 @@ for scenario in scenarios:
     print(f"parentSlug: {scenario['parentSlug']}")
     print(f"slug: {scenario['slug']}")
     
-    # Kategorileri çek
-    categories_response = supabase.table('categories').select('*').execute()
-    categories = categories_response.data
-    
     targetCategory = None
     targetParentCategory = None
     
     if scenario['parentSlug'] and scenario['slug']:
         # Alt kategori sayfası
         print("\n→ Alt kategori sayfası algılandı")
-        targetParentCategory = next((c for c in categories if c['slug'] == scenario['parentSlug'] and c['level'] == 0), None)
-        targetCategory = next((c for c in categories if c['slug'] == scenario['slug'] and c['level'] == 1), None)
+        targetParentCategory = categories.by_slug(scenario['parentSlug'], level=0)
+        targetCategory = categories.by_slug(scenario['slug'], level=1)
         print(f"  Parent kategori bulundu: {targetParentCategory['name'] if targetParentCategory else 'YOK!'}")
         print(f"  Alt kategori bulundu: {targetCategory['name'] if targetCategory else 'YOK!'}")
     elif scenario['slug']:
         # Ana kategori sayfası
         print("\n→ Ana kategori sayfası algılandı")
-        targetCategory = next((c for c in categories if c['slug'] == scenario['slug'] and c['level'] == 0), None)
+        targetCategory = categories.by_slug(scenario['slug'], level=0)
         print(f"  Ana kategori bulundu: {targetCategory['name'] if targetCategory else 'YOK!'}")
     
     if not targetCategory:
@@ -69,7 +70,7 @@ for scenario in scenarios:
     print(f"   ID: {targetCategory['id']}")
     
     # Alt kategorileri bul
-    subs = [c for c in categories if c.get('parent_id') == targetCategory['id']]
+    subs = categories.children(targetCategory['id'])
     print(f"   Alt kategori sayısı: {len(subs)}")
     
     # Ürün query'sini belirle
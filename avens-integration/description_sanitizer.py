@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Açıklama temizleyici (parse ile import arasındaki aşama)
+Avens sayfalarından gelen description alanı sayfanın <style> bloğunu (.sepetuyari{…},
+.urunkutu{…}, media query'ler), HTML etiketlerini ve sepet/stok metinlerini taşır.
+Bu aşama style/script bloklarını, CSS kurallarını ve etiketleri atar, boşlukları
+toplar; geriye ürün metni ve özellik tabloları (hücreler ' | ' ile) kalır.
+Tüm regex'ler bir kez derlenir; akışlı okuyucu üzerinde satır içi çalışacak kadar hızlıdır.
+"""
+
+import html
+import re
+
+# HTML blokları ve etiketler
+_BLOCK_RE = re.compile(r'<(script|style|noscript|svg)\b[^>]*>.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+_CELL_END_RE = re.compile(r'</t[dh]\s*>', re.IGNORECASE)
+_LINE_BREAK_RE = re.compile(r'<br\s*/?>|</(?:p|div|li|tr|h[1-6]|table|ul|ol)\s*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Düz metne düşmüş CSS kuralları: "seçici { özellik: değer; }"
+# İç içe bloklar (@media) içten dışa doğru birkaç geçişte temizlenir
+_CSS_RULE_RE = re.compile(r'^[^{}\n]*\{([^{}]*)\}', re.MULTILINE)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+_SPACES_RE = re.compile(r'[ \t\u00a0\u200b]+')
+_CELL_SEPARATOR_RE = re.compile(r'\s*\|\s*(?:\|\s*)*')
+
+# Sitenin her ürün sayfasında tekrar eden, ürünle ilgisi olmayan satırlar
+_BOILERPLATE_RE = re.compile(
+    r'^(?:PDF İNDİR|\(KDV DAHİL\)|Adet :|\+|-|\+ Sepete Ekle|Genel Bilgiler'
+    r'|Ürün Stokta Bulunamadı\..*|Ürün hakkında daha detaylı bilgi almak için.*'
+    r'|[\d.,]+ ₺|(?:(?:Modeller|Ölçüler|Diyagramlar|Dökümanlar|Ürün PDF|Sertifikalar) ?)+)$'
+)
+
+# Bu satırdan öncesi sayfa başlığı/breadcrumb (isim, kategori, ürün kodu ayrı alanlarda zaten var)
+_CONTENT_START = 'Genel Bilgiler'
+
+
+def _strip_css(text):
+    def drop(match):
+        body = match.group(1)
+        # Sadece CSS'e benzeyen bloklar atılır ("özellik: değer" ya da boş)
+        return '' if ':' in body or not body.strip() else match.group(0)
+
+    while '{' in text:
+        stripped = _CSS_RULE_RE.sub(drop, text)
+        if stripped == text:
+            break
+        text = stripped
+    return text
+
+
+def sanitize_description(text):
+    """Ham açıklamayı düz metne çevir; anlamlı içerik yoksa None"""
+    if not text:
+        return None
+
+    if '<' in text:
+        text = _BLOCK_RE.sub('', text)
+        text = _CELL_END_RE.sub(' | ', text)
+        text = _LINE_BREAK_RE.sub('\n', text)
+        text = _TAG_RE.sub('', text)
+        text = html.unescape(text)
+
+    if '{' in text:
+        text = _CSS_COMMENT_RE.sub('', text)
+        text = _strip_css(text)
+
+    lines = []
+    for line in text.splitlines():
+        line = _SPACES_RE.sub(' ', line).strip()
+        if '|' in line:
+            line = _CELL_SEPARATOR_RE.sub(' | ', line).strip(' |')
+        if line == _CONTENT_START:
+            lines = []
+            continue
+        if not line or _BOILERPLATE_RE.match(line):
+            continue
+        # Aynı satırın art arda tekrarı (başlık, breadcrumb) tek satıra iner
+        if lines and lines[-1] == line:
+            continue
+        lines.append(line)
+
+    return '\n'.join(lines) or None
+
+
+def sanitize_records(records, field='description'):
+    """Akıştaki her kaydın açıklamasını temizleyerek kaydı aynen üret"""
+    for record in records:
+        if record.get(field):
+            record[field] = sanitize_description(record[field])
+        yield record
@@ -6,12 +6,18 @@
 - subcategory_id → alt kategori
 """
 
+import argparse
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
 
+from batch_writer import BatchWriter, grouped_update_sender, rpc_sender
+from category_index import CategoryIndex
+from product_stats import fetch_category_stats
+from table_reader import iter_products
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,7 +38,7 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def fix_hierarchy():
+def fix_hierarchy(workers=4):
     """Kategori hiyerarşisini düzelt"""
     
     logger.info("="*60)
@@ -41,40 +47,30 @@ def fix_hierarchy():
     
     # 1. Tüm kategorileri yükle
     logger.info("\n1. Kategoriler yükleniyor...")
-    response = supabase.table('categories').select('*').execute()
-    categories = response.data
-    
-    # Kategori map'leri oluştur
-    cat_by_id = {cat['id']: cat for cat in categories}
+    categories = CategoryIndex.load_cached(supabase)
     
     logger.info(f"OK {len(categories)} kategori yüklendi")
     
-    # 2. Tüm ürünleri yükle
-    logger.info("\n2. Ürünler yükleniyor...")
-    response = supabase.table('products').select('id, name, category_id, subcategory_id').execute()
-    products = response.data
-    
-    logger.info(f"OK {len(products)} ürün yüklendi")
-    
-    # 3. Düzeltmeleri hazırla
-    logger.info("\n3. Düzeltmeler hazırlanıyor...")
+    # 2-3. Ürünleri id sırasıyla akışlı oku ve düzeltmeleri hazırla (tüm tablo bellekte tutulmaz)
+    logger.info("\n2-3. Ürünler okunuyor, düzeltmeler hazırlanıyor...")
     
     updates = []
     stats = {
-        'total': len(products),
+        'total': 0,
         'needs_fix': 0,
         'already_ok': 0,
         'no_parent': 0
     }
     
-    for product in products:
+    for product in iter_products(supabase, 'id, name, category_id, subcategory_id'):
+        stats['total'] += 1
         current_category_id = product['category_id']
         current_subcategory_id = product['subcategory_id']
         
         if not current_category_id:
             continue
             
-        current_category = cat_by_id.get(current_category_id)
+        current_category = categories.get(current_category_id)
         
         if not current_category:
             logger.warning(f"Kategori bulunamadı: {current_category_id} (Ürün: {product['name']})")
@@ -93,7 +89,7 @@ def fix_hierarchy():
                 })
                 stats['needs_fix'] += 1
                 
-                parent_cat = cat_by_id.get(parent_id)
+                parent_cat = categories.get(parent_id)
                 logger.debug(f"Düzeltilecek: {product['name']}")
                 logger.debug(f"  {current_category['name']} → üst: {parent_cat['name'] if parent_cat else 'Unknown'}")
             else:
@@ -110,6 +106,7 @@ def fix_hierarchy():
             else:
                 stats['already_ok'] += 1
     
+    logger.info(f"OK {stats['total']} ürün okundu")
     logger.info(f"OK {stats['needs_fix']} ürün düzeltilecek")
     logger.info(f"OK {stats['already_ok']} ürün zaten doğru")
     
@@ -117,24 +114,20 @@ def fix_hierarchy():
     if updates:
         logger.info(f"\n4. {len(updates)} ürün güncelleniyor...")
         
-        BATCH_SIZE = 50
-        updated_count = 0
+        # Her batch (10k satıra kadar) tek bir bulk_set_product_categories RPC çağrısıyla yazılır.
+        # RPC yoksa aynı (category_id, subcategory_id) hedefine taşınan ürünler yan yana gelsin:
+        # her grup update ... in_('id', [...]) istekleriyle yazılır (satır başına istek yok)
+        updates.sort(key=lambda u: (u['category_id'] or '', u['subcategory_id'] or ''))
+        send = rpc_sender(supabase, 'bulk_set_product_categories', 'p_updates',
+                          fallback=grouped_update_sender(supabase, 'products', key='id'))
         
-        for i in range(0, len(updates), BATCH_SIZE):
-            batch = updates[i:i+BATCH_SIZE]
-            
-            try:
-                for update in batch:
-                    supabase.table('products').update({
-                        'category_id': update['category_id'],
-                        'subcategory_id': update['subcategory_id']
-                    }).eq('id', update['id']).execute()
-                    updated_count += 1
-                
-                logger.info(f"  {updated_count}/{len(updates)} ürün güncellendi...")
-            except Exception as e:
-                logger.error(f"Güncelleme hatası: {e}")
+        with BatchWriter(send, batch_size=10000, max_batch_size=10000,
+                         workers=workers, label='hiyerarşi güncelleme') as writer:
+            writer.extend(updates)
         
+        logger.info(f"  {writer.stats['written']}/{len(updates)} ürün güncellendi")
+        if writer.stats['errors']:
+            logger.error(f"  {writer.stats['errors']} ürün güncellenemedi")
         logger.info(f"OK Tüm güncellemeler tamamlandı")
     else:
         logger.info("\n4. Güncelleme gerekmiyor, tüm ürünler zaten doğru!")
@@ -142,11 +135,10 @@ def fix_hierarchy():
     # 5. Sonuçları kontrol et
     logger.info("\n5. Sonuçlar kontrol ediliyor...")
     
-    response = supabase.table('products').select('category_id, subcategory_id').execute()
-    products_after = response.data
-    
-    with_subcategory = sum(1 for p in products_after if p['subcategory_id'])
-    without_subcategory = sum(1 for p in products_after if not p['subcategory_id'])
+    # Sayılar Postgres'te hesaplanır (ürün satırları indirilmez)
+    counts = fetch_category_stats(supabase)
+    with_subcategory = counts['subcategory_only'] + counts['both']
+    without_subcategory = counts['category_only'] + counts['neither']
     
     logger.info(f"  Alt kategorili ürünler: {with_subcategory}")
     logger.info(f"  Alt kategorisiz ürünler: {without_subcategory}")
@@ -163,8 +155,13 @@ def fix_hierarchy():
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Ürünlerin kategori/alt kategori hiyerarşisini düzelt')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Aynı anda gönderilecek batch sayısı (varsayılan: 4)')
+    args = parser.parse_args()
+    
     try:
-        success = fix_hierarchy()
+        success = fix_hierarchy(workers=args.workers)
         if success:
             logger.info("\nOK Hiyerarşi düzeltmesi başarıyla tamamlandı!")
         else:
@@ -4,13 +4,19 @@ Avens Ürün-Kategori Eşleştirme Düzeltme Scripti
 Avens'ten çekilen ürünleri orijinal kategori bilgilerine göre doğru kategorilere eşleştirir.
 """
 
-import json
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
 
+from batch_writer import BatchWriter, grouped_update_sender, rpc_sender
+from category_index import CategoryIndex
+from name_index import ProductNameIndex
+from record_reader import iter_records
+from table_reader import iter_products
+from text_normalize import fold_cached, fold_turkish
+
 # Logging ayarları
 logging.basicConfig(
     level=logging.INFO,
@@ -37,77 +43,68 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 def load_scraped_products():
-    """Scraped product data'yı yükle"""
+    """Scraped product data'yı akışlı oku (ürünler tek tek üretilir)"""
     json_file = 'scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json'
     
     if not os.path.exists(json_file):
         logger.error(f"{json_file} bulunamadı!")
-        return []
-    
-    with open(json_file, 'r', encoding='utf-8') as f:
-        products = json.load(f)
+        return iter(())
     
-    logger.info(f"{len(products)} ürün yüklendi")
-    return products
+    logger.info(f"{json_file} okunuyor")
+    return iter_records(json_file)
 
 def get_all_categories():
     """Veritabanındaki tüm kategorileri al"""
-    response = supabase.table('categories').select('*').execute()
-    categories = response.data
-    
-    # Kategori isminden ID'ye mapping oluştur
-    category_map = {}
-    for cat in categories:
-        category_map[cat['name'].lower().strip()] = cat['id']
+    categories = CategoryIndex.load_cached(supabase)
     
     logger.info(f"{len(categories)} kategori yüklendi")
-    return category_map
+    return categories
+
+# Bilinen eşleşmeler (scraped kategori → VentHub kategori adı)
+CATEGORY_MAPPINGS = {
+    'konut tipi fanlar': 'Konut Tipi Fanlar',
+    'santrifüj fanlar': 'Santrifüj Fanlar',
+    'kanal tipi fanlar': 'Kanal Tipi Fanlar',
+    'çatı tipi fanlar': 'Çatı Tipi Fanlar',
+    'endüstriyel fanlar': 'Endüstriyel Fanlar',
+    'nicotra gebhardt fanlar': 'Nicotra Gebhardt Fanlar',
+    'plug fanlar': 'Plug Fanlar',
+    'sessiz kanal tipi fanlar': 'Sessiz Kanal Tipi Fanlar',
+    'otopark jet fanları': 'Otopark Jet Fanları',
+    'duvar tipi kompakt aksiyal fanlar': 'Duvar Tipi Kompakt Aksiyal Fanlar',
+    'duman egzoz fanları': 'Duman Egzoz Fanları',
+    'basınçlandırma fanları': 'Basınçlandırma Fanları',
+    'sığınak havalandırma fanları': 'Sığınak Havalandırma Fanları',
+    'ex-proof fanlar (patlama karşı atex fanlar)': 'Ex-Proof Fanlar (Patlama Karşı ATEX Fanlar)',
+    'aksesuar': 'Aksesuarlar',
+    'aksesuarlar': 'Aksesuarlar',
+    'gemici anemostadı': 'Gemici Anemostadı',
+    'flexible hava kanalları': 'Flexible Hava Kanalları',
+    'hava perdeleri': 'Hava Perdeleri',
+    'elektrikli isıtıcılı': 'Elektrikli Isıtıcılı',
+    'ortam havalı': 'Ortam Havalı',
+    'nem alma cihazları': 'Nem Alma Cihazları',
+    'ısı geri kazanım cihazları': 'Isı Geri Kazanım Cihazları',
+    'konut tipi': 'Konut Tipi',
+    'ticari tip': 'Ticari Tip',
+    'hız kontrolü cihazları': 'Hız Kontrolü Cihazları',
+    'danfoss': 'DANFOSS',
+    'hız anahtarı': 'Hız Anahtarı'
+}
+
+# Katlanmış anahtarlarla (büyük/küçük harf ve Türkçe karakter farkı lookup'ı kaçırmaz)
+_FOLDED_MAPPINGS = {fold_turkish(name): target for name, target in CATEGORY_MAPPINGS.items()}
 
 def normalize_category_name(category_name):
     """Kategori ismini normalize et"""
-    # Özel karakterleri temizle
-    normalized = category_name.lower().strip()
-    
-    # Bilinen eşleşmeler
-    mappings = {
-        'konut tipi fanlar': 'Konut Tipi Fanlar',
-        'santrifüj fanlar': 'Santrifüj Fanlar',
-        'kanal tipi fanlar': 'Kanal Tipi Fanlar',
-        'çatı tipi fanlar': 'Çatı Tipi Fanlar',
-        'endüstriyel fanlar': 'Endüstriyel Fanlar',
-        'nicotra gebhardt fanlar': 'Nicotra Gebhardt Fanlar',
-        'plug fanlar': 'Plug Fanlar',
-        'sessiz kanal tipi fanlar': 'Sessiz Kanal Tipi Fanlar',
-        'otopark jet fanları': 'Otopark Jet Fanları',
-        'duvar tipi kompakt aksiyal fanlar': 'Duvar Tipi Kompakt Aksiyal Fanlar',
-        'duman egzoz fanları': 'Duman Egzoz Fanları',
-        'basınçlandırma fanları': 'Basınçlandırma Fanları',
-        'sığınak havalandırma fanları': 'Sığınak Havalandırma Fanları',
-        'ex-proof fanlar (patlama karşı atex fanlar)': 'Ex-Proof Fanlar (Patlama Karşı ATEX Fanlar)',
-        'aksesuar': 'Aksesuarlar',
-        'aksesuarlar': 'Aksesuarlar',
-        'gemici anemostadı': 'Gemici Anemostadı',
-        'flexible hava kanalları': 'Flexible Hava Kanalları',
-        'hava perdeleri': 'Hava Perdeleri',
-        'elektrikli isıtıcılı': 'Elektrikli Isıtıcılı',
-        'ortam havalı': 'Ortam Havalı',
-        'nem alma cihazları': 'Nem Alma Cihazları',
-        'ısı geri kazanım cihazları': 'Isı Geri Kazanım Cihazları',
-        'konut tipi': 'Konut Tipi',
-        'ticari tip': 'Ticari Tip',
-        'hız kontrolü cihazları': 'Hız Kontrolü Cihazları',
-        'danfoss': 'DANFOSS',
-        'hız anahtarı': 'Hız Anahtarı'
-    }
-    
-    return mappings.get(normalized, category_name)
+    return _FOLDED_MAPPINGS.get(fold_cached(category_name), category_name)
 
 def fix_category_mappings():
     """Ürün-kategori eşleştirmelerini düzelt"""
     
     # Scraped products ve kategorileri yükle
     scraped_products = load_scraped_products()
-    category_map = get_all_categories()
+    categories = get_all_categories()
     
     stats = {
         'total': 0,
@@ -118,6 +115,13 @@ def fix_category_mappings():
     
     missing_categories = set()
     
+    # Ürün tablosu bir kez akışlı okunup isim indeksine çevrilir (ürün başına sorgu yok)
+    product_index = ProductNameIndex(iter_products(supabase, 'id, name, category_id'))
+    logger.info(f"{len(product_index)} ürün ismi indekslendi")
+    
+    # id → yeni category_id (aynı ürüne birden fazla kayıt düşerse sonuncusu geçerli)
+    changes = {}
+    
     for product in scraped_products:
         stats['total'] += 1
         
@@ -131,50 +135,42 @@ def fix_category_mappings():
         
         # Kategoriyi normalize et
         normalized_category = normalize_category_name(avens_category)
-        category_key = normalized_category.lower().strip()
         
         # VentHub'da kategoriyi bul
-        if category_key not in category_map:
+        category_id = categories.id_for_name(normalized_category)
+        if not category_id:
             missing_categories.add(normalized_category)
             logger.warning(f"Kategori bulunamadı: {normalized_category} (Ürün: {product_name})")
             stats['not_found'] += 1
             continue
         
-        category_id = category_map[category_key]
+        # Veritabanındaki ürünü isim indeksinden bul (tam → önek → içerme)
+        db_product, match_kind = product_index.lookup(product_name)
+        if not db_product:
+            logger.warning(f"Ürün DB'de bulunamadı: {product_name}")
+            stats['not_found'] += 1
+            continue
         
-        # Veritabanındaki ürünü bul ve güncelle
-        try:
-            # URL bazında ürünü bul
-            product_url = product.get('url', '')
-            
-            # Ürünü description'a göre bul (Comprehensive Avens import içeriyor)
-            response = supabase.table('products')\
-                .select('id, name, category_id')\
-                .ilike('name', f"%{product_name}%")\
-                .execute()
-            
-            if response.data and len(response.data) > 0:
-                db_product = response.data[0]
-                current_category_id = db_product.get('category_id')
-                
-                # Eğer kategori farklıysa güncelle
-                if current_category_id != category_id:
-                    update_response = supabase.table('products')\
-                        .update({'category_id': category_id})\
-                        .eq('id', db_product['id'])\
-                        .execute()
-                    
-                    logger.info(f"✓ Güncellendi: {product_name} → {normalized_category}")
-                    stats['updated'] += 1
-                else:
-                    logger.debug(f"Zaten doğru kategoride: {product_name}")
-            else:
-                logger.warning(f"Ürün DB'de bulunamadı: {product_name}")
-                stats['not_found'] += 1
-                
-        except Exception as e:
-            logger.error(f"Hata - {product_name}: {str(e)}")
-            stats['errors'] += 1
+        # Eğer kategori farklıysa güncellenecekler listesine al
+        if db_product.get('category_id') != category_id:
+            changes[db_product['id']] = category_id
+            logger.info(f"✓ Güncellenecek ({match_kind}): {product_name} → {normalized_category}")
+        else:
+            changes.pop(db_product['id'], None)
+            logger.debug(f"Zaten doğru kategoride: {product_name}")
+    
+    # Değişen atamalar tek RPC çağrısıyla (yoksa hedef kategoriye göre gruplanıp) toplu yazılır
+    if changes:
+        updates = sorted(({'id': product_id, 'category_id': category_id}
+                          for product_id, category_id in changes.items()),
+                         key=lambda u: u['category_id'])
+        send = rpc_sender(supabase, 'bulk_set_product_categories', 'p_updates',
+                          fallback=grouped_update_sender(supabase, 'products', key='id'))
+        with BatchWriter(send, batch_size=10000, max_batch_size=10000,
+                         label='kategori eşleştirme') as writer:
+            writer.extend(updates)
+        stats['updated'] = writer.stats['written']
+        stats['errors'] = writer.stats['errors']
     
     # Özet
     logger.info("\n" + "="*60)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Trigram tabanlı bulanık ürün eşleştirme
+Referans ürünler (örn. eski scrape) isimlerinin kelime trigram'larıyla ters
+indekse yazılır; sorgu ismi aynı bloktaki (varsayılan: marka) adaylarla Jaccard
+benzerliği üzerinden karşılaştırılır (pg_trgm similarity() ile aynı ölçü).
+Her ürünü her ürünle karşılaştırmak yerine aday kümesi sayım filtresiyle bulunur:
+sorgunun n trigram'ı varsa ve eşik t ise, eşleşen bir aday en az ceil(t * n)
+trigram'ı paylaşmak zorundadır. Sorgunun en nadir n - ceil(t * n) + 1 + k
+trigram'ının posting listeleri sayılır; bunlardan k + 1'inden azını içeren aday
+eşiği geçemez ve tam karşılaştırmaya hiç girmez. 'fan', ' ve' gibi her isimde
+geçen trigram'ların uzun listeleri taranmaz.
+"""
+
+import math
+from collections import Counter
+from typing import Any, NamedTuple, Optional
+
+from name_index import normalize_product_name
+
+DEFAULT_THRESHOLD = 0.5
+
+# Sayım filtresine eklenen fazladan trigram (k): aday sayısını düşürür, sayılan liste uzar
+EXTRA_GRAMS = 4
+
+
+def word_trigrams(key):
+    """pg_trgm gibi kelime başı iki, sonu bir boşlukla doldurulmuş trigram'lar"""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class Match(NamedTuple):
+    record: Optional[Any]       # Eşleşen referans kayıt (yoksa None)
+    score: float                # Jaccard benzerliği (0-1), eşleşme güveni
+    kind: Optional[str]         # 'exact' | 'fuzzy' | None
+
+
+NO_MATCH = Match(None, 0.0, None)
+
+
+class _Block:
+    __slots__ = ('exact', 'records', 'grams', 'postings')
+
+    def __init__(self):
+        self.exact = {}
+        self.records = []
+        self.grams = []
+        self.postings = {}
+
+
+class TrigramMatcher:
+    """
+    Kullanım:
+        matcher = TrigramMatcher(threshold=0.5)
+        matcher.extend(old_products, name=lambda p: p['name'], block=lambda p: brand_of(p))
+        match = matcher.match('Vortice VORT QUADRO EVO', block='Vortice')
+        match.record, match.score, match.kind
+    Aynı isimle birden fazla kayıt eklenirse tam eşleşmede sonuncusu döner; bulanık
+    eşleşmede aynı benzerlikte birden fazla aday varsa önce eklenen kazanır.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        if not 0 < threshold <= 1:
+            raise ValueError('threshold 0 ile 1 arasında olmalı')
+        self.threshold = threshold
+        self._blocks = {}
+
+    def __len__(self):
+        return sum(len(block.records) for block in self._blocks.values())
+
+    def add(self, name, record, block=None):
+        key = normalize_product_name(name)
+        if not key:
+            return
+        target = self._blocks.get(block)
+        if target is None:
+            target = self._blocks[block] = _Block()
+
+        # Aynı isim tekrar eklenirse son kayıt kazanır (isim → kayıt dict'i gibi)
+        target.exact[key] = record
+        position = len(target.records)
+        grams = word_trigrams(key)
+        target.records.append(record)
+        target.grams.append(grams)
+        for gram in grams:
+            target.postings.setdefault(gram, []).append(position)
+
+    def extend(self, records, name, block=None):
+        """records'u ekle; name/block kayıttan isim ve blok anahtarı çıkaran fonksiyonlar"""
+        for record in records:
+            self.add(name(record), record, block(record) if block else None)
+
+    def match(self, name, block=None):
+        """İsme eşik üstündeki en benzer kayıt (bulunamazsa NO_MATCH)"""
+        target = self._blocks.get(block)
+        key = normalize_product_name(name)
+        if target is None or not key:
+            return NO_MATCH
+
+        record = target.exact.get(key)
+        if record is not None:
+            return Match(record, 1.0, 'exact')
+
+        grams = word_trigrams(key)
+        size = len(grams)
+        postings = target.postings
+
+        # Eşik için gereken ortak trigram sayısı (float hatasına pay bırakılır)
+        min_overlap = math.ceil(self.threshold * size - 1e-9)
+        prefix = size - min_overlap + 1
+        extra = min(EXTRA_GRAMS, size - prefix)
+
+        # En nadir prefix + extra trigram'ın listeleri tek seferde sayılır (Counter C hızında sayar)
+        ordered = sorted(grams, key=lambda gram: len(postings.get(gram, ())))
+        positions = []
+        for gram in ordered[:prefix + extra]:
+            positions += postings.get(gram, ())
+        hits = Counter(positions)
+
+        # Jaccard >= t için aday boyutu [t * size, size / t] aralığında olmalı
+        min_size = self.threshold * size
+        max_size = size / self.threshold
+
+        best_score = 0.0
+        best_position = None
+        for position, count in hits.items():
+            if count <= extra:
+                continue
+            other = target.grams[position]
+            if not min_size <= len(other) <= max_size:
+                continue
+            shared = len(grams & other)
+            score = shared / (size + len(other) - shared)
+            if score > best_score or (score == best_score and position < best_position):
+                best_score = score
+                best_position = position
+
+        if best_position is None or best_score < self.threshold:
+            return NO_MATCH
+        return Match(target.records[best_position], best_score, 'fuzzy')
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick anahtar kelime eşleştirici
+Çok sayıda kalıbı bir kez derler, sonra metni tek geçişte tarayıp
+içinde geçen tüm kalıpları (alt dizgi olarak) bulur.
+"""
+
+
+class KeywordMatcher:
+    """
+    Kullanım:
+        matcher = KeywordMatcher([('danfoss', 'DANFOSS'), ('kelepce', 'KELEPCE')])
+        matcher.find_all('danfoss fc-51 hız kontrol')  # -> {'DANFOSS'}
+    """
+
+    def __init__(self, keywords=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._built = False
+
+        for keyword, value in keywords:
+            self.add(keyword, value)
+
+    def __len__(self):
+        return sum(len(out) for out in self._out)
+
+    def add(self, keyword, value=None):
+        """Kalıp ekle; value verilmezse kalıbın kendisi döner"""
+        if not keyword:
+            return
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+
+        self._out[state] = self._out[state] + (keyword if value is None else value,)
+        self._built = False
+
+    def build(self):
+        """Fail linklerini hesapla (BFS); eşleşmeler fail zinciri boyunca birleştirilir"""
+        queue = []
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+        self._built = True
+        return self
+
+    def iter_matches(self, text):
+        """(bitiş indeksi, değer) çiftlerini metindeki sırayla üret"""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                for value in out[state]:
+                    yield index, value
+
+    def find_all(self, text):
+        """Metinde geçen tüm kalıpların değer kümesi"""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        found = set()
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+
+        return found
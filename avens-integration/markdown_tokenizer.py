@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Firecrawl markdown tokenizer
+Avens sayfalarının markdown çıktısı tek bir derlenmiş regex ile, sayfa başına
+tek geçişte token'lara ayrılır: başlıklar, breadcrumb öğeleri, görseller,
+ürün kartları (### [isim](url)), "**Etiket :** değer" alanları, linkler,
+fiyatlar ve "Ürün Kodu" alanları.
+Parser'lar sayfayı tekrar tekrar taramak yerine bu token dizisini yürür.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+
+class Token(NamedTuple):
+    kind: str                   # heading | card | crumb | field | image | link | code | price
+    value: str                  # başlık/isim/alt/alan değeri, ürün kodu ya da ham fiyat metni
+    url: Optional[str] = None   # link hedefi ya da görsel kaynağı
+    extra: object = None        # heading: seviye, field: etiket, image: sardığı link, price: 'suffix' | 'prefix'
+    pos: int = 0
+
+
+# Alternatiflerin sırası önemlidir: kart başlığı düz başlıktan, görsel linkten önce denenir
+_TOKEN_RE = re.compile(r'''
+    (?P<card>^\#{1,6}[ \t]+\[(?P<card_name>[^\]]+)\]\((?P<card_url>[^)\s]+)[^)]*\)[^\n]*$)
+  | (?P<heading>^(?P<hashes>\#{1,6})[ \t]+(?P<heading_text>[^\n]*?)[ \t]*$)
+  | (?P<field>^\*\*(?P<field_name>[^*\n]+?)[ \t]*:[ \t]*\*\*[ \t]*(?P<field_value>[^\n]*?)[ \t]*$)
+  | (?P<crumb>^\d+\.[ \t]+(?:\[(?P<crumb_link>[^\]]+)\]\((?P<crumb_url>[^)\s]+)[^)]*\)|(?P<crumb_text>[^\n]*?))[ \t]*$)
+  | (?P<image>\[?!\[(?P<alt>[^\]]*)\]\((?P<src>[^)\s]+)[^)]*\)(?:\]\((?P<image_href>[^)\s]+)[^)]*\))?)
+  | (?P<link>\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)[^)]*\))
+  | (?P<code>Ürün\ Kodu[^A-Z0-9\n]*(?P<code_value>[A-Z0-9]+))
+  | (?P<price>(?P<price_value>\d[\d.,]*)[ \t]*₺|₺[ \t]*(?P<price_prefix>\d[\d.,]*))
+''', re.MULTILINE | re.VERBOSE)
+
+_FIELD_LINK_RE = re.compile(r'^\[([^\]]+)\]\(([^)\s]+)[^)]*\)$')
+_CODE_VALUE_RE = re.compile(r'[A-Z0-9]+')
+
+
+def tokenize(markdown: str) -> List[Token]:
+    """Markdown'ı sırayla token listesine çevir (tek geçiş)"""
+    tokens = []
+    append = tokens.append
+
+    for match in _TOKEN_RE.finditer(markdown):
+        group = match.group
+        pos = match.start()
+
+        if group('card') is not None:
+            append(Token('card', group('card_name').strip(), group('card_url'), None, pos))
+        elif group('heading') is not None:
+            append(Token('heading', group('heading_text').strip(), None, len(group('hashes')), pos))
+        elif group('field') is not None:
+            name = group('field_name').strip()
+            value = group('field_value')
+            url = None
+            link = _FIELD_LINK_RE.match(value)
+            if link:
+                value, url = link.group(1), link.group(2)
+            append(Token('field', value.strip(), url, name, pos))
+            if name == 'Ürün Kodu':
+                code = _CODE_VALUE_RE.search(value)
+                if code:
+                    append(Token('code', code.group(0), None, None, pos))
+        elif group('crumb') is not None:
+            text = group('crumb_link') if group('crumb_link') is not None else group('crumb_text')
+            append(Token('crumb', text.strip(), group('crumb_url'), None, pos))
+        elif group('image') is not None:
+            append(Token('image', group('alt').strip(), group('src'), group('image_href'), pos))
+        elif group('link') is not None:
+            append(Token('link', group('link_text').strip(), group('link_url'), None, pos))
+        elif group('code') is not None:
+            append(Token('code', group('code_value'), None, None, pos))
+        elif group('price_value') is not None:
+            append(Token('price', group('price_value'), None, 'suffix', pos))
+        else:
+            append(Token('price', group('price_prefix'), None, 'prefix', pos))
+
+    return tokens
+
+
+def first(tokens: List[Token], kind: str, **where) -> Optional[Token]:
+    """Verilen türdeki ilk token (where: alan=değer filtreleri)"""
+    for token in tokens:
+        if token.kind == kind and all(getattr(token, key) == value for key, value in where.items()):
+            return token
+    return None
+
+
+def iter_cards(tokens: List[Token]):
+    """
+    Ürün kartlarını (kart, görsel, fiyat) üçlüleri olarak üret
+    Kartın küçük resmi başlığından hemen önce, fiyatı hemen sonra gelir; böylece
+    her kart kendi görseli ve fiyatıyla tek geçişte eşleşir (görsel/fiyat yoksa None)
+    """
+    card = image = price = None
+    pending_image = None
+
+    for token in tokens:
+        if token.kind == 'card':
+            if card is not None:
+                yield card, image, price
+            card, image, price = token, pending_image, None
+            pending_image = None
+        elif token.kind == 'image':
+            pending_image = token
+        elif token.kind == 'price' and card is not None and price is None:
+            price = token
+
+    if card is not None:
+        yield card, image, price
@@ -5,81 +5,103 @@
 2. Yeni veri (334 ürün) - Kategorileri "Genel"
 
 Yeni verideki ürünlerin kategorilerini, eski verideki aynı ürünlere bakarak belirle.
+Eşleştirme marka bloğu içinde trigram benzerliği ile yapılır (boşluk, ek, büyük/küçük
+harf farkları eşleşmeyi kaçırmaz); her eşleşmenin güveni raporlanır.
 """
 
-import json
-from collections import defaultdict
+from collections import Counter
 
-# Veriyi yükle
-print("📂 Veriler yükleniyor...")
+from fuzzy_match import TrigramMatcher
+from product_vocabulary import load_vocabulary
+from record_reader import iter_records, write_records
 
-with open('scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json', 'r', encoding='utf-8') as f:
-    old_data = json.load(f)
+# Bu benzerliğin altındaki eşleşmeler rapor sonunda ayrıca listelenir
+LOW_CONFIDENCE = 0.7
 
-with open('scraped-data/all_products_2025-09-30T10-47-25.905Z.json', 'r', encoding='utf-8') as f:
-    new_data = json.load(f)
+# Veriyi yükle
+print("📂 Veriler yükleniyor...")
 
-print(f"✓ Eski veri: {len(old_data)} ürün")
-print(f"✓ Yeni veri: {len(new_data)} ürün")
+# Eski veriden sadece isim → kategori tutulur (marka bloklu trigram indeksi); yeni veri yazılırken akışlı okunur
+vocabulary = load_vocabulary()
+old_products = TrigramMatcher()
+old_count = 0
+for p in iter_records('scraped-data/fixed_products_2025-09-29T10-49-48-208Z.json'):
+    old_count += 1
+    name = p.get('name', '')
+    old_products.add(name, p.get('category', 'Genel'), block=vocabulary.brand_from_name(name))
 
-# Eski verideki ürünleri isme göre map'le
-old_products_by_name = {}
-for p in old_data:
-    name = p.get('name', '').strip().lower()
-    if name:
-        old_products_by_name[name] = p
+print(f"✓ Eski veri: {old_count} ürün")
 
 print(f"\n🔍 Kategori eşleştirme yapılıyor...")
 
 matched = 0
 unmatched = 0
+match_kinds = Counter()
+low_confidence = []
+cats = Counter()
+
+
+def categorize(products):
+    """Yeni verideki ürünlere kategori ata (ürünler tek tek geçer)"""
+    global matched, unmatched
+
+    for product in products:
+        original_name = product.get('name', '')
+        name = original_name.strip().lower()
+
+        # Eski veride bu ürün (ya da yeterince benzeri) var mı?
+        match = old_products.match(original_name, block=vocabulary.brand_from_name(original_name))
+        if match.kind:
+            product['category'] = match.record
+            matched += 1
+            match_kinds[match.kind] += 1
+            if match.score < LOW_CONFIDENCE:
+                low_confidence.append((match.score, original_name, match.record))
+        else:
+            unmatched += 1
+            # URL'den kategori tahmini yap
+            url = product.get('url', '').lower()
 
-for product in new_data:
-    name = product.get('name', '').strip().lower()
-    
-    # Eski veride bu ürün var mı?
-    if name in old_products_by_name:
-        old_product = old_products_by_name[name]
-        product['category'] = old_product.get('category', 'Genel')
-        matched += 1
-    else:
-        unmatched += 1
-        # URL'den kategori tahmini yap
-        url = product.get('url', '').lower()
-        
-        # URL pattern matching
-        if 'casals' in url or 'casals' in name:
-            product['category'] = 'Santrifüj Fanlar'
-        elif 'vortice' in url or 'vortice' in name:
-            # Vortice ürünleri farklı kategorilerde olabilir
-            if 'quadro' in name or 'me ' in name or 'punto' in name:
-                product['category'] = 'Konut Tipi Fanlar'
-            elif 'lineo' in name:
+            # URL pattern matching
+            if 'casals' in url or 'casals' in name:
+                product['category'] = 'Santrifüj Fanlar'
+            elif 'vortice' in url or 'vortice' in name:
+                # Vortice ürünleri farklı kategorilerde olabilir
+                if 'quadro' in name or 'me ' in name or 'punto' in name:
+                    product['category'] = 'Konut Tipi Fanlar'
+                elif 'lineo' in name:
+                    product['category'] = 'Kanal Tipi Fanlar'
+                elif 'nord' in name or 'ca ' in name:
+                    product['category'] = 'Çatı Tipi Fanlar'
+                else:
+                    product['category'] = 'Konut Tipi Fanlar'  # Default
+            elif 'enkelfan' in url or 'enkelfan' in name:
                 product['category'] = 'Kanal Tipi Fanlar'
-            elif 'nord' in name or 'ca ' in name:
-                product['category'] = 'Çatı Tipi Fanlar'
             else:
-                product['category'] = 'Konut Tipi Fanlar'  # Default
-        elif 'enkelfan' in url or 'enkelfan' in name:
-            product['category'] = 'Kanal Tipi Fanlar'
-        else:
-            product['category'] = 'Genel'
+                product['category'] = 'Genel'
+
+        cats[product['category']] += 1
+        yield product
+
+
+# Kaydet (okuma, eşleştirme ve yazma tek geçişte)
+output_file = 'scraped-data/merged_products_final.json'
+total = write_records(output_file, categorize(iter_records('scraped-data/all_products_2025-09-30T10-47-25.905Z.json')))
 
-print(f"✓ {matched} ürün eşleştirildi")
+print(f"✓ Yeni veri: {total} ürün")
+print(f"✓ {matched} ürün eşleştirildi (birebir: {match_kinds['exact']}, benzerlik: {match_kinds['fuzzy']})")
 print(f"→ {unmatched} ürün yeni (tahmin edildi)")
 
+if low_confidence:
+    print(f"\n⚠️  Düşük güvenli eşleşmeler (benzerlik < {LOW_CONFIDENCE}):")
+    for score, name, category in sorted(low_confidence):
+        print(f"  {score:.2f}  {name} → {category}")
+
 # Kategori dağılımı
 print(f"\n📊 Kategori Dağılımı:")
-from collections import Counter
-cats = Counter([p['category'] for p in new_data])
 for cat, count in sorted(cats.items(), key=lambda x: x[1], reverse=True):
     print(f"  {cat}: {count}")
 
-# Kaydet
-output_file = 'scraped-data/merged_products_final.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(new_data, f, ensure_ascii=False, indent=2)
-
 print(f"\n✅ Birleştirilmiş veri kaydedildi: {output_file}")
-print(f"📊 Toplam {len(new_data)} ürün")
+print(f"📊 Toplam {total} ürün")
 print("="*60)
\ No newline at end of file
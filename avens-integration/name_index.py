@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Bellek içi ürün ismi indeksi
+Ürün tablosu bir kez okunur; isimler normalize edilip üç yoldan aranabilir hale
+getirilir:
+- tam eşleşme: normalize isim → ürün (dict)
+- önek: sıralı anahtar listesinde bisect (isim veritabanında ek ile devam ediyorsa)
+- içerme: trigram posting listeleri; sorgunun trigram'larını içeren anahtarlar
+  kesişimle daraltılır, sonra alt string kontrolü yapılır (ilike '%isim%' karşılığı)
+Her sorgu sunucuya gitmez; N ürünlük eşleştirme tek tablo okuması ile biter.
+"""
+
+import bisect
+
+from text_normalize import fold_turkish
+
+
+def normalize_product_name(name):
+    """Ürün ismi anahtarı: Türkçe katlanmış, küçük harf, tek boşluk"""
+    return ' '.join(fold_turkish(name).split())
+
+
+def trigrams(text):
+    """Metnin 3 karakterlik parçaları (tekrarsız)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ProductNameIndex:
+    """
+    Kullanım:
+        index = ProductNameIndex(iter_products(supabase, 'id, name, category_id'))
+        product, kind = index.lookup('ENKELFAN 250 EEC')   # kind: 'exact' | 'prefix' | 'contains' | None
+    Aynı anahtara düşen birden fazla ürün varsa ilk gelen (id sırasında en küçük) kullanılır.
+    """
+
+    def __init__(self, products=()):
+        self._by_key = {}
+        for product in products:
+            key = normalize_product_name(product.get('name'))
+            if key:
+                self._by_key.setdefault(key, product)
+
+        self._keys = sorted(self._by_key)
+        self._postings = {}
+        for position, key in enumerate(self._keys):
+            for gram in trigrams(key):
+                self._postings.setdefault(gram, []).append(position)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, name):
+        """(ürün, eşleşme türü); bulunamazsa (None, None)"""
+        key = normalize_product_name(name)
+        if not key:
+            return None, None
+
+        product = self._by_key.get(key)
+        if product is not None:
+            return product, 'exact'
+
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position].startswith(key):
+            return self._by_key[self._keys[position]], 'prefix'
+
+        position = self._find_containing(key)
+        if position is not None:
+            return self._by_key[self._keys[position]], 'contains'
+
+        return None, None
+
+    def _find_containing(self, key):
+        grams = trigrams(key)
+        if not grams:
+            # 3 karakterden kısa sorgu: trigram yok, doğrudan tarama
+            return next((i for i, candidate in enumerate(self._keys) if key in candidate), None)
+
+        # En seçici listeden başlayıp kesiştir; trigram'ı hiç geçmeyen sorgu erken biter
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        if not postings[0]:
+            return None
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return None
+
+        # Trigram'ların hepsinin geçmesi yetmez, sıralı alt string kontrolü
+        return next((i for i in sorted(candidates) if key in self._keys[i]), None)
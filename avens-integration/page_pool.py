@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Paralel sayfa ayrıştırma
+Crawl sayfaları parça parça bir ProcessPoolExecutor'a dağıtılır; sonuçlar
+sayfa sırasıyla döner, böylece birleştirme ve de-dup seri çalışmayla aynı sonucu verir.
+ParseCache verilirse sadece cache'te olmayan (içeriği değişmiş) sayfalar ayrıştırılır.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Bundan az sayfa için process başlatmak kazandırmaz
+MIN_PARALLEL_PAGES = 16
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def parse_pages(parse_page, markdowns, source_urls, workers=None, cache=None):
+    """
+    parse_page(markdown, source_url) sonuçlarını sayfa sırasıyla üret
+    parse_page modül seviyesinde tanımlı (pickle'lanabilir) bir fonksiyon olmalı
+    workers=1 ya da az sayfa varsa seri çalışır
+    """
+    if cache is None:
+        yield from _parse(parse_page, markdowns, source_urls, workers)
+        return
+
+    results = [cache.get(markdown, source_url) for markdown, source_url in zip(markdowns, source_urls)]
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    parsed = _parse(parse_page, [markdowns[i] for i in missing], [source_urls[i] for i in missing], workers)
+    for i, records in zip(missing, parsed):
+        cache.put(markdowns[i], source_urls[i], records)
+        results[i] = records
+
+    yield from results
+
+
+def _parse(parse_page, markdowns, source_urls, workers):
+    workers = workers or default_workers()
+
+    if workers <= 1 or len(markdowns) < MIN_PARALLEL_PAGES:
+        yield from map(parse_page, markdowns, source_urls)
+        return
+
+    # Worker başına birkaç parça: IPC yükü düşük, yük dengesi yeterli
+    chunksize = max(1, len(markdowns) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_page, markdowns, source_urls, chunksize=chunksize)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+İçerik adresli ayrıştırma cache'i
+Sayfanın ayrıştırma sonucu (markdown, kaynak URL, parser sürümü) hash'i ile
+saklanır; yeniden crawl'da içeriği değişmeyen sayfalar hiç parse edilmez.
+Parser sürümü artırıldığında o parser'ın eski kayıtları açılışta silinir.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+PARSE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'parse_cache.sqlite3')
+
+
+class ParseCache:
+    """
+    Kullanım:
+        cache = ParseCache('firecrawl_200_pages', PARSER_VERSION,
+                           dump=dataclasses.asdict, load=lambda d: Product(**d))
+        products = cache.get(markdown, source_url)   # yoksa None
+        cache.put(markdown, source_url, products)
+        cache.close()
+    """
+
+    def __init__(self, parser, version, dump=dict, load=dict, path=PARSE_CACHE_FILE):
+        self.parser = parser
+        self.version = str(version)
+        self.dump = dump
+        self.load = load
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            'create table if not exists parse_cache ('
+            ' parser text not null, version text not null, key text primary key, records text not null)'
+        )
+        # Sürüm değiştiyse bu parser'ın eski sonuçları geçersiz
+        self._db.execute('delete from parse_cache where parser = ? and version != ?', (self.parser, self.version))
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def key(self, markdown, source_url):
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (self.parser, self.version, source_url, markdown):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, markdown, source_url):
+        row = self._db.execute('select records from parse_cache where key = ?',
+                               (self.key(markdown, source_url),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [self.load(record) for record in json.loads(row[0])]
+
+    def put(self, markdown, source_url, records):
+        payload = json.dumps([self.dump(record) for record in records], ensure_ascii=False)
+        self._db.execute('insert or replace into parse_cache (parser, version, key, records) values (?, ?, ?, ?)',
+                         (self.parser, self.version, self.key(markdown, source_url), payload))
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
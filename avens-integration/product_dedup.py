@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Ürün tekilleştirme
+İsimler bir kez normalize edilir, (isim, fiyat kovası) hash anahtarıyla tutulur;
+her ürün sabit sayıda kova kontrolüyle elenir, toplam maliyet doğrusaldır.
+price_tolerance > 0 ise aynı isimde ve fiyat farkı tolerans içinde olan ürünler
+de aynı sayılır (örn. 0.01 ile kuruş yuvarlama farkları). Karşılaştırma tam sayı
+kuruş üzerinden yapılır; 100.01 - 100.00 gibi float farkları toleransı aşmaz.
+"""
+
+import re
+
+_SPACES_RE = re.compile(r'\s+')
+
+
+def normalize_name(name):
+    """Karşılaştırma anahtarı: küçük harf, tek boşluk"""
+    return _SPACES_RE.sub(' ', (name or '').lower()).strip()
+
+
+class ProductDeduper:
+    """
+    Kullanım:
+        deduper = ProductDeduper(price_tolerance=0.01)
+        unique = [p for p in products if deduper.add(p.name, p.price)]
+    price_tolerance=0.01 ile 100.00 ve 100.01 aynı sayılır, 100.00 ve 100.02 ayrı kalır.
+    """
+
+    def __init__(self, price_tolerance=0.0):
+        if price_tolerance < 0:
+            raise ValueError('price_tolerance negatif olamaz')
+        self.price_tolerance = price_tolerance
+        self._tolerance_cents = round(price_tolerance * 100)
+        self._seen = {}
+
+    def _bucket(self, cents):
+        return cents // self._tolerance_cents if self._tolerance_cents else cents
+
+    def add(self, name, price):
+        """Ürün daha önce görülmediyse kaydet ve True döndür"""
+        name_key = normalize_name(name)
+
+        if price is None or not self.price_tolerance:
+            key = (name_key, price)
+            if key in self._seen:
+                return False
+            self._seen[key] = [price]
+            return True
+
+        cents = round(price * 100)
+        bucket = self._bucket(cents)
+
+        # Tolerans içindeki fiyat komşu kovalardan birinde olabilir
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            for seen_cents in self._seen.get((name_key, neighbour), ()):
+                if abs(seen_cents - cents) <= self._tolerance_cents:
+                    return False
+
+        self._seen.setdefault((name_key, bucket), []).append(cents)
+        return True
+
+
+def dedupe_products(products, price_tolerance=0.0):
+    """İsim + fiyat (tolerans dahilinde) aynı olan ürünlerden ilkini tut, sırayı koru"""
+    deduper = ProductDeduper(price_tolerance)
+    return [product for product in products if deduper.add(product.name, product.price)]
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Deterministik SKU üretimi
+SKU sıra sayacından değil ürünün kararlı kimliğinden türetilir: marka + kaynak URL
+(yoksa Ürün Kodu, o da yoksa isim). Aynı ürün her import'ta ve her worker'da aynı
+SKU'yu alır; sync, SKU'ya bakarak veritabanına sormadan eşleştirme yapabilir.
+Biçim: <marka 3 harf>-<kimlik hash'i, base32 8 karakter>, örn. NIC-4KQ7ZP2M
+"""
+
+import base64
+import hashlib
+import logging
+import re
+
+from product_sync import normalize_source_url
+
+logger = logging.getLogger(__name__)
+
+SKU_HASH_LENGTH = 8
+# Çakışmada kullanılan uzun hash (blake2b 10 bayt = 16 base32 karakter)
+SKU_LONG_HASH_LENGTH = 16
+
+
+def product_identity(brand, source_url=None, model_code=None, name=None):
+    """SKU'nun türetildiği kimlik anahtarı"""
+    brand_key = (brand or 'AVenS').strip().upper()
+
+    url = normalize_source_url(source_url)
+    if url:
+        return f"{brand_key}|url|{url}"
+
+    code = (model_code or '').strip().upper()
+    if code:
+        return f"{brand_key}|code|{code}"
+
+    return f"{brand_key}|name|{' '.join((name or '').lower().split())}"
+
+
+def stable_sku(identity, brand, length=SKU_HASH_LENGTH):
+    """Kimlikten SKU (aynı kimlik her zaman aynı SKU)"""
+    digest = hashlib.blake2b(identity.encode('utf-8'), digest_size=10).digest()
+    brand_part = re.sub(r'[^A-Z]', '', (brand or '').upper())[:3] or 'AVN'
+    return f"{brand_part}-{base64.b32encode(digest).decode('ascii')[:length]}"
+
+
+class SkuAssigner:
+    """
+    Bir import çalıştırmasında SKU verir ve farklı kimliklerin aynı kısa SKU'ya
+    düşmesini yakalar (çakışan kimlik uzun hash'li SKU alır)
+    Kullanım:
+        assign_sku = SkuAssigner()
+        sku = assign_sku(brand, source_url=url, model_code=code, name=name)
+    """
+
+    def __init__(self):
+        self._owners = {}
+        self.collisions = 0
+
+    def __call__(self, brand, source_url=None, model_code=None, name=None):
+        identity = product_identity(brand, source_url, model_code, name)
+
+        sku = stable_sku(identity, brand)
+        owner = self._owners.setdefault(sku, identity)
+        if owner == identity:
+            return sku
+
+        self.collisions += 1
+        long_sku = stable_sku(identity, brand, SKU_LONG_HASH_LENGTH)
+        logger.warning(f"SKU çakışması: {sku} ({owner} / {identity}), {long_sku} kullanılıyor")
+        if self._owners.setdefault(long_sku, identity) != identity:
+            raise ValueError(f"SKU çakışması çözülemedi: {long_sku}")
+        return long_sku
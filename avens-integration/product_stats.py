@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Ürün kategori istatistikleri
+Kategori/alt kategori doluluk sayıları product_category_stats RPC'si ile
+Postgres'te hesaplanır; istemciye sadece sayılar gelir. RPC henüz deploy
+edilmemişse aynı sonuç ürünler akışlı okunarak hesaplanır (yavaş ama doğru).
+"""
+
+import logging
+from collections import Counter
+
+from table_reader import iter_products
+
+logger = logging.getLogger(__name__)
+
+STATS_RPC = 'product_category_stats'
+
+
+def fetch_category_stats(supabase, status=None):
+    """
+    {'total', 'category_only', 'subcategory_only', 'both', 'neither', 'by_category'} döndürür
+    by_category: [{'category_id', 'subcategory_id', 'products'}, ...] (çoktan aza)
+    status verilirse sadece o durumdaki ürünler sayılır
+    """
+    try:
+        stats = supabase.rpc(STATS_RPC, {'p_status': status}).execute().data
+        if stats:
+            return stats
+    except Exception as e:
+        logger.warning(f"{STATS_RPC} RPC'si çağrılamadı, ürünler taranarak sayılıyor: {e}")
+
+    return _count_by_scanning(supabase, status)
+
+
+def _count_by_scanning(supabase, status):
+    pairs = Counter(
+        (product['category_id'], product['subcategory_id'])
+        for product in iter_products(supabase, 'id, category_id, subcategory_id',
+                                     filters={'status': status} if status else None)
+    )
+
+    stats = {'total': 0, 'category_only': 0, 'subcategory_only': 0, 'both': 0, 'neither': 0}
+    for (category_id, subcategory_id), count in pairs.items():
+        stats['total'] += count
+        if category_id is not None:
+            stats['both' if subcategory_id is not None else 'category_only'] += count
+        else:
+            stats['subcategory_only' if subcategory_id is not None else 'neither'] += count
+
+    stats['by_category'] = [
+        {'category_id': category_id, 'subcategory_id': subcategory_id, 'products': count}
+        for (category_id, subcategory_id), count in pairs.most_common()
+    ]
+    return stats
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Artımlı ürün senkronizasyonu
+Ürünleri silip yeniden yüklemek yerine kaynak URL (doğal anahtar) ile eşleştirir:
+yeni ürünleri ekler, değişenleri günceller, kaybolanları pasife alır.
+Order items tablosuna hiç dokunmaz.
+"""
+
+import hashlib
+import json
+import logging
+from urllib.parse import urlsplit
+
+from batch_writer import BatchWriter, insert_sender, upsert_sender
+from table_reader import iter_products
+
+logger = logging.getLogger(__name__)
+
+# content_hash'e giren (senkronize edilen) alanlar
+SYNC_FIELDS = ('name', 'brand', 'category_id', 'price', 'description', 'status')
+
+PAGE_SIZE = 1000
+BATCH_SIZE = 50
+
+
+def normalize_source_url(url):
+    """URL'yi karşılaştırılabilir hale getir (www, sondaki /, query ve fragment atılır)"""
+    if not url:
+        return None
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+
+    if not host:
+        return None
+
+    return f"https://{host}{path}"
+
+
+def content_hash(product_data):
+    """
+    Ürün içeriğinin kanonik hash'i (products.content_hash ile karşılaştırılır)
+    Fiyat 2 haneye yuvarlanır, boş metinler None sayılır; böylece 100 ile 100.0 aynı hash'i verir
+    """
+    canonical = {}
+    for field in SYNC_FIELDS:
+        value = product_data.get(field)
+        if field == 'price':
+            value = f"{float(value or 0):.2f}"
+        elif isinstance(value, str):
+            value = value.strip() or None
+        canonical[field] = value
+
+    payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def load_existing_products(supabase):
+    """Mevcut ürünleri id sırasıyla sayfa sayfa yükle (PostgREST satır limitine takılmamak için)"""
+    # Sadece eşleştirme anahtarları ve hash çekilir; içerik karşılaştırması hash üzerinden yapılır
+    columns = 'id, sku, name, status, source_url, model_code, content_hash'
+    return list(iter_products(supabase, columns, page_size=PAGE_SIZE))
+
+
+def plan_sync(rows, existing):
+    """
+    Scraped satırları mevcut ürünlerle karşılaştır.
+    Eşleştirme sırası: source_url → sku (product_sku ile kimlikten türetilmiş) → model_code (Ürün Kodu)
+    → isim (source_url'si olmayan eski kayıtlar). Mevcut ürünün SKU'su korunur.
+    content_hash'i aynı olan satırlar plana hiç girmez.
+    """
+    by_url = {}
+    by_sku = {}
+    by_code = {}
+    legacy_by_name = {}
+
+    for product in existing:
+        if product.get('source_url'):
+            by_url[product['source_url']] = product
+        if product.get('sku'):
+            by_sku.setdefault(product['sku'], product)
+        if product.get('model_code'):
+            by_code.setdefault(product['model_code'], product)
+        if not product.get('source_url') and product.get('name'):
+            legacy_by_name.setdefault(product['name'].strip().lower(), product)
+
+    plan = {
+        'inserts': [],
+        'updates': [],
+        'unchanged': 0,
+        'duplicates': 0,
+        'deactivate_ids': []
+    }
+
+    seen_ids = set()
+    seen_keys = set()
+
+    for row in rows:
+        key = row.get('source_url')
+        if key:
+            if key in seen_keys:
+                plan['duplicates'] += 1
+                continue
+            seen_keys.add(key)
+
+        match = by_url.get(key) if key else None
+        if not match and row.get('sku'):
+            match = by_sku.get(row['sku'])
+        if not match and row.get('model_code'):
+            match = by_code.get(row['model_code'])
+        if not match:
+            match = legacy_by_name.get(row['name'].strip().lower())
+
+        if match and match['id'] in seen_ids:
+            # Aynı mevcut ürüne ikinci kez eşleşme: yeni ürün olarak ekle
+            match = None
+
+        if not match:
+            row.setdefault('content_hash', content_hash(row))
+            plan['inserts'].append(row)
+            continue
+
+        seen_ids.add(match['id'])
+
+        # Ürün Kodu sadece scrape'te varsa karşılaştırılır (elle girilen model kodu korunur)
+        code = row.get('model_code')
+        row_hash = row.get('content_hash') or content_hash(row)
+        changed = (
+            match.get('content_hash') != row_hash
+            or match.get('source_url') != key
+            or (code and code != match.get('model_code'))
+        )
+        if not changed:
+            plan['unchanged'] += 1
+            continue
+
+        update = {field: row.get(field) for field in SYNC_FIELDS}
+        update['id'] = match['id']
+        update['sku'] = match['sku']
+        update['source_url'] = key
+        update['model_code'] = code or match.get('model_code')
+        update['content_hash'] = row_hash
+        plan['updates'].append(update)
+
+    # Bu çalıştırmada görünmeyen (sitede artık olmayan) ürünler pasife alınır
+    for product in existing:
+        if product.get('source_url') and product['id'] not in seen_ids and product.get('status') != 'inactive':
+            plan['deactivate_ids'].append(product['id'])
+
+    return plan
+
+
+def apply_sync(supabase, plan, batch_size=BATCH_SIZE, workers=4, dead_letter_path=None):
+    """
+    Sync planını veritabanına uygula (insert/update/pasife alma eşzamanlı batch'lerle)
+    Yazılamayan satırlar dead_letter_path verilmişse NDJSON olarak oraya düşer
+    """
+    stats = {
+        'inserted': 0,
+        'updated': 0,
+        'unchanged': plan['unchanged'],
+        'duplicates': plan['duplicates'],
+        'deactivated': 0,
+        'errors': 0
+    }
+
+    def deactivate(ids):
+        supabase.table('products').update({'status': 'inactive'}).in_('id', ids).execute()
+
+    steps = (
+        ('inserted', plan['inserts'], insert_sender(supabase, 'products'), 'sync insert'),
+        ('updated', plan['updates'], upsert_sender(supabase, 'products', on_conflict='id'), 'sync update'),
+        ('deactivated', plan['deactivate_ids'], deactivate, 'sync pasife alma')
+    )
+
+    for stat_key, rows, send, label in steps:
+        if not rows:
+            continue
+        with BatchWriter(send, batch_size=batch_size, workers=workers,
+                         dead_letter_path=dead_letter_path, label=label) as writer:
+            writer.extend(rows)
+        stats[stat_key] = writer.stats['written']
+        stats['errors'] += writer.stats['errors']
+
+    return stats
+
+
+def sync_products(supabase, rows, batch_size=BATCH_SIZE, workers=4, dead_letter_path=None):
+    """Scraped satırları artımlı olarak senkronize et ve istatistik döndür"""
+    existing = load_existing_products(supabase)
+    logger.info(f"OK {len(existing)} mevcut ürün yüklendi")
+
+    plan = plan_sync(rows, existing)
+
+    # Scrape boş/bozuksa bütün kataloğu pasife almayalım
+    if not rows:
+        logger.warning("Sync: hiç geçerli ürün yok, pasife alma atlanıyor")
+        plan['deactivate_ids'] = []
+
+    logger.info(
+        f"Sync planı: {len(plan['inserts'])} yeni, {len(plan['updates'])} değişen, "
+        f"{plan['unchanged']} aynı, {len(plan['deactivate_ids'])} pasife alınacak"
+    )
+
+    return apply_sync(supabase, plan, batch_size=batch_size, workers=workers,
+                      dead_letter_path=dead_letter_path)
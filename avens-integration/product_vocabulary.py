@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Marka ve URL-kategori sözlükleri
+Firecrawl parser'larının marka/kategori listeleri product_vocabulary.json'da tutulur
+ve her biri bir kez Aho-Corasick eşleştiriciye derlenir. Bir ismi ya da URL'yi
+çözmek metin üzerinde tek geçiştir; sözlük yüzlerce kalıba büyüse de maliyet
+metin uzunluğuyla orantılı kalır. Birden fazla kalıp geçerse dosyada önce gelen
+kazanır (eski "listede ilk eşleşen" davranışı).
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher
+
+VOCABULARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'product_vocabulary.json')
+
+
+class RankedMatcher:
+    """
+    Sıralı (kalıp, değer) listesi; metinde geçen kalıplardan listede ilk sıradakinin değeri
+    Kullanım:
+        matcher = RankedMatcher([('kanal-tipi', 'Kanal Tipi Fanlar')], default='Diğer', fold=str.lower)
+        matcher('https://www.avensair.com/kanal-tipi-fanlar')  # -> 'Kanal Tipi Fanlar'
+    """
+
+    def __init__(self, entries, default=None, fold=str.lower):
+        self.default = default
+        self._fold = fold
+        self._matcher = KeywordMatcher(
+            (fold(pattern), (rank, value)) for rank, (pattern, value) in enumerate(entries)
+        ).build()
+
+    def __call__(self, text):
+        best = min(self._matcher.find_all(self._fold(text or '')), default=None)
+        return best[1] if best else self.default
+
+
+class ProductVocabulary:
+    """Marka (ürün isminden) ve kategori (URL'den) çıkarıcıları"""
+
+    def __init__(self, brands, url_categories, default_brand, default_category):
+        # Marka karşılaştırması büyük harfle (isimler sitede büyük harf yazılıyor)
+        self.brand_from_name = RankedMatcher(((brand, brand) for brand in brands),
+                                             default=default_brand, fold=str.upper)
+        self.category_from_url = RankedMatcher(url_categories, default=default_category, fold=str.lower)
+
+    @classmethod
+    def from_file(cls, path=VOCABULARY_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['brands'], data['url_categories'], data['default_brand'], data['default_category'])
+
+
+@lru_cache(maxsize=None)
+def load_vocabulary(path=VOCABULARY_FILE):
+    """Sözlüğü bir kez yükleyip derle (process başına)"""
+    return ProductVocabulary.from_file(path)
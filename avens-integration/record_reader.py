@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Akışlı (streaming) kayıt okuyucu
+Scraped dosyaları tamamını belleğe almadan kayıt kayıt okur. Dosya JSON dizisi
+([{...}, {...}]) ya da NDJSON (satır başına bir kayıt) olabilir; biçim ilk
+karakterden anlaşılır. .parquet/.arrow katalogları catalog_store ile okunur. Bellekte aynı anda sadece okuma tamponu ve o anki kayıt durur.
+"""
+
+import json
+import os
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """
+    Dosyadaki kayıtları sırayla üret
+    Kullanım:
+        for product in iter_records('scraped-data/products.json'):
+            ...
+    """
+    if path.lower().endswith(('.parquet', '.arrow', '.feather')):
+        # Sütunlu katalog (pyarrow gerekir)
+        from catalog_store import read_catalog
+        yield from read_catalog(path)
+        return
+
+    # utf-8-sig: BOM'lu dosyalar da okunur
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        yield from iter_stream(f, chunk_size)
+
+
+def iter_stream(f, chunk_size=CHUNK_SIZE):
+    """read(n) destekleyen herhangi bir metin akışındaki kayıtları üret"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill(size=chunk_size):
+        nonlocal buffer, pos, eof
+        chunk = f.read(size)
+        if not chunk:
+            eof = True
+            return False
+        # Tüketilmiş kısmı at (tampon kayıt boyutunda kalır)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip(_WHITESPACE)
+    if pos >= len(buffer):
+        return
+
+    in_array = buffer[pos] == '['
+    if in_array:
+        pos += 1
+
+    while True:
+        # Dizi içinde kayıtlar arası virgüller de atlanır
+        skip(_WHITESPACE + ',' if in_array else _WHITESPACE)
+        if pos >= len(buffer):
+            if in_array:
+                raise ValueError(f"JSON dizisi kapanmadan dosya bitti ({getattr(f, 'name', 'stream')})")
+            return
+        if in_array and buffer[pos] == ']':
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Kayıt tamponun sonunda yarım kalmış: bekleyen kısım kadar daha oku, büyük
+            # kayıtlarda okuma boyu katlanarak büyür ve kayıt her chunk'ta baştan çözülmez
+            fill(min(max(chunk_size, len(buffer) - pos), 1 << 24))
+            continue
+
+        if end == len(buffer) and not eof and not isinstance(record, (dict, list)):
+            # Tamponun sonuna denk gelen sayı/literal yarım olabilir
+            fill()
+            continue
+
+        pos = end
+        yield record
+
+
+def write_records(path, records, indent=2):
+    """
+    Kayıtları akışlı olarak yaz; .ndjson uzantısında satır başına bir kayıt,
+    aksi halde json.dump(..., indent=2) ile aynı çıktıyı veren JSON dizisi.
+    Yazılan kayıt sayısını döndürür.
+    """
+    count = 0
+    tmp_path = f"{path}.tmp"
+    ndjson = path.endswith('.ndjson')
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if not ndjson:
+            f.write('[')
+        for record in records:
+            if ndjson:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            else:
+                text = json.dumps(record, ensure_ascii=False, indent=indent)
+                pad = ' ' * indent
+                f.write((',\n' if count else '\n') + pad + text.replace('\n', '\n' + pad))
+            count += 1
+        if not ndjson:
+            f.write('\n]' if count else ']')
+
+    os.replace(tmp_path, path)
+    return count
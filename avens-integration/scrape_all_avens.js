@@ -2,6 +2,7 @@ import puppeteer from 'puppeteer';
 import fs from 'fs/promises';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { openJournal } from './scrape_journal.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -9,6 +10,7 @@ const __dirname = path.dirname(__filename);
 // Configuration
 const BASE_URL = 'https://www.avensair.com';
 const OUTPUT_DIR = path.join(__dirname, 'scraped-data');
+const JOURNAL_FILE = path.join(OUTPUT_DIR, 'all_products.ndjson');
 const DELAY_MS = 2000; // Respectful delay between requests
 
 // Utility functions
@@ -391,11 +393,14 @@ async function main() {
     // Step 3: Scrape product details
     const allProducts = [];
     const batchSize = 5; // Process in small batches
+    // Progress is appended to a journal: each checkpoint writes only the new batch
+    const journal = await openJournal(JOURNAL_FILE);
     
     for (let i = 0; i < uniqueProductLinks.length; i += batchSize) {
       const batch = uniqueProductLinks.slice(i, i + batchSize);
       
       console.log(`\n🔄 Processing products ${i + 1}-${i + batch.length} of ${uniqueProductLinks.length}`);
+      const batchProducts = [];
       
       for (const productUrl of batch) {
         console.log(`📦 Scraping: ${productUrl}`);
@@ -403,6 +408,7 @@ async function main() {
         const product = await scrapeProductDetails(page, productUrl);
         if (product) {
           allProducts.push(product);
+          batchProducts.push(product);
           console.log(`✅ ${product.name} - ${product.price ? product.price + ' TL' : 'Fiyat yok'}`);
         }
         
@@ -410,7 +416,8 @@ async function main() {
       }
       
       // Save progress every batch
-      await saveData(`products_batch_${Math.floor(i / batchSize) + 1}.json`, allProducts);
+      await journal.append(batchProducts, { index: i + batch.length });
+      console.log(`💾 Appended ${batchProducts.length} items to ${path.basename(JOURNAL_FILE)}`);
     }
     
     // Final save
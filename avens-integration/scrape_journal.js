@@ -0,0 +1,77 @@
+// Append-only scrape journal (Python tarafı: scrape_journal.py)
+// Her checkpoint'te sadece yeni kayıtlar NDJSON olarak eklenir; <journal>.checkpoint.json
+// son tamamlanmış yazmanın byte offset'ini ve scraper state'ini tutar.
+import fs from 'fs/promises';
+import path from 'path';
+
+async function fileSize(filePath) {
+  try {
+    return (await fs.stat(filePath)).size;
+  } catch {
+    return 0;
+  }
+}
+
+// Okunabilir ve tutarlı checkpoint; yoksa null
+async function readCheckpoint(checkpointPath, journalSize) {
+  let checkpoint;
+  try {
+    checkpoint = JSON.parse(await fs.readFile(checkpointPath, 'utf-8'));
+  } catch {
+    return null;
+  }
+  const offset = checkpoint?.offset;
+  // Journal checkpoint'ten kısaysa truncate dosyayı sıfırlarla uzatırdı
+  if (!Number.isInteger(offset) || offset < 0 || offset > journalSize) return null;
+  return { records: 0, state: null, ...checkpoint };
+}
+
+// Checkpoint yok/bozuk: dolu journal son tam (satır sonuyla biten) kayda kadar geçerli sayılır,
+// asla offset 0'a indirilmez
+async function recoverCheckpoint(journalPath, checkpointPath, journalSize) {
+  if (!journalSize) return { offset: 0, records: 0, state: null };
+
+  const content = await fs.readFile(journalPath);
+  const offset = content.lastIndexOf(0x0a) + 1;
+  const records = content.subarray(0, offset).toString('utf-8')
+    .split('\n').filter(line => line.trim()).length;
+
+  if (offset) {
+    console.warn(`${checkpointPath} okunamadı, journal son tam kayda göre kurtarıldı (${records} kayıt, offset ${offset})`);
+  }
+  return { offset, records, state: null };
+}
+
+export async function openJournal(journalPath) {
+  const checkpointPath = `${journalPath}.checkpoint.json`;
+  const journalSize = await fileSize(journalPath);
+  let checkpoint = await readCheckpoint(checkpointPath, journalSize)
+    ?? await recoverCheckpoint(journalPath, checkpointPath, journalSize);
+
+  // Checkpoint'ten sonraki yarım yazmayı at
+  await fs.mkdir(path.dirname(journalPath), { recursive: true });
+  const handle = await fs.open(journalPath, 'a');
+  await handle.truncate(checkpoint.offset);
+  await handle.close();
+
+  return {
+    checkpoint: () => checkpoint,
+
+    async append(records, state) {
+      if (records.length > 0) {
+        const lines = records.map(record => JSON.stringify(record)).join('\n') + '\n';
+        await fs.appendFile(journalPath, lines, 'utf-8');
+      }
+      const { size } = await fs.stat(journalPath);
+
+      checkpoint = {
+        offset: size,
+        records: checkpoint.records + records.length,
+        updated_at: new Date().toISOString(),
+        state: state === undefined ? checkpoint.state : state
+      };
+      await fs.writeFile(`${checkpointPath}.tmp`, JSON.stringify(checkpoint), 'utf-8');
+      await fs.rename(`${checkpointPath}.tmp`, checkpointPath);
+    }
+  };
+}
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Append-only scrape journal
+Scraper'lar her checkpoint'te tüm sonucu yeniden yazmak yerine sadece yeni
+kayıtları NDJSON journal'ın sonuna ekler; yanındaki küçük checkpoint dosyası
+(<journal>.checkpoint.json) en son tamamlanmış yazmanın byte offset'ini tutar.
+Offset'ten sonrası yarım kalmış yazmadır ve okunurken/eklenirken yok sayılır.
+Importer'lar read_scrape_output() ile journal'ı doğrudan okur (checkpoint'e kadar,
+ürün başına son kayıt); compact çıktısı ya da eski JSON snapshot'lar da aynı yoldan okunur.
+
+Komutlar:
+    python scrape_journal.py compact scraped-data/products.ndjson -o scraped-data/products_latest.json
+    python scrape_journal.py import scraped-data/products.ndjson scraped-data/progress_330.json
+    python scrape_journal.py status scraped-data/products.ndjson
+"""
+
+import argparse
+import json
+import logging
+import os
+from datetime import datetime
+
+from product_sync import normalize_source_url
+from record_reader import iter_records, write_records
+
+logger = logging.getLogger(__name__)
+
+
+def record_key(record):
+    """Kaydın kimliği: normalize kaynak URL, yoksa küçük harf isim"""
+    url = record.get('source_url') or record.get('url') or record.get('product_url')
+    return normalize_source_url(url) or (record.get('name') or '').strip().lower() or None
+
+
+class ScrapeJournal:
+    """
+    Kullanım:
+        journal = ScrapeJournal('scraped-data/products.ndjson')
+        journal.append(new_products, state={'index': i})
+        for product in journal:
+            ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.checkpoint_path = f"{path}.checkpoint.json"
+
+    def checkpoint(self):
+        """Son tamamlanmış yazmanın bilgisi (offset, kayıt sayısı, scraper state)"""
+        return self._valid_checkpoint() or self._recover_checkpoint()
+
+    def _valid_checkpoint(self):
+        """Okunabilir ve tutarlı checkpoint; yoksa None"""
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        offset = checkpoint.get('offset') if isinstance(checkpoint, dict) else None
+        if not isinstance(offset, int) or offset < 0:
+            return None
+        # Journal checkpoint'ten kısaysa (silinmiş/değiştirilmiş) truncate dosyayı sıfırlarla uzatırdı
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if offset > size:
+            return None
+        checkpoint.setdefault('records', 0)
+        checkpoint.setdefault('state', None)
+        return checkpoint
+
+    def _recover_checkpoint(self):
+        """
+        Checkpoint yok/bozuk: journal boş değilse son tam (satır sonuyla biten) kayda kadar
+        olan kısım geçerli sayılır. Dolu bir journal asla offset 0'a indirilmez.
+        """
+        offset = 0
+        records = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                position = 0
+                for line in f:
+                    position += len(line)
+                    if not line.endswith(b'\n'):
+                        break
+                    offset = position
+                    if line.strip():
+                        records += 1
+
+        if offset:
+            logger.warning(f"{self.checkpoint_path} okunamadı, journal son tam kayda göre "
+                           f"kurtarıldı ({records} kayıt, offset {offset})")
+        return {'offset': offset, 'records': records, 'state': None}
+
+    def append(self, records, state=None):
+        """
+        Kayıtları journal'ın sonuna ekle ve checkpoint'i ilerlet
+        Maliyet sadece yeni kayıtlar kadardır; eklenen kayıt sayısını döndürür
+        """
+        checkpoint = self.checkpoint()
+        count = 0
+
+        with open(self.path, 'ab') as f:
+            # Önceki yarım yazmayı at (append modunda yazma kesilen noktadan devam eder)
+            f.truncate(checkpoint['offset'])
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+
+        self._write_checkpoint({
+            'offset': offset,
+            'records': checkpoint['records'] + count,
+            'updated_at': datetime.now().isoformat(),
+            'state': state if state is not None else checkpoint.get('state')
+        })
+        return count
+
+    def __iter__(self):
+        """Checkpoint'e kadar yazılmış kayıtları sırayla üret"""
+        offset = self.checkpoint()['offset']
+        if not offset or not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as f:
+            position = 0
+            for line in f:
+                position += len(line)
+                if position > offset:
+                    break
+                if line.strip():
+                    yield json.loads(line)
+
+    def seen_keys(self):
+        """Journal'daki kayıtların anahtarları (kaldığı yerden devam için)"""
+        return {record_key(record) for record in self}
+
+    def _write_checkpoint(self, checkpoint):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+def is_journal(path):
+    """Dosya bir scrape journal'ı mı (.ndjson ya da yanında checkpoint var)"""
+    return path.endswith('.ndjson') or os.path.exists(f"{path}.checkpoint.json")
+
+
+def latest_records(journal_path):
+    """
+    Journal'ın güncel, tekilleştirilmiş görünümü (checkpoint'ten sonraki yarım yazma hariç)
+    Aynı ürün birden fazla kez yazılmışsa son kayıt kazanır (sıra ilk görülme sırasıdır).
+    (kayıtlar, journal'daki toplam kayıt sayısı) döndürür.
+    """
+    latest = {}
+    total = 0
+    for record in ScrapeJournal(journal_path):
+        total += 1
+        key = record_key(record)
+        latest[key if key is not None else f"#{total}"] = record
+    return list(latest.values()), total
+
+
+def read_scrape_output(path):
+    """Importer girdisi: journal ise güncel görünümü, değilse JSON/NDJSON dosyayı akışlı oku"""
+    if not os.path.exists(path):
+        # Olmayan journal boş okunurdu; importer boş katalog yazmasın
+        raise FileNotFoundError(f"Scrape çıktısı bulunamadı: {path}")
+    if not is_journal(path):
+        return iter_records(path)
+    records, total = latest_records(path)
+    logger.info(f"{path}: {total} journal kaydı, {len(records)} tekil ürün")
+    return iter(records)
+
+
+def compact(journal_path, output_path):
+    """Journal'ın güncel, tekilleştirilmiş görünümünü yaz (bkz. latest_records)"""
+    records, total = latest_records(journal_path)
+    written = write_records(output_path, records)
+    logger.info(f"OK {total} journal kaydı → {written} tekil ürün: {output_path}")
+    return written
+
+
+def import_snapshots(journal_path, paths):
+    """Eski kümülatif snapshot dosyalarını (progress_N / products_batch_N) journal'a aktar"""
+    journal = ScrapeJournal(journal_path)
+    seen = journal.seen_keys()
+    total = 0
+
+    for path in paths:
+        new_records = []
+        for record in iter_records(path):
+            key = record_key(record)
+            if key in seen:
+                continue
+            seen.add(key)
+            new_records.append(record)
+        total += journal.append(new_records)
+        logger.info(f"{path}: {len(new_records)} yeni kayıt eklendi")
+
+    return total
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Append-only scrape journal araçları')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compact_parser = subparsers.add_parser('compact', help='Tekilleştirilmiş güncel görünümü yaz')
+    compact_parser.add_argument('journal')
+    compact_parser.add_argument('-o', '--output', help='Çıktı dosyası (.json ya da .ndjson)')
+
+    import_parser = subparsers.add_parser('import', help='Kümülatif snapshot dosyalarını journal\'a aktar')
+    import_parser.add_argument('journal')
+    import_parser.add_argument('files', nargs='+')
+
+    status_parser = subparsers.add_parser('status', help='Checkpoint bilgisini göster')
+    status_parser.add_argument('journal')
+
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        output = args.output or f"{os.path.splitext(args.journal)[0]}_latest.json"
+        compact(args.journal, output)
+    elif args.command == 'import':
+        added = import_snapshots(args.journal, args.files)
+        logger.info(f"OK toplam {added} kayıt eklendi")
+    else:
+        checkpoint = ScrapeJournal(args.journal).checkpoint()
+        logger.info(
+            f"{args.journal}: {checkpoint['records']} kayıt, offset {checkpoint['offset']}, "
+            f"son yazma {checkpoint.get('updated_at', '-')}"
+        )
+
+
+if __name__ == '__main__':
+    main()
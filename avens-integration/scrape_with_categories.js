@@ -1,9 +1,11 @@
 import puppeteer from 'puppeteer';
 import fs from 'fs/promises';
+import { openJournal } from './scrape_journal.js';
 
 const PRODUCTS_URL = 'https://www.avensair.com/urunler';
 const DELAY = 1500;
 const DETAIL_DELAY = 800;
+const JOURNAL_FILE = 'scraped-data/products_with_categories.ndjson';
 
 async function delay(ms) {
   return new Promise(resolve => setTimeout(resolve, ms));
@@ -315,6 +317,9 @@ async function main() {
   console.log(`⏱️  Tahmini süre: ~${Math.ceil(productLinks.length * DETAIL_DELAY / 1000 / 60)} dakika\n`);
   
   const allProducts = [];
+  // İlerleme append-only journal'a yazılır (her checkpoint sadece yeni ürünleri ekler)
+  const journal = await openJournal(JOURNAL_FILE);
+  let pending = [];
   
   for (let i = 0; i < productLinks.length; i++) {
     const { name, url } = productLinks[i];
@@ -324,7 +329,7 @@ async function main() {
     try {
       const details = await scrapeProductDetail(page, url, name);
       
-      allProducts.push({
+      const product = {
         name,
         url,
         category: details.category,
@@ -334,24 +339,22 @@ async function main() {
         price: details.price,
         brand: 'AVenS',
         scraped_at: new Date().toISOString()
-      });
+      };
+      allProducts.push(product);
+      pending.push(product);
       
       console.log(`  ✅ Kategori: ${details.category}${details.subcategory ? ` > ${details.subcategory}` : ''}`);
       
-      // İlerleme kaydet (her 10 üründe)
+      // İlerleme kaydet (her 10 üründe, sadece son checkpoint'ten beri gelenler)
       if ((i + 1) % 10 === 0) {
-        const tempFilename = `scraped-data/progress_${i + 1}.json`;
-        await fs.writeFile(
-          tempFilename,
-          JSON.stringify(allProducts, null, 2),
-          'utf-8'
-        );
-        console.log(`  💾 İlerleme kaydedildi: ${tempFilename}`);
+        await journal.append(pending, { index: i + 1 });
+        pending = [];
+        console.log(`  💾 İlerleme kaydedildi: ${JOURNAL_FILE} (${i + 1})`);
       }
       
     } catch (error) {
       console.log(`  ❌ Hata: ${error.message}`);
-      allProducts.push({
+      const product = {
         name,
         url,
         category: 'Genel',
@@ -362,10 +365,13 @@ async function main() {
         brand: 'AVenS',
         scraped_at: new Date().toISOString(),
         error: error.message
-      });
+      };
+      allProducts.push(product);
+      pending.push(product);
     }
   }
   
+  await journal.append(pending, { index: productLinks.length });
   await browser.close();
   
   // Sonuçları kaydet
@@ -1,23 +1,23 @@
-import json
+import argparse
+import os
 import re
-import uuid
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import sys
+from typing import List, Optional
 
-@dataclass
-class Product:
-    id: str
-    name: str
-    price: Optional[float]
-    currency: str
-    category: str
-    brand: str
-    image_url: Optional[str]
-    product_url: str
-    product_code: Optional[str]
-    description: Optional[str]
-    source_url: str
-    specifications: Dict[str, str]
+# Paylaşılan modüller avens-integration/ altında
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from catalog_record import Product
+from catalog_store import write_catalog
+from crawl_loader import iter_crawl_pages
+from markdown_tokenizer import first, iter_cards, tokenize
+from page_pool import default_workers, parse_pages
+from parse_cache import ParseCache
+from product_dedup import dedupe_products
+from product_vocabulary import load_vocabulary
+
+# Ayrıştırma mantığı değiştiğinde artırılır (parse cache'i geçersiz kılar)
+PARSER_VERSION = 3
 
 def clean_price(price_text: str) -> Optional[float]:
     """Fiyat metnini temizleyip float'a çevir"""
@@ -35,156 +35,133 @@ def clean_price(price_text: str) -> Optional[float]:
 
 def extract_category_from_url(url: str) -> str:
     """URL'den kategori çıkar"""
-    category_patterns = {
-        'nicotra-gebhardt': 'Nicotra Gebhardt Fanlar',
-        'konut-tipi': 'Konut Tipi Fanlar', 
-        'kanal-tipi': 'Kanal Tipi Fanlar',
-        'cati-tipi': 'Çatı Tipi Fanlar',
-        'ex-proof': 'Ex-Proof Fanlar',
-        'duvar-tipi': 'Duvar Tipi Fanlar',
-        'santrifuj': 'Santrifüj Fanlar',
-        'duman-egzoz': 'Duman Egzoz Fanları',
-        'basinclandirma': 'Basınçlandırma Fanları',
-        'otopark-jet': 'Otopark Jet Fanları',
-        'siginak': 'Sığınak Havalandırma Fanları',
-        'sessiz-kanal': 'Sessiz Kanal Tipi Fanlar',
-        'isi-geri-kazanim': 'Isı Geri Kazanım Cihazları',
-        'hava-perdesi': 'Hava Perdeleri',
-        'nem-alma': 'Nem Alma Cihazları',
-        'hava-temizleyici': 'Hava Temizleyiciler',
-        'flexible': 'Flexible Hava Kanalları',
-        'hiz-kontrolu': 'Hız Kontrolü Cihazları'
-    }
-    
-    url_lower = url.lower()
-    for pattern, category in category_patterns.items():
-        if pattern in url_lower:
-            return category
-    
-    return 'Diğer'
+    return load_vocabulary().category_from_url(url)
 
 def extract_brand_from_name(name: str) -> str:
     """Ürün isminden marka çıkar"""
-    brands = ['Vortice', 'Casals', 'Nicotra', 'Gebhardt', 'AVenS', 'Danfoss']
-    
-    name_upper = name.upper()
-    for brand in brands:
-        if brand.upper() in name_upper:
-            return brand
-    
-    return 'AVenS'
+    return load_vocabulary().brand_from_name(name)
 
 def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]:
-    """Markdown içeriğinden ürünleri ayrıştır"""
+    """Markdown içeriğinden ürünleri ayrıştır (sayfa tek geçişte token'lara ayrılır)"""
     products = []
-    
-    # Ürün pattern'ları
-    product_patterns = [
-        # Pattern 1: Kategori sayfalarındaki ürün listeleri
-        r'### \[([^\]]+)\]\([^)]+\)\s*\n\s*([0-9.,]+)₺',
-        # Pattern 2: Tek ürün sayfaları
-        r'# ([^#\n]+)\n.*?Ürün Kodu.*?([A-Z0-9]+).*?([0-9.,]+)\s*₺',
-        # Pattern 3: Link'li ürün isimleri
-        r'\[([^\]]+)\]\(([^)]+\.com[^)]+)\).*?([0-9.,]+)₺'
-    ]
-    
-    # Görsel URL'leri bul
-    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    images = re.findall(image_pattern, markdown)
-    image_urls = {alt: url for alt, url in images}
-    
-    # Her pattern için kontrol et
-    for pattern in product_patterns:
-        matches = re.finditer(pattern, markdown, re.DOTALL | re.MULTILINE)
-        
-        for match in matches:
-            if len(match.groups()) >= 2:
-                name = match.group(1).strip()
-                price_text = match.groups()[-1]  # Son grup fiyat
-                
-                # Çok kısa isimler veya genel kategoriler atla
-                if len(name) < 5 or any(skip in name.lower() for skip in ['daha fazla', 'kategori', 'ürünler']):
-                    continue
-                
-                price = clean_price(price_text)
-                brand = extract_brand_from_name(name)
-                category = extract_category_from_url(source_url)
-                
-                # Ürün URL'si varsa al
-                product_url = source_url
-                if len(match.groups()) >= 3 and 'avensair.com' in str(match.group(2)):
-                    product_url = match.group(2)
-                
-                # Görsel bul
-                image_url = None
-                for alt, url in image_urls.items():
-                    if any(word in alt.lower() for word in name.lower().split()[:3]):
-                        image_url = url
-                        break
-                
-                product = Product(
-                    id=str(uuid.uuid4()),
-                    name=name,
-                    price=price,
-                    currency='TRY',
-                    category=category,
-                    brand=brand,
-                    image_url=image_url,
-                    product_url=product_url,
-                    product_code=None,
-                    description=None,
-                    source_url=source_url,
-                    specifications={}
-                )
-                
-                products.append(product)
+    tokens = tokenize(markdown)
+    category = extract_category_from_url(source_url)
+    
+    # Ürün adayları: (isim, fiyat token'ı, ürün URL'si, eşleşmiş görsel)
+    candidates = []
+    
+    # 1: Kategori sayfalarındaki ürün kartları (görsel ve fiyat kartla birlikte gelir)
+    for card, image, price_token in iter_cards(tokens):
+        candidates.append((card.value, price_token, card.url, image))
+    
+    # 2: Tek ürün sayfaları - # başlık + Ürün Kodu + ondan sonraki fiyat
+    # 3: Link'li ürün isimleri - fiyattan önceki son link (kart/başlık sınırında sıfırlanır)
+    title = first(tokens, 'heading', extra=1)
+    code_seen = False
+    last_link = None
+    
+    for token in tokens:
+        if token.kind == 'code':
+            code_seen = True
+        elif token.kind in ('card', 'heading'):
+            last_link = None
+        elif token.kind == 'link' and '.com' in token.url:
+            last_link = token
+        elif token.kind == 'price':
+            if code_seen and title:
+                candidates.append((title.value, token, source_url, None))
+                title = None
+            if last_link:
+                candidates.append((last_link.value, token, last_link.url, None))
+                last_link = None
+    
+    images = [token for token in tokens if token.kind == 'image']
+    
+    for name, price_token, url, image in candidates:
+        if price_token is None:
+            continue
+        
+        # Çok kısa isimler veya genel kategoriler atla
+        if len(name) < 5 or any(skip in name.lower() for skip in ['daha fazla', 'kategori', 'ürünler']):
+            continue
+        
+        price = clean_price(price_token.value)
+        brand = extract_brand_from_name(name)
+        
+        # Ürün URL'si varsa al
+        product_url = url if url and 'avensair.com' in url else source_url
+        
+        # Görsel: kartın kendi görseli, yoksa alt metni ismin ilk kelimelerinden birini içeren görsel
+        image_url = image.url if image else None
+        if not image_url:
+            words = name.lower().split()[:3]
+            for candidate in images:
+                alt = candidate.value.lower()
+                if any(word in alt for word in words):
+                    image_url = candidate.url
+                    break
+        
+        product = Product(
+            name=name,
+            price=price,
+            currency='TRY',
+            category=category,
+            brand=brand,
+            image_url=image_url,
+            product_url=product_url,
+            product_code=None,
+            description=None,
+            source_url=source_url
+        )
+        
+        products.append(product)
     
     return products
 
-def process_firecrawl_data(file_path: str) -> List[Product]:
-    """Firecrawl JSON verisini işle"""
+def process_firecrawl_data(file_path: str, workers: Optional[int] = None, use_cache: bool = True,
+                           price_tolerance: float = 0.0) -> List[Product]:
+    """Firecrawl JSON verisini işle (sayfalar workers adet process'e dağıtılır)"""
     all_products = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # JSON parse et - çok büyük olabilir, ayrıştırma hatası olabilir
-        data = json.loads(content)
-        crawl_data = data.get('text_result', [{}])[0]
-        
-        if isinstance(crawl_data, str):
-            crawl_data = json.loads(crawl_data)
-        
-        pages = crawl_data.get('data', [])
-        
-        print(f"Toplam {len(pages)} sayfa bulundu")
-        
-        for i, page in enumerate(pages):
-            if i % 20 == 0:
-                print(f"İşlenen sayfa: {i}/{len(pages)}")
-            
+        # Dump sayfa sayfa okunur (text_result sarmalı dahil), tamamı belleğe alınmaz
+        page_count = 0
+        markdowns = []
+        source_urls = []
+        for page in iter_crawl_pages(file_path):
+            page_count += 1
             markdown = page.get('markdown', '')
             source_url = page.get('metadata', {}).get('sourceURL', '')
             
             if not markdown or not source_url:
                 continue
             
-            # Bu sayfadan ürünleri çıkar
-            page_products = parse_product_from_markdown(markdown, source_url)
-            all_products.extend(page_products)
+            markdowns.append(markdown)
+            source_urls.append(source_url)
+        
+        print(f"Toplam {page_count} sayfa bulundu")
+        
+        # Bu sayfalardan ürünleri çıkar (sonuçlar sayfa sırasıyla birleşir)
+        # İçeriği önceki crawl'la aynı olan sayfalar parse cache'ten gelir
+        cache = ParseCache('firecrawl_200_pages', PARSER_VERSION,
+                           dump=Product.to_dict, load=lambda record: Product(**record)) if use_cache else None
+        try:
+            page_results = parse_pages(parse_product_from_markdown, markdowns, source_urls,
+                                       workers=workers, cache=cache)
+            for i, page_products in enumerate(page_results):
+                if i % 20 == 0:
+                    print(f"İşlenen sayfa: {i}/{len(markdowns)}")
+                
+                all_products.extend(page_products)
+        finally:
+            if cache:
+                cache.close()
+                print(f"Parse cache: {cache.hits} sayfa cache'ten, {cache.misses} sayfa ayrıştırıldı")
         
         print(f"\nToplam {len(all_products)} ürün bulundu")
         
-        # Duplicateları temizle (aynı isim + benzer fiyat)
-        unique_products = []
-        seen_products = set()
-        
-        for product in all_products:
-            key = f"{product.name.lower()}_{product.price}"
-            if key not in seen_products:
-                unique_products.append(product)
-                seen_products.add(key)
+        # Duplicateları temizle (aynı isim + tolerans içinde aynı fiyat)
+        unique_products = dedupe_products(all_products, price_tolerance=price_tolerance)
         
         print(f"Temizleme sonrası: {len(unique_products)} benzersiz ürün")
         
@@ -195,36 +172,28 @@ def process_firecrawl_data(file_path: str) -> List[Product]:
         return []
 
 def save_products_to_json(products: List[Product], output_file: str):
-    """Ürünleri JSON formatında kaydet"""
-    products_dict = []
-    
-    for product in products:
-        products_dict.append({
-            'id': product.id,
-            'name': product.name,
-            'price': product.price,
-            'currency': product.currency,
-            'category': product.category,
-            'brand': product.brand,
-            'image_url': product.image_url,
-            'product_url': product.product_url,
-            'product_code': product.product_code,
-            'description': product.description,
-            'source_url': product.source_url,
-            'specifications': product.specifications
-        })
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(products_dict, f, ensure_ascii=False, indent=2)
-    
+    """Ürünleri uzantıya göre JSON, NDJSON ya da Parquet/Arrow olarak kaydet"""
+    write_catalog(output_file, products)
     print(f"Ürünler {output_file} dosyasına kaydedildi")
 
 def main():
+    parser = argparse.ArgumentParser(description='Firecrawl crawl çıktısından ürünleri ayrıştır')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='Paralel ayrıştırma process sayısı (1 = seri)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse cache\'i kullanmadan tüm sayfaları yeniden ayrıştır')
+    parser.add_argument('--price-tolerance', type=float, default=0.0,
+                        help='Aynı isimli ürünlerde bu kadar TL\'ye kadar fiyat farkı duplicate sayılır')
+    parser.add_argument('--output', default='avens_products_200_pages.json',
+                        help='Çıktı dosyası (.json, .ndjson ya da pyarrow ile .parquet/.arrow)')
+    args = parser.parse_args()
+    
     input_file = 'firecrawl_full_crawl_200_pages.json'
-    output_file = 'avens_products_200_pages.json'
+    output_file = args.output
     
     print("Firecrawl verisi işleniyor...")
-    products = process_firecrawl_data(input_file)
+    products = process_firecrawl_data(input_file, workers=args.workers, use_cache=not args.no_cache,
+                                      price_tolerance=args.price_tolerance)
     
     if products:
         print(f"\nÜrün dağılımı:")
@@ -1,61 +1,27 @@
+import os
 import re
+import sys
 
-# Test markdown'ı
-markdown_sample = """# Nicotra Gebhardt Fanlar
+# Paylaşılan modüller avens-integration/ altında
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
 
-1. [Ana Sayfa](https://www.avensair.com/)
-2. [Ürünler](https://www.avensair.com/urunler)
-3. Fanlar
-4. Nicotra Gebhardt Fanlar
+from crawl_loader import iter_crawl_pages
 
-[![NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FANLAR](https://www.avensair.com/uploads/27052111210460af80a0de36d_1.png)](https://www.avensair.com/nicotra-gebhardt-at-7-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN")
+CRAWL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'firecrawl_sample_crawl.json')
 
-### [NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-7-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN")
+# Test markdown'ları: kategori sayfası ve tek ürün sayfası
+SAMPLE_URLS = (
+    'https://www.avensair.com/nicotra-gebhardt-fanlar',
+    'https://www.avensair.com/enkelfan-250-eec',
+)
 
-7.851,58₺
+def load_samples(path: str = CRAWL_FILE):
+    """Örnek sayfaların markdown'ları (crawl dosyası sadece çalıştırılınca okunur)"""
+    markdowns = {page.get('metadata', {}).get('sourceURL'): page.get('markdown', '')
+                 for page in iter_crawl_pages(path)}
+    return [markdowns[url] for url in SAMPLE_URLS]
 
-[![NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FANLAR](https://www.avensair.com/uploads/27052111422560af85a1f12c7_1.png)](https://www.avensair.com/nicotra-gebhardt-at-9-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-9-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-8.144,19₺
-
-[![NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052111560660af88d666011_1.png)](https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN")
-
-8.436,79₺
-
-[![NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112084660af8bce07447_1.png)](https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN")
-
-9.460,91₺
-
-[![NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112241560af8f6f188c1_1.png)](https://www.avensair.com/nicotra-gebhardt-at-10-10-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-10-10-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN")
-
-9.217,08₺"""
-
-markdown_sample2 = """# ENKELFAN 250 EEC
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Plug Fanlar](https://www.avensair.com/plug-fanlar "Plug Fanlar")
-4. ENKELFAN 250 EEC
-
-![ENKELFAN 250 EEC](https://www.avensair.com/uploads/160922105842632456e207865_ENKELFAN-EEC-250-450-detay.jpg)
-
-ENKELFAN 250 EEC
-
-**Kategori :** [Plug Fanlar](https://www.avensair.com/plug-fanlar)
-**Ürün Kodu :** ENKEC250
-
-#### (KDV DAHİL)
-28.480,28 ₺"""
-
-def test_patterns():
+def test_patterns(markdown_sample: str, markdown_sample2: str):
     print("=== MARKDOWN SAMPLE 1 TEST ===")
     print("Markdown length:", len(markdown_sample))
     print("\n--- Pattern Test 1: ### [title] + price ---")
@@ -120,7 +86,7 @@ def clean_price(price_text: str) -> float:
     except:
         return None
 
-def extract_products():
+def extract_products(markdown_sample: str, markdown_sample2: str):
     print("\n=== PRODUCT EXTRACTION TEST ===")
     
     # Sample 1: Kategori sayfası
@@ -154,5 +120,6 @@ def extract_products():
                 print(f"Image: {images[0][1]}")
 
 if __name__ == "__main__":
-    test_patterns()
-    extract_products()
\ No newline at end of file
+    samples = load_samples()
+    test_patterns(*samples)
+    extract_products(*samples)
\ No newline at end of file
@@ -1,143 +1,18 @@
 import json
+import os
 import re
-import uuid
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import sys
+from typing import List, Optional
 
-# Firecrawl sonucu burada (MCP çıktısından alınmış)
-FIRECRAWL_RESPONSE = {
-  "status": "completed",
-  "completed": 200,
-  "total": 200,
-  "creditsUsed": 1455,
-  "expiresAt": "2025-09-28T17:15:00.000Z",
-  "next": None,
-  "data": [
-    {
-      "markdown": """# Nicotra Gebhardt Fanlar
+# Paylaşılan modüller avens-integration/ altında
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
 
-1. [Ana Sayfa](https://www.avensair.com/)
-2. [Ürünler](https://www.avensair.com/urunler)
-3. Fanlar
-4. Nicotra Gebhardt Fanlar
+from catalog_record import Product
+from crawl_loader import iter_crawl_pages
+from product_vocabulary import load_vocabulary
 
-[![NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FANLAR](https://www.avensair.com/uploads/27052111210460af80a0de36d_1.png)](https://www.avensair.com/nicotra-gebhardt-at-7-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-7-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-7.851,58₺
-
-[![NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FANLAR](https://www.avensair.com/uploads/27052111422560af85a1f12c7_1.png)](https://www.avensair.com/nicotra-gebhardt-at-9-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-9-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-8.144,19₺
-
-[![NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052111560660af88d666011_1.png)](https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN")
-
-8.436,79₺
-
-[![NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112084660af8bce07447_1.png)](https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN")
-
-9.460,91₺
-
-[![NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112241560af8f6f188c1_1.png)](https://www.avensair.com/nicotra-gebhardt-at-10-10-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-10-10-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN")
-
-9.217,08₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/nicotra-gebhardt-fanlar",
-        "title": " Nicotra Gebhardt Fanlar | Avens Havalandırma "
-      }
-    },
-    {
-      "markdown": """# ENKELFAN 250 EEC
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Plug Fanlar](https://www.avensair.com/plug-fanlar "Plug Fanlar")
-4. ENKELFAN 250 EEC
-
-![ENKELFAN 250 EEC](https://www.avensair.com/uploads/160922105842632456e207865_ENKELFAN-EEC-250-450-detay.jpg)
-
-ENKELFAN 250 EEC
-
-**Kategori :** [Plug Fanlar](https://www.avensair.com/plug-fanlar)
-**Ürün Kodu :** ENKEC250
-
-#### (KDV DAHİL)
-28.480,28 ₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/enkelfan-250-eec",
-        "title": " Casals Plug Fan, Ec Plug Fan, klima santrali fanı, oem fan, "
-      }
-    },
-    {
-      "markdown": """# NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar "Nicotra Gebhardt Fanlar")
-4. NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN
-
-![NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052111560360af88d394581_nicotra-gebhardt-at-serisi-cift-emisli-radyal-fanlar-072649-1056.png)
-
-NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN
-
-**Kategori :** [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar)
-**Ürün Kodu :** 18011932
-
-#### (KDV DAHİL)
-8.436,79 ₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan",
-        "title": " NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN | Avens Havalandırma "
-      }
-    },
-    {
-      "markdown": """# NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar "Nicotra Gebhardt Fanlar")
-4. NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN
-
-![NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112084360af8bcb72adf_nicotra-gebhardt-at-serisi-cift-emisli-radyal-fanlar-072649-1056.png)
-
-NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN
-
-**Kategori :** [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar)
-**Ürün Kodu :** 18011933
-
-#### (KDV DAHİL)
-9.460,91 ₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan",
-        "title": " NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN | Avens Havalandırma "
-      }
-    }
-  ]
-}
-
-@dataclass
-class Product:
-    id: str
-    name: str
-    price: Optional[float]
-    currency: str
-    category: str
-    brand: str
-    image_url: Optional[str]
-    product_url: str
-    product_code: Optional[str]
-    description: Optional[str]
-    source_url: str
-    specifications: Dict[str, str]
+# Örnek crawl çıktısı (MCP'den alınmış); modül import edilirken okunmaz
+CRAWL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'firecrawl_sample_crawl.json')
 
 def clean_price(price_text: str) -> Optional[float]:
     """Fiyat metnini temizleyip float'a çevir"""
@@ -155,45 +30,11 @@ def clean_price(price_text: str) -> Optional[float]:
 
 def extract_category_from_url(url: str) -> str:
     """URL'den kategori çıkar"""
-    category_patterns = {
-        'nicotra-gebhardt': 'Nicotra Gebhardt Fanlar',
-        'konut-tipi': 'Konut Tipi Fanlar', 
-        'kanal-tipi': 'Kanal Tipi Fanlar',
-        'cati-tipi': 'Çatı Tipi Fanlar',
-        'ex-proof': 'Ex-Proof Fanlar',
-        'duvar-tipi': 'Duvar Tipi Fanlar',
-        'santrifuj': 'Santrifüj Fanlar',
-        'duman-egzoz': 'Duman Egzoz Fanları',
-        'basinclandirma': 'Basınçlandırma Fanları',
-        'otopark-jet': 'Otopark Jet Fanları',
-        'siginak': 'Sığınak Havalandırma Fanları',
-        'sessiz-kanal': 'Sessiz Kanal Tipi Fanlar',
-        'isi-geri-kazanim': 'Isı Geri Kazanım Cihazları',
-        'hava-perdesi': 'Hava Perdeleri',
-        'nem-alma': 'Nem Alma Cihazları',
-        'hava-temizleyici': 'Hava Temizleyiciler',
-        'flexible': 'Flexible Hava Kanalları',
-        'hiz-kontrolu': 'Hız Kontrolü Cihazları',
-        'plug-fanlar': 'Plug Fanlar'
-    }
-    
-    url_lower = url.lower()
-    for pattern, category in category_patterns.items():
-        if pattern in url_lower:
-            return category
-    
-    return 'Diğer'
+    return load_vocabulary().category_from_url(url)
 
 def extract_brand_from_name(name: str) -> str:
     """Ürün isminden marka çıkar"""
-    brands = ['Vortice', 'Casals', 'Nicotra', 'Gebhardt', 'AVenS', 'Danfoss', 'ENKELFAN']
-    
-    name_upper = name.upper()
-    for brand in brands:
-        if brand.upper() in name_upper:
-            return brand
-    
-    return 'AVenS'
+    return load_vocabulary().brand_from_name(name)
 
 def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]:
     """Markdown içeriğinden ürünleri ayrıştır"""
@@ -251,7 +92,6 @@ def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]
                 image_url = images[0][1]  # İlk resmi kullan
             
             product = Product(
-                id=str(uuid.uuid4()),
                 name=main_title,
                 price=price,
                 currency='TRY',
@@ -261,8 +101,7 @@ def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]
                 product_url=source_url,
                 product_code=product_code,
                 description=None,
-                source_url=source_url,
-                specifications={}
+                source_url=source_url
             )
             
             products.append(product)
@@ -311,7 +150,6 @@ def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]
                     continue
                 
                 product = Product(
-                    id=str(uuid.uuid4()),
                     name=name,
                     price=price,
                     currency='TRY',
@@ -321,22 +159,20 @@ def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]
                     product_url=product_url,
                     product_code=None,
                     description=None,
-                    source_url=source_url,
-                    specifications={}
+                    source_url=source_url
                 )
                 
                 products.append(product)
     
     return products
 
-def process_firecrawl_data() -> List[Product]:
+def process_firecrawl_data(file_path: str = CRAWL_FILE) -> List[Product]:
     """Firecrawl JSON verisini işle"""
     all_products = []
-    pages = FIRECRAWL_RESPONSE.get('data', [])
     
-    print(f"Toplam {len(pages)} sayfa işleniyor...")
+    print(f"{file_path} işleniyor...")
     
-    for i, page in enumerate(pages):
+    for i, page in enumerate(iter_crawl_pages(file_path)):
         markdown = page.get('markdown', '')
         source_url = page.get('metadata', {}).get('sourceURL', '')
         
@@ -1,143 +1,26 @@
-import json
+import argparse
+import os
 import re
-import uuid
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import sys
+from typing import List, Optional
 
-# Firecrawl sonucu burada (MCP çıktısından alınmış)
-FIRECRAWL_RESPONSE = {
-  "status": "completed",
-  "completed": 200,
-  "total": 200,
-  "creditsUsed": 1455,
-  "expiresAt": "2025-09-28T17:15:00.000Z",
-  "next": None,
-  "data": [
-    {
-      "markdown": """# Nicotra Gebhardt Fanlar
+# Paylaşılan modüller avens-integration/ altında
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
 
-1. [Ana Sayfa](https://www.avensair.com/)
-2. [Ürünler](https://www.avensair.com/urunler)
-3. Fanlar
-4. Nicotra Gebhardt Fanlar
+from catalog_record import Product
+from catalog_store import write_catalog
+from crawl_loader import iter_crawl_pages
+from markdown_tokenizer import first, iter_cards, tokenize
+from page_pool import default_workers, parse_pages
+from parse_cache import ParseCache
+from product_dedup import dedupe_products, normalize_name
+from product_vocabulary import load_vocabulary
 
-[![NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FANLAR](https://www.avensair.com/uploads/27052111210460af80a0de36d_1.png)](https://www.avensair.com/nicotra-gebhardt-at-7-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN")
+# Ayrıştırma mantığı değiştiğinde artırılır (parse cache'i geçersiz kılar)
+PARSER_VERSION = 2
 
-### [NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-7-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 7-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-7.851,58₺
-
-[![NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FANLAR](https://www.avensair.com/uploads/27052111422560af85a1f12c7_1.png)](https://www.avensair.com/nicotra-gebhardt-at-9-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-9-7-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-7 ÇİFT EMİŞLİ RADYAL FAN")
-
-8.144,19₺
-
-[![NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052111560660af88d666011_1.png)](https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN")
-
-8.436,79₺
-
-[![NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112084660af8bce07447_1.png)](https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN")
-
-9.460,91₺
-
-[![NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112241560af8f6f188c1_1.png)](https://www.avensair.com/nicotra-gebhardt-at-10-10-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN")
-
-### [NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/nicotra-gebhardt-at-10-10-cift-emisli-radyal-fan "NICOTRA GEBHARDT AT 10-10 ÇİFT EMİŞLİ RADYAL FAN")
-
-9.217,08₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/nicotra-gebhardt-fanlar",
-        "title": " Nicotra Gebhardt Fanlar | Avens Havalandırma "
-      }
-    },
-    {
-      "markdown": """# ENKELFAN 250 EEC
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Plug Fanlar](https://www.avensair.com/plug-fanlar "Plug Fanlar")
-4. ENKELFAN 250 EEC
-
-![ENKELFAN 250 EEC](https://www.avensair.com/uploads/160922105842632456e207865_ENKELFAN-EEC-250-450-detay.jpg)
-
-ENKELFAN 250 EEC
-
-**Kategori :** [Plug Fanlar](https://www.avensair.com/plug-fanlar)
-**Ürün Kodu :** ENKEC250
-
-#### (KDV DAHİL)
-28.480,28 ₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/enkelfan-250-eec",
-        "title": " Casals Plug Fan, Ec Plug Fan, klima santrali fanı, oem fan, "
-      }
-    },
-    {
-      "markdown": """# NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar "Nicotra Gebhardt Fanlar")
-4. NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN
-
-![NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052111560360af88d394581_nicotra-gebhardt-at-serisi-cift-emisli-radyal-fanlar-072649-1056.png)
-
-NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN
-
-**Kategori :** [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar)
-**Ürün Kodu :** 18011932
-
-#### (KDV DAHİL)
-8.436,79 ₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/nicotra-gebhardt-at-9-9-cift-emisli-radyal-fan",
-        "title": " NICOTRA GEBHARDT AT 9-9 ÇİFT EMİŞLİ RADYAL FAN | Avens Havalandırma "
-      }
-    },
-    {
-      "markdown": """# NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN
-
-1. [Ürünler](https://www.avensair.com/urunler "Ürünler")
-2. Fanlar
-3. [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar "Nicotra Gebhardt Fanlar")
-4. NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN
-
-![NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN](https://www.avensair.com/uploads/27052112084360af8bcb72adf_nicotra-gebhardt-at-serisi-cift-emisli-radyal-fanlar-072649-1056.png)
-
-NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN
-
-**Kategori :** [Nicotra Gebhardt Fanlar](https://www.avensair.com/nicotra-gebhardt-fanlar)
-**Ürün Kodu :** 18011933
-
-#### (KDV DAHİL)
-9.460,91 ₺""",
-      "metadata": {
-        "sourceURL": "https://www.avensair.com/nicotra-gebhardt-at-10-8-cift-emisli-radyal-fan",
-        "title": " NICOTRA GEBHARDT AT 10-8 ÇİFT EMİŞLİ RADYAL FAN | Avens Havalandırma "
-      }
-    }
-  ]
-}
-
-@dataclass
-class Product:
-    id: str
-    name: str
-    price: Optional[float]
-    currency: str
-    category: str
-    brand: str
-    image_url: Optional[str]
-    product_url: str
-    product_code: Optional[str]
-    description: Optional[str]
-    source_url: str
-    specifications: Dict[str, str]
+# Örnek crawl çıktısı (MCP'den alınmış); modül import edilirken okunmaz
+CRAWL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'firecrawl_sample_crawl.json')
 
 def clean_price(price_text: str) -> Optional[float]:
     """Türk Lirası formatındaki fiyat metnini temizleyip float'a çevir"""
@@ -165,226 +48,164 @@ def clean_price(price_text: str) -> Optional[float]:
 
 def extract_category_from_url(url: str) -> str:
     """URL'den kategori çıkar"""
-    category_patterns = {
-        'nicotra-gebhardt': 'Nicotra Gebhardt Fanlar',
-        'konut-tipi': 'Konut Tipi Fanlar', 
-        'kanal-tipi': 'Kanal Tipi Fanlar',
-        'cati-tipi': 'Çatı Tipi Fanlar',
-        'ex-proof': 'Ex-Proof Fanlar',
-        'duvar-tipi': 'Duvar Tipi Fanlar',
-        'santrifuj': 'Santrifüj Fanlar',
-        'duman-egzoz': 'Duman Egzoz Fanları',
-        'basinclandirma': 'Basınçlandırma Fanları',
-        'otopark-jet': 'Otopark Jet Fanları',
-        'siginak': 'Sığınak Havalandırma Fanları',
-        'sessiz-kanal': 'Sessiz Kanal Tipi Fanlar',
-        'isi-geri-kazanim': 'Isı Geri Kazanım Cihazları',
-        'hava-perdesi': 'Hava Perdeleri',
-        'nem-alma': 'Nem Alma Cihazları',
-        'hava-temizleyici': 'Hava Temizleyiciler',
-        'flexible': 'Flexible Hava Kanalları',
-        'hiz-kontrolu': 'Hız Kontrolü Cihazları',
-        'plug-fanlar': 'Plug Fanlar',
-        'enkelfan': 'Plug Fanlar'
-    }
-    
-    url_lower = url.lower()
-    for pattern, category in category_patterns.items():
-        if pattern in url_lower:
-            return category
-    
-    return 'Diğer'
+    return load_vocabulary().category_from_url(url)
 
 def extract_brand_from_name(name: str) -> str:
     """Ürün isminden marka çıkar"""
-    brands = ['Vortice', 'Casals', 'Nicotra', 'Gebhardt', 'AVenS', 'Danfoss', 'ENKELFAN']
-    
-    name_upper = name.upper()
-    for brand in brands:
-        if brand.upper() in name_upper:
-            return brand
-    
-    return 'AVenS'
+    return load_vocabulary().brand_from_name(name)
 
 def parse_product_from_markdown(markdown: str, source_url: str) -> List[Product]:
-    """Markdown içeriğinden ürünleri ayrıştır"""
+    """Markdown içeriğinden ürünleri ayrıştır (sayfa tek geçişte token'lara ayrılır)"""
     products = []
+    tokens = tokenize(markdown)
+    cards = list(iter_cards(tokens))
+    category = extract_category_from_url(source_url)
+    first_image = first(tokens, 'image')
     
-    # Başlıktan direkt ürün ismi al (tek ürün sayfaları için)
-    title_match = re.search(r'^# ([^#\n]+)', markdown, re.MULTILINE)
-    if title_match:
-        main_title = title_match.group(1).strip()
-        
-        # Fiyat ara
-        price_patterns = [
-            r'([0-9.,]+)\s*₺',
-            r'₺\s*([0-9.,]+)',
-        ]
+    # Başlıktan direkt ürün ismi al (kart listesi olmayan tek ürün sayfaları için)
+    title = first(tokens, 'heading', extra=1)
+    if title and not cards:
+        main_title = title.value
         
+        # Fiyat ara: önce "7.851,58 ₺", bulunamazsa "₺ 7.851,58"
         price = None
-        for pattern in price_patterns:
-            price_matches = re.findall(pattern, markdown)
-            if price_matches:
-                price = clean_price(price_matches[0])
+        for position in ('suffix', 'prefix'):
+            price_token = first(tokens, 'price', extra=position)
+            if price_token:
+                price = clean_price(price_token.value)
                 if price and price > 100:  # Anlamlı bir fiyat
                     break
         
         if price and price > 100:  # Ana başlıktan ürün bulundu
-            # Ürün kodu ara
-            product_code = None
-            code_match = re.search(r'Ürün Kodu.*?([A-Z0-9]+)', markdown)
-            if code_match:
-                product_code = code_match.group(1)
-            
-            brand = extract_brand_from_name(main_title)
-            category = extract_category_from_url(source_url)
-            
-            # Ana resmi bul
-            image_url = None
-            images = re.findall(r'!\[([^\]]*)\]\(([^)]+)\)', markdown)
-            if images:
-                image_url = images[0][1]  # İlk resmi kullan
+            code = first(tokens, 'code')
             
             product = Product(
-                id=str(uuid.uuid4()),
                 name=main_title,
                 price=price,
                 currency='TRY',
                 category=category,
-                brand=brand,
-                image_url=image_url,
+                brand=extract_brand_from_name(main_title),
+                image_url=first_image.url if first_image else None,  # İlk resmi kullan
                 product_url=source_url,
-                product_code=product_code,
+                product_code=code.value if code else None,
                 description=None,
-                source_url=source_url,
-                specifications={}
+                source_url=source_url
             )
             
             products.append(product)
     
-    # Kategori sayfalarındaki ürün listelerini ara
-    pattern = r'### \[([^\]]+)\]\(([^)]+)\).*?\n\s*([0-9.,]+)₺'
-    matches = re.finditer(pattern, markdown, re.DOTALL | re.MULTILINE)
+    # Kategori sayfalarındaki ürün kartları (görsel ve fiyatı kartla birlikte gelir)
+    seen_names = {normalize_name(p.name) for p in products}
     
-    for match in matches:
-        name = match.group(1).strip()
-        product_url_match = match.group(2)
-        price_text = match.group(3)
+    for card, image, price_token in cards:
+        name = card.value
         
         # Çok kısa isimler atla
         if len(name) < 5:
             continue
         
-        price = clean_price(price_text)
+        price = clean_price(price_token.value) if price_token else None
         if not price or price < 100:  # Çok düşük fiyatları atla
             continue
         
-        brand = extract_brand_from_name(name)
-        category = extract_category_from_url(source_url)
-        
-        # Görsel bul
-        image_url = None
-        image_pattern = f'!\\[.*?{re.escape(name[:20])}.*?\\]\\(([^)]+)\\)'
-        image_match = re.search(image_pattern, markdown, re.IGNORECASE)
-        if image_match:
-            image_url = image_match.group(1)
-        else:
-            # Genel görsel ara
-            images = re.findall(r'!\[[^\]]*\]\(([^)]+)\)', markdown)
-            if images:
-                image_url = images[0]
-        
         # Aynı isimde ürün eklenmişse atla
-        if any(p.name.lower() == name.lower() for p in products):
+        name_key = normalize_name(name)
+        if name_key in seen_names:
             continue
+        seen_names.add(name_key)
+        
+        # Kartın kendi görseli, yoksa sayfadaki ilk görsel
+        image = image or first_image
         
         product = Product(
-            id=str(uuid.uuid4()),
             name=name,
             price=price,
             currency='TRY',
             category=category,
-            brand=brand,
-            image_url=image_url,
-            product_url=product_url_match if product_url_match.startswith('http') else source_url,
+            brand=extract_brand_from_name(name),
+            image_url=image.url if image else None,
+            product_url=card.url if card.url.startswith('http') else source_url,
             product_code=None,
             description=None,
-            source_url=source_url,
-            specifications={}
+            source_url=source_url
         )
         
         products.append(product)
     
     return products
 
-def process_firecrawl_data() -> List[Product]:
-    """Firecrawl JSON verisini işle"""
+def process_firecrawl_data(file_path: str = CRAWL_FILE, workers: Optional[int] = None, use_cache: bool = True,
+                           price_tolerance: float = 0.0) -> List[Product]:
+    """Firecrawl JSON verisini işle (sayfalar workers adet process'e dağıtılır)"""
     all_products = []
-    pages = FIRECRAWL_RESPONSE.get('data', [])
-    
-    print(f"Toplam {len(pages)} sayfa işleniyor...")
     
-    for i, page in enumerate(pages):
+    page_numbers = []
+    markdowns = []
+    source_urls = []
+    for i, page in enumerate(iter_crawl_pages(file_path)):
         markdown = page.get('markdown', '')
         source_url = page.get('metadata', {}).get('sourceURL', '')
         
         if not markdown or not source_url:
             continue
         
-        # Bu sayfadan ürünleri çıkar
-        page_products = parse_product_from_markdown(markdown, source_url)
-        all_products.extend(page_products)
-        
-        if page_products:
-            print(f"Sayfa {i+1}: {len(page_products)} ürün bulundu - {source_url}")
-            for p in page_products:
-                print(f"  → {p.name} - {p.price} TL ({p.category})")
+        page_numbers.append(i)
+        markdowns.append(markdown)
+        source_urls.append(source_url)
     
-    print(f"\nToplam {len(all_products)} ürün bulundu")
+    print(f"Toplam {len(markdowns)} sayfa işleniyor...")
+    
+    # Bu sayfalardan ürünleri çıkar (sonuçlar sayfa sırasıyla birleşir)
+    # İçeriği önceki çalıştırmayla aynı olan sayfalar parse cache'ten gelir
+    cache = ParseCache('firecrawl_fixed', PARSER_VERSION,
+                       dump=Product.to_dict, load=lambda record: Product(**record)) if use_cache else None
+    try:
+        page_results = parse_pages(parse_product_from_markdown, markdowns, source_urls,
+                                   workers=workers, cache=cache)
+        for i, source_url, page_products in zip(page_numbers, source_urls, page_results):
+            all_products.extend(page_products)
+            
+            if page_products:
+                print(f"Sayfa {i+1}: {len(page_products)} ürün bulundu - {source_url}")
+                for p in page_products:
+                    print(f"  → {p.name} - {p.price} TL ({p.category})")
+    finally:
+        if cache:
+            cache.close()
+            print(f"Parse cache: {cache.hits} sayfa cache'ten, {cache.misses} sayfa ayrıştırıldı")
     
-    # Duplicateları temizle (aynı isim + benzer fiyat)
-    unique_products = []
-    seen_products = set()
+    print(f"\nToplam {len(all_products)} ürün bulundu")
     
-    for product in all_products:
-        key = f"{product.name.lower()}_{product.price}"
-        if key not in seen_products:
-            unique_products.append(product)
-            seen_products.add(key)
+    # Duplicateları temizle (aynı isim + tolerans içinde aynı fiyat)
+    unique_products = dedupe_products(all_products, price_tolerance=price_tolerance)
     
     print(f"Temizleme sonrası: {len(unique_products)} benzersiz ürün")
     return unique_products
 
 def save_products_to_json(products: List[Product], output_file: str):
-    """Ürünleri JSON formatında kaydet"""
-    products_dict = []
-    
-    for product in products:
-        products_dict.append({
-            'id': product.id,
-            'name': product.name,
-            'price': product.price,
-            'currency': product.currency,
-            'category': product.category,
-            'brand': product.brand,
-            'image_url': product.image_url,
-            'product_url': product.product_url,
-            'product_code': product.product_code,
-            'description': product.description,
-            'source_url': product.source_url,
-            'specifications': product.specifications
-        })
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(products_dict, f, ensure_ascii=False, indent=2)
-    
+    """Ürünleri uzantıya göre JSON, NDJSON ya da Parquet/Arrow olarak kaydet"""
+    write_catalog(output_file, products)
     print(f"Ürünler {output_file} dosyasına kaydedildi")
 
 def main():
-    output_file = 'avens_products_sample.json'
+    parser = argparse.ArgumentParser(description='Firecrawl crawl çıktısından ürünleri ayrıştır')
+    parser.add_argument('--input', default=CRAWL_FILE,
+                        help='Crawl dump dosyası (düz ya da text_result sarmalı JSON)')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='Paralel ayrıştırma process sayısı (1 = seri)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse cache\'i kullanmadan tüm sayfaları yeniden ayrıştır')
+    parser.add_argument('--price-tolerance', type=float, default=0.0,
+                        help='Aynı isimli ürünlerde bu kadar TL\'ye kadar fiyat farkı duplicate sayılır')
+    parser.add_argument('--output', default='avens_products_sample.json',
+                        help='Çıktı dosyası (.json, .ndjson ya da pyarrow ile .parquet/.arrow)')
+    args = parser.parse_args()
+    
+    output_file = args.output
     
     print("Firecrawl verisi işleniyor...")
-    products = process_firecrawl_data()
+    products = process_firecrawl_data(args.input, workers=args.workers, use_cache=not args.no_cache,
+                                      price_tolerance=args.price_tolerance)
     
     if products:
         print(f"\nÜrün dağılımı:")
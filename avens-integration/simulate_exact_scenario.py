@@ -2,6 +2,9 @@ from supabase import create_client
 import os
 from dotenv import load_dotenv
 
+from category_index import CategoryIndex
+from table_reader import iter_products
+
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -18,7 +21,7 @@ print('URL: /category/hava-perdeleri\n')
 
 # 1. Kategorileri çek
 print('1️⃣  Kategorileri getir...')
-categories = supabase.table('categories').select('*').execute().data
+categories = CategoryIndex.load_cached(supabase)
 print(f'   ✅ {len(categories)} kategori yüklendi\n')
 
 # 2. URL'den kategori bul
@@ -30,11 +33,11 @@ targetCategory = None
 
 if parentSlug and slug:
     print('   Alt kategori sayfası algılandı')
-    targetParentCategory = next((c for c in categories if c['slug'] == parentSlug and c['level'] == 0), None)
-    targetCategory = next((c for c in categories if c['slug'] == slug and c['level'] == 1), None)
+    targetParentCategory = categories.by_slug(parentSlug, level=0)
+    targetCategory = categories.by_slug(slug, level=1)
 elif slug:
     print('   Ana kategori sayfası algılandı')
-    targetCategory = next((c for c in categories if c['slug'] == slug and c['level'] == 0), None)
+    targetCategory = categories.by_slug(slug, level=0)
 
 if not targetCategory:
     print('   ❌ KATEGORİ BULUNAMADI!')
@@ -46,7 +49,7 @@ print(f'      Level: {targetCategory["level"]}\n')
 
 # 3. Alt kategorileri bul
 print('3️⃣  Alt kategorileri bul...')
-subs = [c for c in categories if c.get('parent_id') == targetCategory['id']]
+subs = categories.children(targetCategory['id'])
 print(f'   ✅ {len(subs)} alt kategori bulundu')
 for sub in subs:
     print(f'      - {sub["name"]} ({sub["slug"]})')
@@ -64,13 +67,14 @@ if targetCategory['level'] == 0 and len(subs) > 0:
     print()
     
     print('5️⃣  Ürünleri getir...')
-    products = supabase.table('products').select('id, name, category_id, subcategory_id, status').eq('category_id', targetCategory['id']).eq('status', 'active').execute()
+    products = list(iter_products(supabase, 'id, name, category_id, subcategory_id, status',
+                                  filters={'category_id': targetCategory['id'], 'status': 'active'}))
     
-    print(f'   📦 SONUÇ: {len(products.data)} ürün bulundu\n')
+    print(f'   📦 SONUÇ: {len(products)} ürün bulundu\n')
     
-    if products.data:
+    if products:
         print('   Ürünler:')
-        for i, p in enumerate(products.data, 1):
+        for i, p in enumerate(products, 1):
             print(f'   {i}. {p["name"]}')
             print(f'      category_id: {p["category_id"]}')
             print(f'      subcategory_id: {p.get("subcategory_id", "None")}')
@@ -81,10 +85,14 @@ if targetCategory['level'] == 0 and len(subs) > 0:
         
         # Debug
         print('   🔍 DEBUG:')
-        all_products = supabase.table('products').select('id, name, category_id, status').execute()
-        hava_products = [p for p in all_products.data if p['category_id'] == targetCategory['id']]
+        total_products = 0
+        hava_products = []
+        for p in iter_products(supabase, 'id, name, category_id, status'):
+            total_products += 1
+            if p['category_id'] == targetCategory['id']:
+                hava_products.append(p)
         
-        print(f'      Toplam ürün: {len(all_products.data)}')
+        print(f'      Toplam ürün: {total_products}')
         print(f'      Bu category_id ile ürün: {len(hava_products)}')
         
         if hava_products:
@@ -4,7 +4,7 @@ Akıllı Kategori Eşleştirme ile Temiz Import
 Ürün isimlerine bakarak doğru alt kategorilere yerleştirir
 """
 
-import json
+import argparse
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -12,6 +12,14 @@ import logging
 from datetime import datetime
 import re
 
+from batch_writer import BatchWriter, insert_sender
+from category_index import CategoryIndex
+from category_rules import CategoryClassifier
+from description_sanitizer import sanitize_records
+from product_sku import SkuAssigner
+from product_sync import content_hash, normalize_source_url, sync_products
+from scrape_journal import read_scrape_output
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,187 +44,62 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# Global counter for unique SKU
-sku_counter = 0
-
-def generate_sku(name, brand):
-    """SKU kodu oluştur"""
-    global sku_counter
-    sku_counter += 1
-    
-    brand_part = re.sub(r'[^A-Z]', '', brand.upper())[:3] or 'AVN'
-    name_part = re.sub(r'[^A-Z0-9]', '', name.upper())[:3]
-    
-    return f"{brand_part}-{name_part}-{sku_counter:05d}"
+# Varsayılan girdi: scrape_with_categories.js journal'ı (--input ile değiştirilebilir)
+DEFAULT_INPUT = 'scraped-data/products_with_categories.ndjson'
 
-def get_smart_category_id(product_name, scraped_category, category_map):
+def smart_import(sync=False, workers=4, input_path=DEFAULT_INPUT):
     """
-    Ürün ismine ve scraped kategoriye bakarak en uygun kategori ID'sini bul
+    Akıllı kategori eşleştirme ile import
+    sync=True ise hiçbir şey silinmez; ürünler source_url ile artımlı senkronize edilir
+    workers: aynı anda yolda olabilecek batch sayısını belirleyen thread sayısı
     """
-    name_lower = product_name.lower()
-    scraped_lower = scraped_category.lower().strip()
-    
-    # Hava Perdeleri için özel mantık
-    if 'hava perdeleri' in scraped_lower or 'hava perdesi' in name_lower:
-        # Elektrikli ısıtıcılı mı?
-        # Türkçe karakterleri normalize et
-        name_normalized = name_lower.replace('ı', 'i').replace('İ', 'i').replace('ğ', 'g').replace('ş', 's').replace('ç', 'c').replace('ü', 'u').replace('ö', 'o')
-        
-        if any(k in name_normalized for k in ['elektrik', 'isitici', 'electric', 'heater']):
-            # Normalize edilmiş halde ara
-            cat_id = category_map.get('elektrikli isiticili')
-            if cat_id:
-                logger.info(f"[SMART] '{product_name}' -> Elektrikli Isıtıcılı")
-                return cat_id
-            else:
-                logger.warning(f"[SMART] Elektrikli Isıtıcılı kategorisi bulunamadı!")
-        
-        # Su ısıtmalı mı?
-        if any(k in name_normalized for k in ['su isitici', 'water', 'sicak su']):
-            cat_id = category_map.get('su ısıtıcılı')
-            if cat_id:
-                logger.info(f"[SMART] '{product_name}' -> Su Isıtıcılı")
-                return cat_id
-        
-        # Varsayılan: Ortam Havalı
-        cat_id = category_map.get('ortam havalı')
-        if cat_id:
-            logger.info(f"[SMART] '{product_name}' -> Ortam Havalı (default)")
-            return cat_id
-    
-    # Aksesuarlar için özel mantık
-    if 'aksesuar' in scraped_lower:
-        # Gemici anemostadı mı?
-        if 'gemici' in name_lower or 'anemosta' in name_lower:
-            cat_id = category_map.get('gemici anemostadı')
-            if cat_id:
-                logger.debug(f"'{product_name}' -> Gemici Anemostadı")
-                return cat_id
-        
-        # Bağlantı konnektörü mü?
-        if 'konnektör' in name_lower or 'bağlantı' in name_lower:
-            cat_id = category_map.get('bağlantı konnektörü')
-            if cat_id:
-                return cat_id
-        
-        # Plastik kelepçe mi?
-        if 'kelepçe' in name_lower:
-            cat_id = category_map.get('plastik kelepçeler')
-            if cat_id:
-                return cat_id
-        
-        # Folyo bant mı?
-        if 'folyo' in name_lower or 'bant' in name_lower:
-            cat_id = category_map.get('alüminyum folyo bantlar')
-            if cat_id:
-                return cat_id
-    
-    # Flexible Kanallar
-    if 'flexible' in scraped_lower or 'kanal' in scraped_lower:
-        if 'flexible' in name_lower:
-            cat_id = category_map.get('flexible hava kanalları')
-            if cat_id:
-                logger.debug(f"'{product_name}' -> Flexible Hava Kanalları")
-                return cat_id
-    
-    # Isı Geri Kazanım için özel mantık
-    if 'ısı geri kazanım' in scraped_lower or 'heat recovery' in scraped_lower:
-        # Konut tipi mi, ticari tip mi?
-        if any(k in name_lower for k in ['konut', 'residential', 'ev']):
-            cat_id = category_map.get('konut tipi')
-            if cat_id:
-                logger.debug(f"'{product_name}' -> Konut Tipi (IGK)")
-                return cat_id
-        else:
-            cat_id = category_map.get('ticari tip')
-            if cat_id:
-                logger.debug(f"'{product_name}' -> Ticari Tip (IGK)")
-                return cat_id
-    
-    # Hız Kontrolü Cihazları
-    if 'hız kontrol' in scraped_lower:
-        # Hız anahtarı mı, DANFOSS mu?
-        if 'danfoss' in name_lower:
-            cat_id = category_map.get('danfoss')
-            if cat_id:
-                return cat_id
-        else:
-            cat_id = category_map.get('hız anahtarı')
-            if cat_id:
-                return cat_id
-    
-    # Standart kategori eşleştirmeleri
-    CATEGORY_MAPPINGS = {
-        'konut tipi fanlar': 'Konut Tipi Fanlar',
-        'santrifüj fanlar': 'Santrifüj Fanlar',
-        'kanal tipi fanlar': 'Kanal Tipi Fanlar',
-        'çatı tipi fanlar': 'Çatı Tipi Fanlar',
-        'endüstriyel fanlar': 'Endüstriyel Fanlar',
-        'nicotra gebhardt': 'Nicotra Gebhardt Fanlar',
-        'plug fanlar': 'Plug Fanlar',
-        'sessiz fanlar': 'Sessiz Kanal Tipi Fanlar',
-        'jet fanlar': 'Otopark Jet Fanları',
-        'duvar tipi fanlar': 'Duvar Tipi Kompakt Aksiyal Fanlar',
-        'duman egzoz fanları': 'Duman Egzoz Fanları',
-        'basınçlandırma fanları': 'Basınçlandırma Fanları',
-        'sığınak fanları': 'Sığınak Havalandırma Fanları',
-        'ex-proof fanlar': 'Ex-Proof Fanlar (Patlama Karşı ATEX Fanlar)',
-    }
-    
-    normalized = scraped_lower
-    mapped_category = CATEGORY_MAPPINGS.get(normalized, scraped_category)
-    
-    return category_map.get(mapped_category.lower().strip())
-
-def smart_import():
-    """Akıllı kategori eşleştirme ile import"""
     
     logger.info("="*60)
-    logger.info("AKILLI KATEGORI EŞLEŞTIRME İLE İMPORT")
+    logger.info("AKILLI KATEGORI EŞLEŞTIRME İLE İMPORT" + (" (SYNC)" if sync else ""))
     logger.info("="*60)
     
-    # 1. ORDER ITEMS SİL
-    logger.info("\n1. Order items siliniyor...")
-    try:
-        supabase.table('venthub_order_items').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-        logger.info("OK Order items silindi")
-    except Exception as e:
-        logger.warning(f"Order items silme hatası (devam): {e}")
-    
-    # 2. TÜM ÜRÜNLERİ SİL
-    logger.info("\n2. Mevcut ürünler siliniyor...")
-    try:
-        supabase.table('products').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-        logger.info("OK Tüm ürünler silindi")
-    except Exception as e:
-        logger.error(f"Ürün silme hatası: {e}")
+    # Girdi yoksa hiçbir şey silinmeden dur
+    if not os.path.exists(input_path):
+        logger.error(f"{input_path} bulunamadı! (--input ile scrape çıktısı verilebilir)")
         return False
     
+    if sync:
+        logger.info("\n1-2. Sync modu: order items ve ürünler silinmeyecek")
+    else:
+        # 1. ORDER ITEMS SİL
+        logger.info("\n1. Order items siliniyor...")
+        try:
+            supabase.table('venthub_order_items').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+            logger.info("OK Order items silindi")
+        except Exception as e:
+            logger.warning(f"Order items silme hatası (devam): {e}")
+        
+        # 2. TÜM ÜRÜNLERİ SİL
+        logger.info("\n2. Mevcut ürünler siliniyor...")
+        try:
+            supabase.table('products').delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
+            logger.info("OK Tüm ürünler silindi")
+        except Exception as e:
+            logger.error(f"Ürün silme hatası: {e}")
+            return False
+    
     # 3. KATEGORİLERİ YÜKLE
     logger.info("\n3. Kategoriler yükleniyor...")
-    response = supabase.table('categories').select('*').execute()
-    categories = response.data
+    categories = CategoryIndex.load_cached(supabase)
     
-    # Kategori map'i oluştur - Türkçe karakterleri normalize et
-    category_map = {}
-    for cat in categories:
-        # Hem orijinal hem de normalize edilmiş versiyonları ekle
-        name_lower = cat['name'].lower().strip()
-        name_normalized = name_lower.replace('ı', 'i').replace('i̇', 'i').replace('ğ', 'g').replace('ş', 's').replace('ç', 'c').replace('ü', 'u').replace('ö', 'o')
-        
-        category_map[name_lower] = cat['id']
-        category_map[name_normalized] = cat['id']
+    # Kategori kurallarını bir kez derle (her ürün için tek geçiş)
+    classifier = CategoryClassifier(categories.name_map())
     
     logger.info(f"OK {len(categories)} kategori yüklendi")
     
     # 4. SCRAPED PRODUCTS YÜKLE
     logger.info("\n4. Scraped ürünler yükleniyor...")
-    json_file = 'scraped-data/complete_with_categories_2025-09-30T11-49-23-659Z.json'
-    
-    with open(json_file, 'r', encoding='utf-8') as f:
-        scraped_products = json.load(f)
+    # Dosya akışlı okunur: ilk batch dosyanın tamamı parse edilmeden gönderilir
+    # Journal (.ndjson) verilirse checkpoint'e kadar olan kayıtların güncel görünümü okunur
+    # Açıklamalardaki sayfa CSS'i/HTML'i okunurken temizlenir
+    scraped_products = sanitize_records(read_scrape_output(input_path))
     
-    logger.info(f"OK {len(scraped_products)} ürün yüklendi")
+    logger.info(f"OK {input_path} okunuyor")
     
     # 5. ÜRÜNLERİ İMPORT ET
     logger.info("\n5. Ürünler import ediliyor (AKILLI EŞLEŞTİRME)...")
@@ -225,44 +108,60 @@ def smart_import():
         'total': 0,
         'imported': 0,
         'skipped': 0,
+        'duplicates': 0,
         'errors': 0,
         'by_category': {}
     }
     
-    batch = []
+    sync_rows = []
+    # Insert yolunda görülen source_url'ler (uq_products_source_url; sync'te plan_sync ayıklar)
+    seen_urls = set()
+    # SKU ürün kimliğinden (marka + URL/Ürün Kodu) türetilir, her import'ta aynı kalır
+    assign_sku = SkuAssigner()
     BATCH_SIZE = 50
+    # Bölünerek tekrar denense de yazılamayan satırlar (sunucu hatasıyla birlikte)
+    dead_letter_file = f'smart_import_dead_letter_{datetime.now().strftime("%Y%m%d_%H%M%S")}.ndjson'
+    
+    writer = None
+    if not sync:
+        writer = BatchWriter(insert_sender(supabase, 'products'), batch_size=BATCH_SIZE,
+                             workers=workers, dead_letter_path=dead_letter_file, label='products')
     
     for product in scraped_products:
         stats['total'] += 1
         
         name = product.get('name', '').strip()
-        category = product.get('category', '').strip()
-        subcategory = product.get('subcategory', '').strip()
+        category = (product.get('category') or '').strip()
+        subcategory = (product.get('subcategory') or '').strip()
         brand = product.get('brand', 'AVenS').strip()
         price_str = product.get('price', '')
+        url = product.get('url') or product.get('source_url') or product.get('product_url')
+        source_url = normalize_source_url(url)
         
         # Geçersiz ürünleri atla
         if not name or '@' in name or name == 'satis@avensair.com':
             stats['skipped'] += 1
             continue
         
+        # Aynı URL ikinci kez gelirse unique index ihlali olur: hata değil tekrar sayılır
+        if not sync and source_url:
+            if source_url in seen_urls:
+                stats['duplicates'] += 1
+                continue
+            seen_urls.add(source_url)
+        
         # ÖNCE SUBCATEGORY İLE EŞLEŞTİRMEYİ DENE
         category_id = None
         if subcategory:
-            # Önce alt kategoriyi dene (orijinal)
-            category_id = category_map.get(subcategory.lower().strip())
-            
-            # Eğer bulunamadıysa normalize edilmiş versiyonu dene
-            if not category_id:
-                subcat_normalized = subcategory.lower().strip().replace('ı', 'i').replace('İ', 'i').replace('ğ', 'g').replace('ş', 's').replace('ç', 'c').replace('ü', 'u').replace('ö', 'o')
-                category_id = category_map.get(subcat_normalized)
+            # Alt kategoriyi normalize edilmiş isimle ara
+            category_id = categories.id_for_name(subcategory)
             
             if category_id:
                 logger.debug(f"Subcategory ile eşleşti: {subcategory}")
         
         # Eğer subcategory ile eşleşmedi ise akıllı eşleştirme yap
         if not category_id:
-            category_id = get_smart_category_id(name, category, category_map)
+            category_id = classifier.classify(name, category)
         
         if not category_id:
             logger.warning(f"Kategori bulunamadı: {category} (Ürün: {name})")
@@ -270,7 +169,7 @@ def smart_import():
             continue
         
         # İstatistik için kategori say
-        cat_name = next((c['name'] for c in categories if c['id'] == category_id), 'Unknown')
+        cat_name = categories.name_of(category_id, 'Unknown')
         stats['by_category'][cat_name] = stats['by_category'].get(cat_name, 0) + 1
         
         # Fiyat parse et
@@ -291,35 +190,35 @@ def smart_import():
             'brand': brand,
             'category_id': category_id,
             'price': price,
-            'sku': generate_sku(name, brand),
-            'description': f"{name} - Smart category mapping",
+            'sku': assign_sku(brand, source_url=url,
+                              model_code=product.get('product_code'), name=name),
+            'description': product.get('description') or f"{name} - Smart category mapping",
             'status': 'active',
-            'stock_qty': 0
+            'stock_qty': 0,
+            'source_url': source_url,
+            'model_code': (product.get('product_code') or '').strip() or None
         }
+        product_data['content_hash'] = content_hash(product_data)
         
-        batch.append(product_data)
+        if sync:
+            sync_rows.append(product_data)
+            continue
         
-        # Batch dolduğunda insert et
-        if len(batch) >= BATCH_SIZE:
-            try:
-                supabase.table('products').insert(batch).execute()
-                stats['imported'] += len(batch)
-                logger.info(f"OK {stats['imported']} ürün import edildi...")
-                batch = []
-            except Exception as e:
-                logger.error(f"Batch import hatası: {e}")
-                stats['errors'] += len(batch)
-                batch = []
+        writer.add(product_data)
     
-    # Kalan batch
-    if batch:
-        try:
-            supabase.table('products').insert(batch).execute()
-            stats['imported'] += len(batch)
-            logger.info(f"OK {stats['imported']} ürün import edildi")
-        except Exception as e:
-            logger.error(f"Son batch hatası: {e}")
-            stats['errors'] += len(batch)
+    # Kalan batch'leri gönder ve yoldaki istekleri bekle
+    if writer:
+        write_stats = writer.close()
+        stats['imported'] += write_stats['written']
+        stats['errors'] += write_stats['errors']
+    
+    # Sync modu: sadece değişen satırlar yazılır
+    sync_stats = None
+    if sync:
+        sync_stats = sync_products(supabase, sync_rows, batch_size=BATCH_SIZE, workers=workers,
+                                   dead_letter_path=dead_letter_file)
+        stats['imported'] = sync_stats['inserted'] + sync_stats['updated']
+        stats['errors'] += sync_stats['errors']
     
     # ÖZET
     logger.info("\n" + "="*60)
@@ -327,7 +226,12 @@ def smart_import():
     logger.info("="*60)
     logger.info(f"Toplam Ürün: {stats['total']}")
     logger.info(f"OK Import Edilen: {stats['imported']}")
+    if sync_stats:
+        logger.info(f"   Yeni: {sync_stats['inserted']}, Güncellenen: {sync_stats['updated']}, Değişmeyen: {sync_stats['unchanged']}")
+        logger.info(f"   Pasife Alınan: {sync_stats['deactivated']}, Tekrarlanan URL: {sync_stats['duplicates']}")
     logger.info(f"-> Atlanan: {stats['skipped']}")
+    if stats['duplicates']:
+        logger.info(f"-> Tekrarlanan URL: {stats['duplicates']}")
     logger.info(f"X Hata: {stats['errors']}")
     
     logger.info("\n=== KATEGORİ DAĞILIMI ===")
@@ -339,8 +243,17 @@ def smart_import():
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Avens ürünlerini akıllı kategori eşleştirme ile import et')
+    parser.add_argument('--sync', action='store_true',
+                        help='Silmeden artımlı senkronizasyon (yeni/değişen ürünler yazılır, kaybolanlar pasife alınır)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Aynı anda gönderilecek batch sayısı (varsayılan: 4)')
+    parser.add_argument('--input', default=DEFAULT_INPUT,
+                        help=f'Scrape çıktısı: journal (.ndjson) ya da JSON snapshot (varsayılan: {DEFAULT_INPUT})')
+    args = parser.parse_args()
+    
     try:
-        success = smart_import()
+        success = smart_import(sync=args.sync, workers=args.workers, input_path=args.input)
         if success:
             logger.info("\nOK Akıllı import başarıyla tamamlandı!")
         else:
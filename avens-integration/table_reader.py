@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Akışlı tablo okuyucu
+PostgREST tek istekte en fazla max-rows kadar satır döndürür; sayfalamasız bir
+select() tablonun sadece ilk sayfasını sessizce getirir. iter_rows() tabloyu
+anahtar sırasıyla gezer (id > son_id order by id limit N): offset taraması yoktur,
+her sayfa indeksten okunur. Bir sayfa işlenirken bir sonraki arka planda çekilir;
+bellekte en fazla iki sayfa bulunur.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+
+def iter_rows(supabase, table, columns='*', filters=None, page_size=PAGE_SIZE, key='id', prefetch=True,
+              or_filter=None):
+    """
+    Tablonun tüm satırlarını key sırasıyla üret
+    filters: {sütun: değer} eşitlik filtreleri
+    or_filter: PostgREST or ifadesi (örn. 'name.like.*Hava*,name.like.*VHC*'), filters ile AND'lenir
+    page_size sunucunun max-rows sınırından büyük olsa da satır kaçmaz: okuma boş
+    sayfa gelene kadar sürer (son istek bir sonraki sayfa ile örtüşür).
+    """
+    if page_size <= 0:
+        raise ValueError('page_size pozitif olmalı')
+
+    if columns != '*' and key not in (column.strip() for column in columns.split(',')):
+        columns = f"{key}, {columns}"
+
+    def fetch(last_key):
+        query = supabase.table(table).select(columns)
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+        if or_filter:
+            query = query.or_(or_filter)
+        if last_key is not None:
+            query = query.gt(key, last_key)
+        return query.order(key).limit(page_size).execute().data or []
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = fetch(None)
+        while page:
+            last_key = page[-1][key]
+            # Bu sayfa tüketilirken sıradaki sayfa yolda olsun
+            following = executor.submit(fetch, last_key) if executor else None
+
+            yield from page
+
+            page = following.result() if following else fetch(last_key)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_products(supabase, columns='*', filters=None, page_size=PAGE_SIZE, prefetch=True, or_filter=None):
+    """products tablosunu akışlı oku (bkz. iter_rows)"""
+    return iter_rows(supabase, 'products', columns, filters=filters, page_size=page_size, prefetch=prefetch,
+                     or_filter=or_filter)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Türkçe metin normalizasyonu
+Kategori map'leri, kural eşleştirme ve isim karşılaştırmaları aynı anahtarı
+kullansın diye tüm katlama burada yapılır. Her dönüşüm önceden hesaplanmış bir
+str.translate tablosuyla tek geçiştir (ara string üreten .replace() zinciri yok).
+İ/I büyük harfleri Türkçe kurala göre küçültülür: 'İ' -> 'i', 'I' -> 'ı'
+(str.lower() 'İ'yi 'i̇' yapar, 'I'yı 'i' yapar).
+"""
+
+from functools import lru_cache
+
+# Türkçe küçük harf: str.lower()'dan önce uygulanır
+_TURKISH_LOWER_TABLE = str.maketrans({'İ': 'i', 'I': 'ı'})
+
+# Türkçe karakter katlama ('Isı Geri Kazanım' -> 'isi geri kazanim')
+_FOLD_TABLE = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ş': 's', 'ş': 's',
+    'Ç': 'c', 'ç': 'c',
+    'Ü': 'u', 'ü': 'u',
+    'Ö': 'o', 'ö': 'o',
+    '̇': None  # ayrışık yazılmış 'i̇' birleşik noktası
+})
+
+FOLD_CACHE_SIZE = 4096
+
+
+def turkish_lower(text):
+    """Türkçe kurallarıyla küçük harf ('ISI' -> 'ısı', 'İç' -> 'iç')"""
+    return (text or '').translate(_TURKISH_LOWER_TABLE).lower()
+
+
+def fold_turkish(text):
+    """Karşılaştırma anahtarı: Türkçe karakterler ASCII'ye katlanmış, küçük harf, kırpılmış"""
+    return (text or '').translate(_FOLD_TABLE).lower().strip()
+
+
+@lru_cache(maxsize=FOLD_CACHE_SIZE)
+def fold_cached(text):
+    """fold_turkish'in memoize edilmiş hali (sürekli tekrar eden kategori isimleri için)"""
+    return fold_turkish(text)
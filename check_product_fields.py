@@ -1,7 +1,14 @@
 from supabase import create_client
 import os
+import sys
 from dotenv import load_dotenv
 
+# Shared modules live under avens-integration/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'avens-integration'))
+
+from product_stats import fetch_category_stats
+from table_reader import iter_products
+
 # Load environment variables
 load_dotenv()
 
@@ -11,30 +18,25 @@ supabase = create_client(
     os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 )
 
-# Get all active products
-response = supabase.table('products').select('id,name,category_id,subcategory_id').eq('status', 'active').execute()
-products = response.data
+# Categorization buckets are counted in Postgres (product_category_stats RPC)
+stats = fetch_category_stats(supabase, status='active')
 
-print(f"Total active products: {len(products)}\n")
+print(f"Total active products: {stats['total']}\n")
 
-# Check products with "Hava" or "VOLCANO" in name
+# Check products with "Hava" or "VOLCANO" in name (only these rows are downloaded, page by page)
 print("Products related to Hava Perdeleri:")
 print("-" * 80)
-for p in products:
-    if 'Hava' in p['name'] or 'VOLCANO' in p['name'] or 'VHC' in p['name']:
-        print(f"Name: {p['name']}")
-        print(f"  category_id: {p['category_id']}")
-        print(f"  subcategory_id: {p['subcategory_id']}")
-        print()
-
-# Get statistics
-cat_only = [p for p in products if p['category_id'] is not None and p['subcategory_id'] is None]
-subcat_only = [p for p in products if p['category_id'] is None and p['subcategory_id'] is not None]
-both = [p for p in products if p['category_id'] is not None and p['subcategory_id'] is not None]
-neither = [p for p in products if p['category_id'] is None and p['subcategory_id'] is None]
+matching = iter_products(supabase, 'id, name, category_id, subcategory_id',
+                         filters={'status': 'active'},
+                         or_filter='name.like.*Hava*,name.like.*VOLCANO*,name.like.*VHC*')
+for p in matching:
+    print(f"Name: {p['name']}")
+    print(f"  category_id: {p['category_id']}")
+    print(f"  subcategory_id: {p['subcategory_id']}")
+    print()
 
 print("\nProduct categorization statistics:")
-print(f"Only category_id set: {len(cat_only)}")
-print(f"Only subcategory_id set: {len(subcat_only)}")
-print(f"Both set: {len(both)}")
-print(f"Neither set: {len(neither)}")
+print(f"Only category_id set: {stats['category_only']}")
+print(f"Only subcategory_id set: {stats['subcategory_only']}")
+print(f"Both set: {stats['both']}")
+print(f"Neither set: {stats['neither']}")
@@ -0,0 +1,14 @@
+begin;
+
+-- Avens import senkronizasyonu için doğal anahtar: ürünün kaynak sayfa URL'si
+-- Silip yeniden yüklemek yerine ürünler bu kolon üzerinden eşleştirilir
+alter table if exists public.products
+  add column if not exists source_url text null;
+
+comment on column public.products.source_url is 'Normalized supplier product page URL (natural key for catalog sync). NULL for manually created products.';
+
+-- NULL değerler birbirinden farklı sayıldığı için manuel ürünler etkilenmez
+create unique index if not exists uq_products_source_url
+  on public.products (source_url);
+
+commit;
@@ -0,0 +1,10 @@
+begin;
+
+-- Avens import: ürün içeriğinin (name, brand, category_id, price, description, status) özeti
+-- Importer aynı hash'e sahip satırları hiç göndermez; gereksiz yazma ve FTS index bakımı önlenir
+alter table if exists public.products
+  add column if not exists content_hash text null;
+
+comment on column public.products.content_hash is 'Importer-computed hash of synced product fields. Rows whose hash is unchanged are skipped client-side during catalog sync.';
+
+commit;
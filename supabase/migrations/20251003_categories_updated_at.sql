@@ -0,0 +1,26 @@
+begin;
+
+-- Kategori snapshot cache'inin tazelik kontrolü için (max(updated_at) + count)
+alter table if exists public.categories
+  add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists idx_categories_updated_at
+  on public.categories (updated_at desc);
+
+-- public.set_updated_at() önceki migration'larda tanımlı (search_path sabitlenmiş haliyle)
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1
+    FROM pg_trigger
+    WHERE tgname = 'trg_categories_updated_at'
+      AND tgrelid = 'public.categories'::regclass
+  ) THEN
+    CREATE TRIGGER trg_categories_updated_at
+      BEFORE UPDATE ON public.categories
+      FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+  END IF;
+END;
+$$;
+
+commit;
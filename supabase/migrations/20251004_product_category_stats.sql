@@ -0,0 +1,56 @@
+begin;
+
+-- Avens bakım scriptleri: kategori/alt kategori doluluk sayıları Postgres'te hesaplanır
+-- (sağlık kontrolü tüm ürün tablosunu indirmek yerine birkaç yüz baytlık bir JSON alır)
+-- p_status verilirse sadece o durumdaki ürünler sayılır (örn. 'active')
+create or replace function public.product_category_stats(p_status text default null)
+returns jsonb
+language sql
+stable
+security invoker
+set search_path to pg_catalog, public
+as $$
+  with scoped as (
+    select p.category_id, p.subcategory_id
+    from public.products p
+    where p_status is null or p.status = p_status
+  ),
+  buckets as (
+    select
+      count(*) as total,
+      count(*) filter (where category_id is not null and subcategory_id is null) as category_only,
+      count(*) filter (where category_id is null and subcategory_id is not null) as subcategory_only,
+      count(*) filter (where category_id is not null and subcategory_id is not null) as both_set,
+      count(*) filter (where category_id is null and subcategory_id is null) as neither
+    from scoped
+  ),
+  per_category as (
+    select category_id, subcategory_id, count(*) as products
+    from scoped
+    group by category_id, subcategory_id
+  )
+  select jsonb_build_object(
+    'total', b.total,
+    'category_only', b.category_only,
+    'subcategory_only', b.subcategory_only,
+    'both', b.both_set,
+    'neither', b.neither,
+    'by_category', coalesce(
+      (select jsonb_agg(jsonb_build_object(
+                'category_id', c.category_id,
+                'subcategory_id', c.subcategory_id,
+                'products', c.products
+              ) order by c.products desc)
+       from per_category c),
+      '[]'::jsonb
+    )
+  )
+  from buckets b;
+$$;
+
+comment on function public.product_category_stats(text) is 'Product counts by category_id/subcategory_id fill state and per (category_id, subcategory_id) pair. Used by the Avens maintenance scripts as a cheap health check.';
+
+revoke all on function public.product_category_stats(text) from public;
+grant execute on function public.product_category_stats(text) to service_role;
+
+commit;
@@ -0,0 +1,39 @@
+begin;
+
+-- Avens bakım scriptleri: kategori/alt kategori taşımaları tek istekte yazılır
+-- p_updates: [{"id": ..., "category_id": ..., "subcategory_id": ...}, ...]
+-- Liste POST gövdesinde gelir (in_ filtresindeki URL uzunluğu sınırı yok); binlerce satır tek
+-- UPDATE ... FROM ile güncellenir. Anahtarı verilmeyen sütun mevcut değerini korur.
+create or replace function public.bulk_set_product_categories(p_updates jsonb)
+returns integer
+language sql
+volatile
+security invoker
+set search_path to pg_catalog, public
+as $$
+  with changes as (
+    select
+      (u->>'id')::uuid as id,
+      u ? 'category_id' as set_category,
+      (u->>'category_id')::uuid as category_id,
+      u ? 'subcategory_id' as set_subcategory,
+      (u->>'subcategory_id')::uuid as subcategory_id
+    from jsonb_array_elements(p_updates) u
+  ),
+  updated as (
+    update public.products p
+    set category_id = case when c.set_category then c.category_id else p.category_id end,
+        subcategory_id = case when c.set_subcategory then c.subcategory_id else p.subcategory_id end
+    from changes c
+    where p.id = c.id
+    returning 1
+  )
+  select count(*)::integer from updated;
+$$;
+
+comment on function public.bulk_set_product_categories(jsonb) is 'Sets category_id/subcategory_id for many products in one call. Input is a JSON array of {id, category_id?, subcategory_id?}; omitted keys keep the current value. Returns the number of updated rows. Used by the Avens maintenance scripts.';
+
+revoke all on function public.bulk_set_product_categories(jsonb) from public;
+grant execute on function public.bulk_set_product_categories(jsonb) to service_role;
+
+commit;